@@ -0,0 +1,137 @@
+import logging
+from typing import Sequence
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from page_objects.checkout_page import CheckoutPage
+from page_objects.home_page import HomePage
+from page_objects.purchase_page import PurchasePage
+from page_objects.shopping_page import ShoppingPage
+from utils.command_metrics import attribute_public_methods
+from utils.driver_commands import execute_script
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Replaces the cart in the app's client-side state. Returns false if the app keeps no
+# state under the key (e.g. the live site, whose cart only lives in memory).
+SEED_CART_SCRIPT = """
+const [key, products] = arguments;
+const stored = sessionStorage.getItem(key);
+if (stored === null) { return false; }
+const state = JSON.parse(stored);
+state.cart = products.map(name => ({name: name, quantity: 1}));
+sessionStorage.setItem(key, JSON.stringify(state));
+return true;
+"""
+
+
+class AppState:
+    """
+    Puts the app directly into a named state (home, shop, checkout or purchase page
+    with a given cart) for tests that don't verify the navigation leading there.
+
+    Pages are opened by deep link, and the cart is seeded into the app's client-side
+    storage, so reaching the purchase page costs one page load instead of a
+    click-through of the whole shopping flow. Where the app does not support it (the
+    live site keeps its cart in memory), the state is reached through the UI.
+    """
+
+    # sessionStorage key of the app state, as used by the stand-in app
+    STORAGE_KEY = "standIn"
+    # Deep-link paths relative to the base URL
+    SHOP_PATH = "shop"
+    CHECKOUT_PATH = "shop/checkout"
+    PURCHASE_PATH = "shop/purchase"
+    # Time to wait for a deep-linked shop page before falling back to the UI
+    DEEP_LINK_TIMEOUT: float = 5
+
+    def __init__(self, driver: WebDriver, base_url: str):
+        """
+        Initializes the state setup for a driver.
+
+        :param driver: WebDriver instance used to interact with the app.
+        :param base_url: URL of the app's home page, ending with a slash.
+        """
+        self.driver = driver
+        self.base_url = base_url
+
+    def open_home(self) -> HomePage:
+        """
+        Opens the home page with an empty cart.
+
+        :return: The home page.
+        """
+        self._seed_cart([])
+        home_page = HomePage(self.driver, wait_until_ready=False)
+        home_page.get(self.base_url)
+        return home_page
+
+    def open_shop(self) -> ShoppingPage:
+        """
+        Opens the shop page with an empty cart.
+
+        :return: The shopping page.
+        """
+        self._seed_cart([])
+        shopping_page = ShoppingPage(self.driver, wait_until_ready=False)
+        try:
+            shopping_page.get(
+                self.base_url + self.SHOP_PATH, ready_timeout=self.DEEP_LINK_TIMEOUT
+            )
+            return shopping_page
+        except TimeoutException:
+            logger.info("Shop page deep link failed; navigating from the home page")
+            return self.open_home().navigate_to_shop_page()
+
+    def open_checkout(self, products: Sequence[str]) -> CheckoutPage:
+        """
+        Opens the checkout page with the given products in the cart.
+
+        :param products: Names of the products in the cart, one row each.
+        :return: The checkout page.
+        :raises ValueError: If the cart has to be filled through the UI and a
+                            product is not in the catalog.
+        """
+        if self._seed_cart(products):
+            checkout_page = CheckoutPage(self.driver, wait_until_ready=False)
+            checkout_page.get(self.base_url + self.CHECKOUT_PATH)
+            return checkout_page
+        logger.info("Cart cannot be seeded; adding %s through the shop page", products)
+        shopping_page = self.open_shop()
+        for product in products:
+            if not shopping_page.find_and_add_product_to_cart(product):
+                raise ValueError(f"Product '{product}' not found on the shop page.")
+        return shopping_page.click_checkout()
+
+    def open_purchase(self, products: Sequence[str]) -> PurchasePage:
+        """
+        Opens the purchase page with the given products in the cart.
+
+        :param products: Names of the products in the cart, one row each.
+        :return: The purchase page.
+        """
+        if self._seed_cart(products):
+            purchase_page = PurchasePage(self.driver, wait_until_ready=False)
+            purchase_page.get(self.base_url + self.PURCHASE_PATH)
+            return purchase_page
+        return self.open_checkout(products).proceed_to_purchase()
+
+    def _seed_cart(self, products: Sequence[str]) -> bool:
+        """
+        Writes the cart into the app's client-side storage, loading the app first if
+        the browser is on another origin.
+
+        :param products: Names of the products in the cart.
+        :return: True if the cart was seeded, False if the app keeps no client-side state.
+        """
+        if not self.driver.current_url.startswith(self.base_url):
+            self.driver.get(self.base_url)
+        return bool(
+            execute_script(
+                self.driver, SEED_CART_SCRIPT, self.STORAGE_KEY, list(products)
+            )
+        )
+
+
+attribute_public_methods(AppState)
@@ -1,11 +1,169 @@
-from typing import Tuple
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.support.wait import WebDriverWait
 
+from utils.command_metrics import attribute_public_methods
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# JavaScript counterpart of driver.find_element for a (strategy, value) locator tuple.
+# Prepended to scripts that need to resolve the page objects' locators in the page.
+LOCATE_ELEMENT_JS = """
+function locate(locator, root) {
+    const [by, value] = locator;
+    const scope = root || document;
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'name': return scope.querySelector(`[name="${CSS.escape(value)}"]`);
+        case 'class name': return scope.querySelector(`.${CSS.escape(value)}`);
+        case 'tag name': return scope.querySelector(value);
+        case 'css selector': return scope.querySelector(value);
+        case 'xpath': return document.evaluate(value, scope, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'link text':
+        case 'partial link text':
+            return Array.from(scope.querySelectorAll('a')).find(link => {
+                const text = link.innerText.trim();
+                return by === 'link text' ? text === value : text.includes(value);
+            }) || null;
+        default: throw new Error(`Unsupported locator strategy: ${by}`);
+    }
+}
+"""
+
+# Resolves as soon as the condition holds: checked once immediately, then on every DOM
+# mutation. A slow in-page re-check covers changes that fire no mutation (e.g. CSS
+# transitions). Must be run with execute_async_script; the callback is the last argument.
+WAIT_FOR_CONDITION_SCRIPT = (
+    LOCATE_ELEMENT_JS
+    + """
+const [locator, condition, text, timeoutMs, recheckMs, done] = arguments;
+const isVisible = element => {
+    const style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none'
+        && element.getClientRects().length > 0;
+};
+const check = () => {
+    const element = locate(locator);
+    if (!element) { return null; }
+    switch (condition) {
+        case 'presence': return element;
+        case 'visibility': return isVisible(element) ? element : null;
+        case 'clickability':
+            return isVisible(element) && !element.disabled ? element : null;
+        case 'text': return element.innerText.includes(text) ? element : null;
+        default: throw new Error(`Unsupported wait condition: ${condition}`);
+    }
+};
+let settled = false;
+let observer = null;
+let recheck = null;
+let timer = null;
+const finish = result => {
+    if (settled) { return; }
+    settled = true;
+    if (observer) { observer.disconnect(); }
+    clearInterval(recheck);
+    clearTimeout(timer);
+    done(result);
+};
+const attempt = () => {
+    try {
+        const element = check();
+        if (element) { finish({element: element}); }
+    } catch (error) {
+        finish({error: String(error)});
+    }
+};
+attempt();
+if (!settled) {
+    observer = new MutationObserver(attempt);
+    observer.observe(document.documentElement,
+        {childList: true, subtree: true, attributes: true, characterData: true});
+    recheck = setInterval(attempt, recheckMs);
+    timer = setTimeout(() => finish({timeout: true}), timeoutMs);
+}
+"""
+)
+
+# Expected conditions used when the in-page wait cannot be used
+POLLING_CONDITIONS: Dict[str, Callable[..., Any]] = {
+    "presence": ec.presence_of_element_located,
+    "visibility": ec.visibility_of_element_located,
+    "clickability": ec.element_to_be_clickable,
+}
+
+
+class CachedWebElement(WebElement):
+    """
+    A WebElement handed out by a page object's element cache. If a command fails
+    because the element went stale (re-render, navigation), the element is resolved
+    again from its locator and the command is retried once. Staleness is therefore
+    detected by the command itself, at no extra round-trip.
+    """
+
+    def __init__(
+        self,
+        parent: WebDriver,
+        id_: str,
+        locator: Tuple[str, str],
+        on_stale: Callable[[], None],
+    ):
+        """
+        :param parent: The WebDriver the element belongs to.
+        :param id_: The WebDriver element reference.
+        :param locator: The locator the element was resolved from.
+        :param on_stale: Called whenever the element has to be resolved again.
+        """
+        super().__init__(parent, id_)
+        self.locator = locator
+        self._on_stale = on_stale
+
+    def _execute(self, command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Executes a command against the element, re-resolving it once if it is stale.
+        """
+        try:
+            return self._execute_once(command, params)
+        except StaleElementReferenceException:
+            self._id = self._parent.find_element(*self.locator).id
+            self._on_stale()
+            return self._execute_once(command, params)
+
+    def _execute_once(self, command: str, params: Optional[Dict[str, Any]]) -> Any:
+        """
+        Executes a command against the element as resolved now. WebElement._execute
+        is unannotated in Selenium, hence the one targeted ignore.
+        """
+        return super()._execute(  # type: ignore[no-untyped-call]
+            command, dict(params) if params else None
+        )
+
+
+@dataclass(frozen=True)
+class WaitTiming:
+    """
+    How long a single wait took and which strategy resolved it.
+    """
+
+    locator: Tuple[str, str]
+    condition: str
+    duration: float
+    strategy: str
+
 
 class BasePage:
     """
@@ -13,13 +171,121 @@ class BasePage:
     and waiting for conditions.
     """
 
-    def __init__(self, driver: WebDriver):
+    # In-page waits must settle before WebDriver's default 30 s script timeout
+    ASYNC_WAIT_TIMEOUT_LIMIT: float = 25
+    # Interval of the in-page safety re-check for changes that fire no DOM mutation
+    IN_PAGE_RECHECK_INTERVAL_MS: int = 250
+
+    # Element cache counters summed over all page objects of the session
+    element_cache_totals: Counter[str] = Counter()
+
+    # Readiness contract of the page: the locator and wait condition ("presence",
+    # "visibility" or "clickability") that must hold before the page is used. With the
+    # "eager" or "none" page-load strategy, navigation returns before the page has
+    # rendered, so this is what makes the page object safe to use.
+    READY_CONDITION: Optional[Tuple[Tuple[str, str], str]] = None
+    # Maximum time to wait for the page to become ready, in seconds
+    READY_TIMEOUT: float = 10
+
+    def __init__(self, driver: WebDriver, wait_until_ready: bool = True):
         """
-        Initializes the BasePage class with a WebDriver instance.
+        Initializes the BasePage class with a WebDriver instance and waits until the
+        page is ready.
 
         :param driver: WebDriver instance used to interact with the web page.
+        :param wait_until_ready: Whether to wait for the page's READY_CONDITION. Pass
+                                 False when the page object is created before
+                                 navigating to the page, which get() then waits for.
         """
         self.driver = driver
+        self.wait_timings: List[WaitTiming] = []
+        self._element_cache: Dict[Tuple[str, str], CachedWebElement] = {}
+        self.element_cache_stats: Counter[str] = Counter(hits=0, misses=0, stale=0)
+        if wait_until_ready:
+            self.wait_until_ready()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Attributes the WebDriver commands issued by each public method of a page
+        object to that method, for the command latency report.
+        """
+        super().__init_subclass__(**kwargs)
+        attribute_public_methods(cls)
+
+    def find_element(self, locator: Tuple[str, str]) -> WebElement:
+        """
+        Returns the element for a locator, reusing the handle resolved earlier by this
+        page object. Handles are re-resolved only when a command finds them stale.
+
+        :param locator: A tuple containing the locator strategy and value (e.g., (By.ID, "example")).
+        :return: The (cached) WebElement.
+        """
+        cached = self._element_cache.get(locator)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("misses")
+        element = self.driver.find_element(*locator)
+        cached = CachedWebElement(
+            self.driver, element.id, locator, on_stale=lambda: self._count("stale")
+        )
+        self._element_cache[locator] = cached
+        return cached
+
+    def invalidate_element_cache(self) -> None:
+        """
+        Drops every cached element handle of this page object.
+        """
+        self._element_cache.clear()
+
+    def get(self, url: str, ready_timeout: Optional[float] = None) -> None:
+        """
+        Navigates to a URL, invalidates the element cache and waits until the page
+        is ready.
+
+        :param url: The URL to load.
+        :param ready_timeout: Maximum time to wait for the page to become ready;
+                              defaults to READY_TIMEOUT.
+        :raises TimeoutException: If the page does not become ready in time.
+        """
+        self.invalidate_element_cache()
+        self.driver.get(url)
+        self.wait_until_ready(ready_timeout)
+
+    def refresh(self) -> None:
+        """
+        Reloads the current page, invalidates the element cache and waits until the
+        page is ready.
+
+        :raises TimeoutException: If the page does not become ready in time.
+        """
+        self.invalidate_element_cache()
+        self.driver.refresh()
+        self.wait_until_ready()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits until the page's READY_CONDITION holds. Pages without a readiness
+        contract are used as soon as navigation returns.
+
+        :param timeout: Maximum time to wait in seconds; defaults to READY_TIMEOUT.
+        :raises TimeoutException: If the page does not become ready in time.
+        """
+        if self.READY_CONDITION is None:
+            return
+        locator, condition = self.READY_CONDITION
+        self.wait_for(
+            locator, condition, self.READY_TIMEOUT if timeout is None else timeout
+        )
+
+    def _count(self, event: str) -> None:
+        """
+        Increments an element cache counter for this page and for the session totals.
+
+        :param event: "hits", "misses" or "stale".
+        """
+        self.element_cache_stats[event] += 1
+        BasePage.element_cache_totals[event] += 1
 
     @staticmethod
     def select_option_from_static_dropdown_by_text(
@@ -33,6 +299,117 @@ class BasePage:
         """
         Select(element).select_by_visible_text(text)
 
+    def wait_for(
+        self,
+        locator: Tuple[str, str],
+        condition: str = "presence",
+        timeout: float = 10,
+        text: Optional[str] = None,
+    ) -> WebElement:
+        """
+        Waits until an element satisfies a condition and returns it. The wait runs in
+        the page and resolves on the DOM mutation that makes the condition true, so no
+        time is lost between polls. If the in-page wait cannot be used (long timeouts,
+        navigation during the wait, script errors) it falls back to WebDriverWait
+        polling for the remaining time. Every wait is recorded in ``wait_timings``.
+
+        :param locator: A tuple containing the locator strategy and value (e.g., (By.ID, "example")).
+        :param condition: One of "presence", "visibility", "clickability" or "text".
+        :param timeout: Maximum time to wait in seconds (default: 10 seconds).
+        :param text: Text the element must contain; required for the "text" condition.
+        :return: The WebElement once the condition holds.
+        :raises ValueError: If the condition is unknown or text is missing.
+        :raises TimeoutException: If the condition does not hold within the timeout.
+        """
+        if condition not in (*POLLING_CONDITIONS, "text"):
+            raise ValueError(f"Unsupported wait condition: {condition}")
+        if condition == "text" and text is None:
+            raise ValueError("The 'text' wait condition requires the text argument")
+
+        start = time.perf_counter()
+        element: Optional[WebElement] = None
+        strategy = "event"
+        if timeout < self.ASYNC_WAIT_TIMEOUT_LIMIT:
+            element = self._wait_in_page(locator, condition, timeout, text)
+        if element is None:
+            strategy = "polling"
+            remaining = max(timeout - (time.perf_counter() - start), 0.0)
+            element = self._wait_by_polling(locator, condition, remaining, text)
+
+        timing = WaitTiming(
+            locator=locator,
+            condition=condition,
+            duration=time.perf_counter() - start,
+            strategy=strategy,
+        )
+        self.wait_timings.append(timing)
+        logger.debug(
+            "Waited %.3fs for %s of %s (%s)",
+            timing.duration,
+            condition,
+            locator,
+            strategy,
+        )
+        return element
+
+    def _wait_in_page(
+        self,
+        locator: Tuple[str, str],
+        condition: str,
+        timeout: float,
+        text: Optional[str],
+    ) -> Optional[WebElement]:
+        """
+        Runs the MutationObserver-based wait inside the page.
+
+        :return: The element, or None if the caller should fall back to polling.
+        :raises TimeoutException: If the condition did not hold within the timeout.
+        """
+        try:
+            result: Dict[str, Any] = self.driver.execute_async_script(
+                WAIT_FOR_CONDITION_SCRIPT,
+                list(locator),
+                condition,
+                text,
+                int(timeout * 1000),
+                self.IN_PAGE_RECHECK_INTERVAL_MS,
+            )
+        except (JavascriptException, TimeoutException) as error:
+            # The page navigated away mid-wait or the script was cut short
+            logger.debug(
+                "In-page wait for %s failed, polling instead: %s", locator, error
+            )
+            return None
+        if result.get("timeout"):
+            raise TimeoutException(
+                f"Timed out after {timeout}s waiting for {condition} of {locator}"
+            )
+        if "error" in result:
+            logger.debug("In-page wait for %s failed: %s", locator, result["error"])
+            return None
+        element: WebElement = result["element"]
+        return element
+
+    def _wait_by_polling(
+        self,
+        locator: Tuple[str, str],
+        condition: str,
+        timeout: float,
+        text: Optional[str],
+    ) -> WebElement:
+        """
+        Waits for the condition with WebDriverWait's fixed-interval polling.
+
+        :return: The element once the condition holds.
+        :raises TimeoutException: If the condition does not hold within the timeout.
+        """
+        wait = WebDriverWait(self.driver, timeout)
+        if condition == "text":
+            wait.until(ec.text_to_be_present_in_element(locator, str(text)))
+            return self.driver.find_element(*locator)
+        element: WebElement = wait.until(POLLING_CONDITIONS[condition](locator))
+        return element
+
     def wait_for_element_to_be_present(
         self, locator: Tuple[str, str], timeout: int = 10
     ) -> WebElement:
@@ -43,6 +420,44 @@ class BasePage:
         :param timeout: Maximum time to wait for the element (default: 10 seconds).
         :return: The WebElement once it is located.
         """
-        return WebDriverWait(self.driver, timeout).until(
-            ec.presence_of_element_located(locator)
-        )
+        return self.wait_for(locator, "presence", timeout)
+
+    def wait_for_element_to_be_visible(
+        self, locator: Tuple[str, str], timeout: int = 10
+    ) -> WebElement:
+        """
+        Waits until an element is present and visible and returns it.
+
+        :param locator: A tuple containing the locator strategy and value (e.g., (By.ID, "example")).
+        :param timeout: Maximum time to wait for the element (default: 10 seconds).
+        :return: The WebElement once it is visible.
+        """
+        return self.wait_for(locator, "visibility", timeout)
+
+    def wait_for_element_to_be_clickable(
+        self, locator: Tuple[str, str], timeout: int = 10
+    ) -> WebElement:
+        """
+        Waits until an element is visible and enabled and returns it.
+
+        :param locator: A tuple containing the locator strategy and value (e.g., (By.ID, "example")).
+        :param timeout: Maximum time to wait for the element (default: 10 seconds).
+        :return: The WebElement once it can be clicked.
+        """
+        return self.wait_for(locator, "clickability", timeout)
+
+    def wait_for_text_in_element(
+        self, locator: Tuple[str, str], text: str, timeout: int = 10
+    ) -> WebElement:
+        """
+        Waits until an element's text contains the given text and returns it.
+
+        :param locator: A tuple containing the locator strategy and value (e.g., (By.ID, "example")).
+        :param text: The text the element must contain.
+        :param timeout: Maximum time to wait for the text (default: 10 seconds).
+        :return: The WebElement once it contains the text.
+        """
+        return self.wait_for(locator, "text", timeout, text=text)
+
+
+attribute_public_methods(BasePage)
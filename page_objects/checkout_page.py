@@ -1,11 +1,111 @@
-from typing import List
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
 
-from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
 from page_objects.base_page import BasePage
 from page_objects.purchase_page import PurchasePage
+from utils.driver_commands import execute_script
+
+# Reads every cart row (name, quantity, unit price, row total, remove button) in one
+# round-trip. Rows are found from the same headings as PRODUCTS_IN_CART.
+CART_SNAPSHOT_SCRIPT = """
+return Array.from(document.querySelectorAll('div > h4.media-heading')).map(heading => {
+    const row = heading.closest('tr');
+    const cells = row ? Array.from(row.children) : [];
+    const quantity = row ? row.querySelector('input') : null;
+    return {
+        name: heading.innerText.trim(),
+        quantity: quantity ? quantity.value : '',
+        unit_price: cells.length > 2 ? cells[2].innerText.trim() : '',
+        total: cells.length > 3 ? cells[3].innerText.trim() : '',
+        remove: row ? row.querySelector('td:last-child button') : null,
+        row: row,
+    };
+});
+"""
+
+# Clicks several remove buttons and returns the product names still in the cart.
+REMOVE_CART_ITEMS_SCRIPT = """
+for (const button of arguments[0]) {
+    if (button && button.isConnected) { button.click(); }
+}
+return Array.from(document.querySelectorAll('div > h4.media-heading'))
+    .map(heading => heading.innerText.trim());
+"""
+
+# Attempts at removing products from the cart before giving up
+REMOVE_ATTEMPTS = 2
+
+
+def parse_amount(text: str) -> float:
+    """
+    Extracts the numeric value from a displayed amount such as "₹. 65000".
+
+    :param text: The displayed amount.
+    :return: The amount, or 0.0 if the text contains no number.
+    """
+    match = re.search(r"\d+(?:[.,]\d+)*", text)
+    return float(match.group().replace(",", "")) if match else 0.0
+
+
+def parse_quantity(value: Any) -> int:
+    """
+    Extracts the quantity from the value of a quantity input, which the user may
+    have left empty or filled with something other than a whole number.
+
+    :param value: The input's value.
+    :return: The leading whole number in the value, or 0 if it contains none.
+    """
+    match = re.search(r"\d+", str(value or ""))
+    return int(match.group()) if match else 0
+
+
+@dataclass(frozen=True)
+class CartItem:
+    """
+    A row of the checkout table as captured by a cart snapshot.
+    """
+
+    name: str
+    quantity: int
+    unit_price: float
+    total: float
+    remove_button: Optional[WebElement]
+    row: Optional[WebElement]
+
+
+@dataclass
+class Cart:
+    """
+    Snapshot of the checkout table, in display order.
+    """
+
+    items: List[CartItem] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def names(self) -> List[str]:
+        """
+        Lists the products in the cart.
+
+        :return: The product names, in display order.
+        """
+        return [item.name for item in self.items]
+
+    def get(self, product: str) -> Optional[CartItem]:
+        """
+        Looks up a cart row by product name.
+
+        :param product: The name of the product.
+        :return: The first matching row, or None if the product is not in the cart.
+        """
+        return next((item for item in self.items if item.name == product.strip()), None)
 
 
 class CheckoutPage(BasePage):
@@ -20,13 +120,46 @@ class CheckoutPage(BasePage):
     QUANTITY = (By.ID, "exampleInputEmail1")
     REMOVE_BUTTON = (By.XPATH, "ancestor::tr[1]/td[last()]/button")
 
-    def __init__(self, driver: WebDriver):
+    # Readiness: the cart table has rendered (the Submit button on the home page
+    # has the same classes as PROCEED_TO_PURCHASE_BUTTON)
+    READY_CONDITION = ((By.CSS_SELECTOR, "table .btn.btn-success"), "clickability")
+
+    def __init__(self, driver: WebDriver, wait_until_ready: bool = True):
         """
         Initializes the CheckoutPage class.
 
         :param driver: WebDriver instance used to interact with the page.
+        :param wait_until_ready: Whether to wait for the page to be ready.
+        """
+        super().__init__(driver, wait_until_ready)
+        self._cart: Optional[Cart] = None
+
+    def get_cart(self, refresh: bool = False) -> Cart:
+        """
+        Returns a snapshot of the cart, read in a single script execution.
+        The snapshot is reused until the cart is changed through this page object.
+
+        :param refresh: If True, discards the cached snapshot and reads the cart again.
+        :return: The cart snapshot.
         """
-        super().__init__(driver)
+        if self._cart is None or refresh:
+            rows: List[Dict[str, Any]] = execute_script(
+                self.driver, CART_SNAPSHOT_SCRIPT
+            )
+            self._cart = Cart(
+                items=[
+                    CartItem(
+                        name=row["name"],
+                        quantity=parse_quantity(row["quantity"]),
+                        unit_price=parse_amount(row["unit_price"]),
+                        total=parse_amount(row["total"]),
+                        remove_button=row["remove"],
+                        row=row["row"],
+                    )
+                    for row in rows
+                ]
+            )
+        return self._cart
 
     def get_cart_items(self) -> List[WebElement]:
         """
@@ -42,7 +175,7 @@ class CheckoutPage(BasePage):
 
         :return: The quantity as a string.
         """
-        return str(self.driver.find_element(*self.QUANTITY).get_attribute("value"))
+        return str(self.find_element(self.QUANTITY).get_attribute("value"))
 
     def enter_quantity(self, quantity: int) -> None:
         """
@@ -50,9 +183,10 @@ class CheckoutPage(BasePage):
 
         :param quantity: The quantity to set as a string.
         """
-        quantity_input_box = self.driver.find_element(*self.QUANTITY)
+        quantity_input_box = self.find_element(self.QUANTITY)
         quantity_input_box.clear()
         quantity_input_box.send_keys(str(quantity))
+        self._cart = None
 
     def remove_product_from_cart(self, product: str) -> None:
         """
@@ -60,14 +194,56 @@ class CheckoutPage(BasePage):
 
         :param product: The name of the product to remove from the cart.
         :raises ValueError: If the specified product is not found in the cart.
+        :raises WebDriverException: If the product is still in the cart afterwards.
+        """
+        self.remove_products_from_cart([product])
+
+    def remove_products_from_cart(self, products: Sequence[str]) -> Cart:
+        """
+        Removes several products from the cart in a single script execution, one row
+        per product even if it is listed twice. The cached snapshot is updated by
+        dropping the removed rows; the cart is only read again in full if the page
+        disagrees with that result, and the removal of products still in the cart
+        is then tried once more.
+
+        :param products: The names of the products to remove.
+        :return: The cart snapshot after the removal.
+        :raises ValueError: If any of the products is not in the cart.
+        :raises WebDriverException: If a product is still in the cart after the
+                                    second attempt.
         """
-        cart_items = self.get_cart_items()
-        for item in cart_items:
-            if item.text.strip() == product.strip():
-                remove_button = item.find_element(*self.REMOVE_BUTTON)
-                remove_button.click()
-                return
-        raise ValueError(f"Product '{product}' not found in the cart.")
+        cart = self.get_cart()
+        pending = list(dict.fromkeys(product.strip() for product in products))
+        for product in pending:
+            if cart.get(product) is None:
+                raise ValueError(f"Product '{product}' not found in the cart.")
+        # Rows left per product once its row is removed (a product may fill several)
+        expected = {product: cart.names().count(product) - 1 for product in pending}
+
+        for _ in range(REMOVE_ATTEMPTS):
+            to_remove = [item for item in map(cart.get, pending) if item is not None]
+            remaining_names: List[str] = execute_script(
+                self.driver,
+                REMOVE_CART_ITEMS_SCRIPT,
+                [item.remove_button for item in to_remove],
+            )
+            remaining = Cart(
+                items=[item for item in cart.items if item not in to_remove]
+            )
+            if remaining.names() == remaining_names:
+                self._cart = remaining
+                return remaining
+            cart = self.get_cart(refresh=True)
+            pending = [
+                product
+                for product in pending
+                if cart.names().count(product) > expected[product]
+            ]
+            if not pending:
+                return cart
+        raise WebDriverException(
+            f"Could not remove {', '.join(pending)} from the cart."
+        )
 
     def proceed_to_purchase(self) -> PurchasePage:
         """
@@ -75,5 +251,5 @@ class CheckoutPage(BasePage):
 
         :return: An instance of the PurchasePage class.
         """
-        self.driver.find_element(*self.PROCEED_TO_PURCHASE_BUTTON).click()
+        self.find_element(self.PROCEED_TO_PURCHASE_BUTTON).click()
         return PurchasePage(self.driver)
@@ -0,0 +1,292 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from page_objects.base_page import BasePage
+from utils.command_metrics import attribute_public_methods
+from utils.driver_commands import execute_script
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Identity of a step within a flow: its name and the repr of its arguments
+StepKey = Tuple[str, str]
+
+# Reads localStorage and sessionStorage of the current origin
+CAPTURE_STORAGE_SCRIPT = """
+const read = storage => Object.fromEntries(
+    Array.from({length: storage.length}, (_, index) => storage.key(index))
+        .map(key => [key, storage.getItem(key)]));
+return [read(window.localStorage), read(window.sessionStorage)];
+"""
+
+# Replaces localStorage and sessionStorage of the current origin
+RESTORE_STORAGE_SCRIPT = """
+const [local, session] = arguments;
+const write = (storage, items) => {
+    storage.clear();
+    Object.entries(items).forEach(([key, value]) => storage.setItem(key, value));
+};
+write(window.localStorage, local);
+write(window.sessionStorage, session);
+"""
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    One step of a flow: a method called on the current page object (``function`` is
+    None), or a function called with the current page object as first argument. A
+    step that returns a page object makes it the current page.
+    """
+
+    name: str
+    args: Tuple[Any, ...]
+    function: Optional[Callable[..., Any]] = None
+
+    @property
+    def key(self) -> StepKey:
+        """
+        The step's identity when comparing flows. Steps with the same name and
+        arguments are assumed to do the same thing.
+        """
+        return self.name, repr(self.args)
+
+    def run(self, page: Any) -> Any:
+        """
+        Runs the step on the current page object.
+
+        :param page: The current page object (or the AppState, for a flow's first step).
+        :return: The page object current after the step.
+        """
+        if self.function is None:
+            result = getattr(page, self.name)(*self.args)
+        else:
+            result = self.function(page, *self.args)
+        return result if isinstance(result, BasePage) else page
+
+
+class Flow:
+    """
+    A test modeled as a sequence of steps on the page objects, starting from an
+    AppState. Flows are built step by step::
+
+        Flow().call("open_checkout", ["Blackberry"]).then(verify_cart, ["Blackberry"])
+
+    Flows whose steps start the same share that prefix, which a :class:`FlowRunner`
+    runs only once per process.
+    """
+
+    def __init__(self) -> None:
+        self.steps: List[Step] = []
+
+    def call(self, method: str, *args: Any) -> "Flow":
+        """
+        Adds a step calling a method of the current page object.
+
+        :param method: Name of the method, e.g. "open_shop" or "click_checkout".
+        :param args: Arguments of the method.
+        :return: The flow, for chaining.
+        """
+        self.steps.append(Step(method, args))
+        return self
+
+    def then(self, function: Callable[..., Any], *args: Any) -> "Flow":
+        """
+        Adds a step calling a function, such as a verification, with the current
+        page object and the given arguments.
+
+        :param function: The function; its qualified name identifies the step.
+        :param args: Further arguments of the function.
+        :return: The flow, for chaining.
+        """
+        self.steps.append(Step(function.__qualname__, args, function))
+        return self
+
+    def key(self, depth: Optional[int] = None) -> Tuple[StepKey, ...]:
+        """
+        Returns the keys of the flow's steps, or of its first ``depth`` steps.
+
+        :param depth: Length of the prefix; the whole flow if None.
+        :return: The step keys.
+        """
+        return tuple(step.key for step in self.steps[:depth])
+
+
+class FlowTrie:
+    """
+    Prefix tree of the steps of the flows collected in a session. A branch point is
+    a prefix that several flows share and after which they diverge (or one of them
+    ends); it is where the browser state is worth saving.
+    """
+
+    def __init__(self) -> None:
+        # Number of flows passing through each prefix, and of those ending there
+        self.flows: Counter[Tuple[StepKey, ...]] = Counter()
+        self.ends: Counter[Tuple[StepKey, ...]] = Counter()
+        self.children: Dict[Tuple[StepKey, ...], Set[StepKey]] = {}
+
+    def add(self, flow: Flow) -> None:
+        """
+        Adds a flow's steps to the tree.
+
+        :param flow: The flow.
+        """
+        key = flow.key()
+        for depth in range(1, len(key) + 1):
+            self.flows[key[:depth]] += 1
+            self.children.setdefault(key[: depth - 1], set()).add(key[depth - 1])
+        self.ends[key] += 1
+
+    def branch_points(self, flow: Flow) -> List[int]:
+        """
+        Returns the depths of the branch points on a flow's path, excluding the
+        flow's end.
+
+        :param flow: The flow.
+        :return: Lengths of the prefixes after which another flow diverges.
+        """
+        key = flow.key()
+        return [
+            depth
+            for depth in range(1, len(key))
+            if self.flows[key[:depth]] > 1
+            and (len(self.children.get(key[:depth], ())) > 1 or self.ends[key[:depth]])
+        ]
+
+
+@dataclass(frozen=True)
+class BrowserSnapshot:
+    """
+    The client-side state of the browser at a flow's branch point: URL, cookies,
+    localStorage and sessionStorage, and the page object the flow was on. State kept
+    in page memory only (such as the live site's cart) is not captured.
+    """
+
+    url: str
+    cookies: List[Dict[str, Any]]
+    local_storage: Dict[str, str]
+    session_storage: Dict[str, str]
+    page_class: Type[BasePage]
+
+    @classmethod
+    def capture(cls, page: BasePage) -> "BrowserSnapshot":
+        """
+        Captures the state of the page object's browser.
+
+        :param page: The current page object.
+        :return: The snapshot.
+        """
+        local_storage, session_storage = execute_script(
+            page.driver, CAPTURE_STORAGE_SCRIPT
+        )
+        return cls(
+            page.driver.current_url,
+            page.driver.get_cookies(),
+            local_storage,
+            session_storage,
+            type(page),
+        )
+
+    def restore(self, driver: WebDriver) -> BasePage:
+        """
+        Restores the state in a browser, which need not be the one it was captured
+        in: loads the snapshot's origin, replaces cookies and storage, then loads the
+        snapshot's URL and waits until its page is ready.
+
+        :param driver: The browser to restore the state in.
+        :return: A page object for the restored page.
+        :raises WebDriverException: If the state cannot be restored or the page
+                                    does not become ready.
+        """
+        parts = urlsplit(self.url)
+        origin = f"{parts.scheme}://{parts.netloc}/"
+        if not driver.current_url.startswith(origin):
+            driver.get(origin)
+        driver.delete_all_cookies()
+        for cookie in self.cookies:
+            driver.add_cookie(cookie)
+        execute_script(
+            driver, RESTORE_STORAGE_SCRIPT, self.local_storage, self.session_storage
+        )
+        page = self.page_class(driver, wait_until_ready=False)
+        page.get(self.url)
+        return page
+
+
+class FlowRunner:
+    """
+    Runs flows, executing each prefix shared by several flows only once per process.
+
+    The first flow through a branch point runs its steps and saves a
+    :class:`BrowserSnapshot` there. Later flows through it restore the deepest
+    snapshot on their path and run only the remaining steps. A flow replays its
+    whole prefix if no snapshot exists yet, if the app keeps no state under
+    ``required_storage_key`` (so a snapshot would miss it), or if restoring fails.
+    """
+
+    def __init__(self, required_storage_key: Optional[str] = None):
+        """
+        :param required_storage_key: sessionStorage or localStorage key the app keeps
+                                     its state under; snapshots without it are not
+                                     saved.
+        """
+        self.trie = FlowTrie()
+        self.required_storage_key = required_storage_key
+        self.snapshots: Dict[Tuple[StepKey, ...], BrowserSnapshot] = {}
+        self.stats: Counter[str] = Counter()
+
+    def run(self, flow: Flow, start: Any) -> Any:
+        """
+        Runs a flow from its deepest saved branch point, or from the start.
+
+        :param flow: The flow, added to the trie at collection.
+        :param start: The object the first step is called on (the test's AppState).
+        :return: The page object current after the last step.
+        """
+        branch_points = self.trie.branch_points(flow)
+        page, done = start, 0
+        for depth in reversed(branch_points):
+            snapshot = self.snapshots.get(flow.key(depth))
+            if snapshot is None:
+                continue
+            try:
+                page, done = snapshot.restore(start.driver), depth
+                self.stats["restored"] += 1
+                self.stats["skipped steps"] += depth
+            except WebDriverException as error:
+                logger.warning("Replaying the flow; snapshot restore failed: %s", error)
+                del self.snapshots[flow.key(depth)]
+            break
+        for index in range(done, len(flow.steps)):
+            page = flow.steps[index].run(page)
+            if index + 1 in branch_points and index + 1 > done:
+                self._save(flow.key(index + 1), page)
+        return page
+
+    def _save(self, key: Tuple[StepKey, ...], page: Any) -> None:
+        """
+        Saves a snapshot at a branch point unless one exists or it would be
+        incomplete.
+
+        :param key: The step keys of the prefix.
+        :param page: The current page object.
+        """
+        if key in self.snapshots or not isinstance(page, BasePage):
+            return
+        snapshot = BrowserSnapshot.capture(page)
+        if self.required_storage_key and not (
+            self.required_storage_key in snapshot.session_storage
+            or self.required_storage_key in snapshot.local_storage
+        ):
+            logger.debug("App keeps no client-side state; not saving a snapshot")
+            return
+        self.snapshots[key] = snapshot
+        self.stats["saved"] += 1
+
+
+attribute_public_methods(BrowserSnapshot)
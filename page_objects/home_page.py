@@ -1,10 +1,47 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Dict, List
 
-from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 
-from page_objects.base_page import BasePage
+from page_objects.base_page import LOCATE_ELEMENT_JS, BasePage
 from page_objects.shopping_page import ShoppingPage
+from utils.driver_commands import execute_script
+
+# Applies a list of form actions in one script execution. Text values are set through
+# the native value setter and announced with input/change events, so Angular's form
+# bindings see them exactly as if they had been typed.
+FAST_FILL_SCRIPT = (
+    LOCATE_ELEMENT_JS
+    + """
+const setValue = (element, value) => {
+    const prototype = Object.getPrototypeOf(element);
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+};
+for (const action of arguments[0]) {
+    const element = locate(action.locator);
+    if (!element) {
+        throw new Error(`Element not found: ${action.locator.join('=')}`);
+    }
+    if (action.type === 'text') {
+        setValue(element, action.value);
+    } else if (action.type === 'check') {
+        if (element.checked !== action.value) { element.click(); }
+    } else if (action.type === 'select') {
+        const option = Array.from(element.options).find(
+            option => option.text.trim() === action.value);
+        if (!option) {
+            throw new Error(`Cannot locate option with visible text: ${action.value}`);
+        }
+        setValue(element, option.value);
+    } else if (action.type === 'click') {
+        element.click();
+    }
+}
+"""
+)
 
 
 class HomePage(BasePage):
@@ -24,19 +61,28 @@ class HomePage(BasePage):
     SUBMIT_BUTTON = (By.XPATH, "//input[@type='submit']")
     SUCCESS_MESSAGE_ALERT = (By.CLASS_NAME, "alert-success")
 
+    # Readiness: the form can be filled in
+    READY_CONDITION = (NAME_FIELD, "clickability")
+
     EMPLOYMENT_STATUS_RADIOS = {
         "Student": "inlineRadio1",
         "Employed": "inlineRadio2",
         "Entrepreneur": "inlineRadio3",
     }
 
-    def __init__(self, driver: WebDriver):
+    # Form fill strategies: realistic per-field keystrokes, or one script execution
+    FILL_MODE_KEYSTROKE = "keystroke"
+    FILL_MODE_FAST = "fast"
+    FILL_MODES = (FILL_MODE_KEYSTROKE, FILL_MODE_FAST)
+
+    def __init__(self, driver: WebDriver, wait_until_ready: bool = True):
         """
         Initializes the HomePage class & assigns a driver instance variable.
 
         :param driver: WebDriver instance used to interact with the page.
+        :param wait_until_ready: Whether to wait for the page to be ready.
         """
-        super().__init__(driver)
+        super().__init__(driver, wait_until_ready)
 
     def navigate_to_shop_page(self) -> ShoppingPage:
         """
@@ -44,7 +90,7 @@ class HomePage(BasePage):
 
         :return: An instance of the ShopPage class.
         """
-        self.driver.find_element(*self.SHOP_LINK).click()
+        self.find_element(self.SHOP_LINK).click()
         return ShoppingPage(self.driver)
 
     def set_name(self, name: str) -> None:
@@ -53,7 +99,7 @@ class HomePage(BasePage):
 
         :param name: The name to be entered.
         """
-        self.driver.find_element(*self.NAME_FIELD).send_keys(name)
+        self.find_element(self.NAME_FIELD).send_keys(name)
 
     def set_email(self, email: str) -> None:
         """
@@ -61,7 +107,7 @@ class HomePage(BasePage):
 
         :param email: The email to be entered.
         """
-        self.driver.find_element(*self.EMAIL_FIELD).send_keys(email)
+        self.find_element(self.EMAIL_FIELD).send_keys(email)
 
     def set_password(self, password: str) -> None:
         """
@@ -69,13 +115,13 @@ class HomePage(BasePage):
 
         :param password: The password to be entered.
         """
-        self.driver.find_element(*self.PASSWORD_FIELD).send_keys(password)
+        self.find_element(self.PASSWORD_FIELD).send_keys(password)
 
     def tick_ice_cream_checkbox(self) -> None:
         """
         Ticks the 'Likes Ice Cream'
         """
-        self.driver.find_element(*self.LIKES_ICE_CREAM_CHECKBOX).click()
+        self.find_element(self.LIKES_ICE_CREAM_CHECKBOX).click()
 
     def select_employment_status(self, status: str) -> None:
         """
@@ -86,9 +132,7 @@ class HomePage(BasePage):
         if status not in self.EMPLOYMENT_STATUS_RADIOS:
             raise ValueError(f"Invalid employment status: {status}")
 
-        radio_button = self.driver.find_element(
-            By.ID, self.EMPLOYMENT_STATUS_RADIOS[status]
-        )
+        radio_button = self.find_element((By.ID, self.EMPLOYMENT_STATUS_RADIOS[status]))
         if radio_button.is_enabled():
             radio_button.click()
         else:
@@ -100,7 +144,7 @@ class HomePage(BasePage):
 
         :param gender: The gender to select (e.g., "Male", "Female").
         """
-        dropdown = self.driver.find_element(*self.GENDER_DROPDOWN)
+        dropdown = self.find_element(self.GENDER_DROPDOWN)
         self.select_option_from_static_dropdown_by_text(dropdown, gender)
 
     def set_date_of_birth(self, dob: str) -> None:
@@ -109,13 +153,13 @@ class HomePage(BasePage):
 
         :param dob: The date of birth in format (e.g., "01-01-2000").
         """
-        self.driver.find_element(*self.DOB_FIELD).send_keys(dob)
+        self.find_element(self.DOB_FIELD).send_keys(dob)
 
     def click_submit_button(self) -> None:
         """
         Clicks the submit button on the form.
         """
-        self.driver.find_element(*self.SUBMIT_BUTTON).click()
+        self.find_element(self.SUBMIT_BUTTON).click()
 
     def get_success_message(self) -> str:
         """
@@ -123,9 +167,11 @@ class HomePage(BasePage):
 
         :return: success message
         """
-        return self.driver.find_element(*self.SUCCESS_MESSAGE_ALERT).text
+        return self.find_element(self.SUCCESS_MESSAGE_ALERT).text
 
-    def fill_out_form(self, test_data: dict[str, Any]) -> None:
+    def fill_out_form(
+        self, test_data: dict[str, Any], mode: str = FILL_MODE_KEYSTROKE
+    ) -> None:
         """
         Completes the entire form with the provided details.
 
@@ -137,7 +183,15 @@ class HomePage(BasePage):
                           - gender: str
                           - employment_status: str
                           - dob: str
+        :param mode: "keystroke" to type into each field like a user, or "fast" to set
+                     every field and submit in a single script execution.
+        :raises ValueError: If the fill mode is unknown.
         """
+        if mode == self.FILL_MODE_FAST:
+            self.fast_fill_out_form(test_data)
+            return
+        if mode != self.FILL_MODE_KEYSTROKE:
+            raise ValueError(f"Invalid fill mode: {mode}")
         self.set_name(test_data["name"])
         self.set_email(test_data["email"])
         self.set_password(test_data["password"])
@@ -147,3 +201,62 @@ class HomePage(BasePage):
         self.select_employment_status(test_data["employment_status"])
         self.set_date_of_birth(test_data["dob"])
         self.click_submit_button()
+
+    def fast_fill_out_form(self, test_data: dict[str, Any]) -> None:
+        """
+        Completes and submits the form in a single script execution. Fields are set
+        directly and the matching input/change events are fired, so no keyboard
+        behaviour is exercised.
+
+        :param test_data: The same dictionary accepted by fill_out_form.
+        :raises ValueError: If the employment status is invalid.
+        """
+        status: str = test_data["employment_status"]
+        if status not in self.EMPLOYMENT_STATUS_RADIOS:
+            raise ValueError(f"Invalid employment status: {status}")
+
+        actions: List[Dict[str, Any]] = [
+            {"type": "text", "locator": self.NAME_FIELD, "value": test_data["name"]},
+            {"type": "text", "locator": self.EMAIL_FIELD, "value": test_data["email"]},
+            {
+                "type": "text",
+                "locator": self.PASSWORD_FIELD,
+                "value": test_data["password"],
+            },
+            {
+                "type": "check",
+                "locator": self.LIKES_ICE_CREAM_CHECKBOX,
+                "value": bool(test_data["likes_ice_cream"]),
+            },
+            {
+                "type": "select",
+                "locator": self.GENDER_DROPDOWN,
+                "value": test_data["gender"],
+            },
+            {
+                "type": "check",
+                "locator": (By.ID, self.EMPLOYMENT_STATUS_RADIOS[status]),
+                "value": True,
+            },
+            {
+                "type": "text",
+                "locator": self.DOB_FIELD,
+                "value": self._to_iso_date(test_data["dob"]),
+            },
+            {"type": "click", "locator": self.SUBMIT_BUTTON},
+        ]
+        execute_script(self.driver, FAST_FILL_SCRIPT, actions)
+
+    @staticmethod
+    def _to_iso_date(dob: str) -> str:
+        """
+        Converts a "DD-MM-YYYY" date to the "YYYY-MM-DD" value a date input expects.
+        Values in any other format are returned unchanged.
+
+        :param dob: The date of birth as stored in the test data.
+        :return: The date in ISO format.
+        """
+        try:
+            return datetime.strptime(dob, "%d-%m-%Y").date().isoformat()
+        except ValueError:
+            return dob
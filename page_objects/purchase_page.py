@@ -1,5 +1,5 @@
-from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 
 from page_objects.base_page import BasePage
 
@@ -18,13 +18,17 @@ class PurchasePage(BasePage):
     PURCHASE_BUTTON = (By.CSS_SELECTOR, "input[value*='Pur']")
     SUCCESS_MESSAGE_ALERT = (By.CSS_SELECTOR, ".alert-success")
 
-    def __init__(self, driver: WebDriver):
+    # Readiness: the delivery location can be entered
+    READY_CONDITION = (DELIVERY_LOCATION_INPUT_BOX, "clickability")
+
+    def __init__(self, driver: WebDriver, wait_until_ready: bool = True):
         """
         Initializes the PurchasePage class.
 
         :param driver: WebDriver instance used to interact with the page.
+        :param wait_until_ready: Whether to wait for the page to be ready.
         """
-        super().__init__(driver)
+        super().__init__(driver, wait_until_ready)
 
     def select_delivery_location(self, location: str) -> None:
         """
@@ -32,14 +36,14 @@ class PurchasePage(BasePage):
 
         :param location: The delivery location to be entered.
         """
-        self.driver.find_element(*self.DELIVERY_LOCATION_INPUT_BOX).send_keys(location)
-        self.wait_for_element_to_be_present(self.COUNTRY_OPTION).click()
+        self.find_element(self.DELIVERY_LOCATION_INPUT_BOX).send_keys(location)
+        self.wait_for_element_to_be_clickable(self.COUNTRY_OPTION).click()
 
     def accept_terms_and_conditions(self) -> None:
         """
         Accepts the terms and conditions by selecting the checkbox.
         """
-        terms_checkbox = self.driver.find_element(*self.TERMS_AND_CONDITIONS_CHECKBOX)
+        terms_checkbox = self.find_element(self.TERMS_AND_CONDITIONS_CHECKBOX)
         if not terms_checkbox.is_selected():
             terms_checkbox.click()
 
@@ -47,7 +51,7 @@ class PurchasePage(BasePage):
         """
         Clicks the purchase button to finalize the order.
         """
-        self.driver.find_element(*self.PURCHASE_BUTTON).click()
+        self.find_element(self.PURCHASE_BUTTON).click()
 
     def get_success_message(self) -> str:
         """
@@ -55,4 +59,4 @@ class PurchasePage(BasePage):
 
         :return: The success message as a string.
         """
-        return str(self.wait_for_element_to_be_present(self.SUCCESS_MESSAGE_ALERT).text)
+        return str(self.wait_for_element_to_be_visible(self.SUCCESS_MESSAGE_ALERT).text)
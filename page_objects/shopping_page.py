@@ -1,11 +1,91 @@
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
-from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
 from page_objects.base_page import BasePage
 from page_objects.checkout_page import CheckoutPage
+from utils.driver_commands import execute_script
+
+# Reads every product card in one round-trip. A MutationObserver on the cards'
+# container bumps window.__catalogVersion whenever the catalog DOM changes, so a
+# snapshot can tell whether it is still current.
+CATALOG_SNAPSHOT_SCRIPT = """
+const cards = Array.from(document.querySelectorAll('app-card > div'));
+const root = cards.length ? cards[0].parentElement.parentElement : document.body;
+if (window.__catalogRoot !== root) {
+    window.__catalogRoot = root;
+    window.__catalogVersion = (window.__catalogVersion || 0) + 1;
+    new MutationObserver(() => { window.__catalogVersion += 1; }).observe(
+        root, {childList: true, subtree: true, characterData: true});
+}
+return {
+    version: window.__catalogVersion,
+    products: cards.map(card => {
+        const name = card.querySelector(':scope > div.card-body > h4');
+        const price = card.querySelector(':scope > div.card-body > h5');
+        return {
+            name: name ? name.innerText.trim() : '',
+            price: price ? price.innerText.trim() : '',
+            card: card,
+            button: card.querySelector(':scope > div.card-footer > button'),
+        };
+    }),
+};
+"""
+
+# Clicks an add-to-cart button only if the catalog DOM is unchanged since the snapshot.
+CLICK_IF_CATALOG_UNCHANGED_SCRIPT = """
+const [button, version] = arguments;
+if (window.__catalogVersion !== version || !button || !button.isConnected) {
+    return false;
+}
+button.click();
+return true;
+"""
+
+
+@dataclass(frozen=True)
+class CatalogProduct:
+    """
+    A product card as captured by a catalog snapshot.
+    """
+
+    name: str
+    price: str
+    card: WebElement
+    add_to_cart_button: WebElement
+
+
+@dataclass
+class ProductCatalog:
+    """
+    Snapshot of all product cards on the shop page, indexed by product name.
+    ``version`` identifies the DOM state the snapshot was taken from.
+    """
+
+    version: int
+    products: Dict[str, CatalogProduct] = field(default_factory=dict)
+
+    def get(self, product_name: str) -> Optional[CatalogProduct]:
+        """
+        Looks up a product by its exact name.
+
+        :param product_name: The name of the product.
+        :return: The product, or None if it is not in the catalog.
+        """
+        return self.products.get(product_name)
+
+    def names(self) -> List[str]:
+        """
+        Lists the products in the catalog.
+
+        :return: The names of all products, in page order.
+        """
+        return list(self.products)
 
 
 class ShoppingPage(BasePage):
@@ -20,13 +100,51 @@ class ShoppingPage(BasePage):
     ADD_TO_CART_BUTTON = (By.XPATH, "div[@class='card-footer']/button")
     CHECKOUT_BUTTON = (By.XPATH, "//a[@class='nav-link btn btn-primary']")
 
-    def __init__(self, driver: WebDriver):
+    # Readiness: the catalog has rendered
+    READY_CONDITION = (PRODUCT_CARDS, "presence")
+
+    def __init__(self, driver: WebDriver, wait_until_ready: bool = True):
         """
         Initializes the ShopPage class.
 
         :param driver: WebDriver instance used to interact with the page.
+        :param wait_until_ready: Whether to wait for the page to be ready.
+        """
+        super().__init__(driver, wait_until_ready)
+        self._catalog: Optional[ProductCatalog] = None
+
+    def get_catalog(self, refresh: bool = False) -> ProductCatalog:
+        """
+        Returns a snapshot of all product cards, taken in a single script execution.
+        The snapshot is reused by later calls until it is invalidated.
+
+        :param refresh: If True, discards the cached snapshot and takes a new one.
+        :return: The product catalog indexed by product name.
+        """
+        if self._catalog is None or refresh:
+            snapshot: Dict[str, Any] = execute_script(
+                self.driver, CATALOG_SNAPSHOT_SCRIPT
+            )
+            catalog = ProductCatalog(version=snapshot["version"])
+            for product in snapshot["products"]:
+                # Keep the first card for duplicate names, like a top-down scan would
+                catalog.products.setdefault(
+                    product["name"],
+                    CatalogProduct(
+                        name=product["name"],
+                        price=product["price"],
+                        card=product["card"],
+                        add_to_cart_button=product["button"],
+                    ),
+                )
+            self._catalog = catalog
+        return self._catalog
+
+    def invalidate_catalog(self) -> None:
+        """
+        Discards the cached catalog snapshot so the next lookup takes a fresh one.
         """
-        super().__init__(driver)
+        self._catalog = None
 
     def get_all_products(self) -> List[WebElement]:
         """
@@ -56,20 +174,36 @@ class ShoppingPage(BasePage):
     def find_and_add_product_to_cart(self, product_name: str) -> bool:
         """
         Finds a specific product by name and clicks the 'Add to Cart' button.
+        The lookup uses the cached catalog snapshot, so adding several products costs
+        one snapshot plus one round-trip per product. The snapshot is retaken once if
+        the catalog DOM changed since it was captured.
 
         :param product_name: The name of the product to add to the cart.
         :return: True if the product was found and added to the cart, False otherwise.
         """
-        all_products = self.get_all_products()
-        for product in all_products:
-            if self.get_product_name(product) == product_name:
-                self.add_product_to_cart(product)
-                return True
+        for attempt in range(2):
+            fresh = self._catalog is None or attempt > 0
+            product = self.get_catalog(refresh=attempt > 0).get(product_name)
+            if product is None:
+                if fresh:
+                    return False
+                continue
+            try:
+                if execute_script(
+                    self.driver,
+                    CLICK_IF_CATALOG_UNCHANGED_SCRIPT,
+                    product.add_to_cart_button,
+                    self.get_catalog().version,
+                ):
+                    return True
+            except StaleElementReferenceException:
+                pass
+            self.invalidate_catalog()
         return False
 
     def click_checkout(self) -> CheckoutPage:
         """
         Clicks the checkout button to proceed to the next page.
         """
-        self.driver.find_element(*self.CHECKOUT_BUTTON).click()
+        self.find_element(self.CHECKOUT_BUTTON).click()
         return CheckoutPage(self.driver)
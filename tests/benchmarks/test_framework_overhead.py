@@ -0,0 +1,182 @@
+from typing import List
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from page_objects.checkout_page import CheckoutPage
+from page_objects.home_page import HomePage
+from page_objects.shopping_page import ShoppingPage
+from utils.benchmark import BenchmarkRecorder
+from utils.config import PROFILE_CLONE_DIR, PROFILE_TEMPLATE_DIR, WINDOW_SIZE
+from utils.driver_cache import DriverCacheError, resolve_driver_path
+from utils.driver_factory import SUPPORTED_BROWSERS, create_driver
+from utils.driver_pool import DriverPool
+from utils.profile_template import ProfileTemplate
+from utils.test_utilities import TestUtilities
+
+# Generated products added to the stand-in catalog, and cart sizes for checkout
+CATALOG_SIZES: List[int] = [10, 100, 500]
+CART_SIZES: List[int] = [10, 100, 300]
+
+FORM_DATA = {
+    "name": "Bench Mark",
+    "email": "bench@example.com",
+    "password": "benchmark123",
+    "gender": "Female",
+    "employment_status": "Employed",
+    "likes_ice_cream": True,
+    "dob": "01-01-2001",
+}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("browser_name", SUPPORTED_BROWSERS)
+def test_browser_launch(
+    benchmark: BenchmarkRecorder, request: pytest.FixtureRequest, browser_name: str
+) -> None:
+    """
+    Measures a browser launch with a fresh profile against one cloned from a
+    profile template. The template is built before the timed rounds.
+
+    :param benchmark: The benchmark recorder.
+    :param request: The pytest fixture request object containing the test's configuration.
+    :param browser_name: The browser to launch.
+    """
+    headless = bool(request.config.getoption("headless"))
+    try:
+        driver_path = resolve_driver_path(
+            browser_name, offline=request.config.getoption("offline_drivers")
+        )
+        create_driver(browser_name, headless, driver_path).quit()
+    except (DriverCacheError, WebDriverException, OSError) as error:
+        pytest.skip(f"{browser_name} is not available: {error}")
+    benchmark.measure(
+        "browser_launch_default",
+        lambda: create_driver(browser_name, headless, driver_path).quit(),
+        rounds=3,
+        browser=browser_name,
+    )
+    template = ProfileTemplate(
+        browser_name, PROFILE_TEMPLATE_DIR, PROFILE_CLONE_DIR, WINDOW_SIZE
+    )
+    try:
+        template.build(driver_path, headless)
+        result = benchmark.measure(
+            "browser_launch_profile_template",
+            lambda: create_driver(
+                browser_name, headless, driver_path, profile_template=template
+            ).quit(),
+            rounds=3,
+            browser=browser_name,
+        )
+    finally:
+        template.cleanup()
+    assert result.rounds == 3
+
+
+@pytest.mark.benchmark
+class TestFrameworkOverhead(TestUtilities):
+    """
+    Benchmarks of framework overhead per flow, run against the local stand-in app.
+    """
+
+    def test_driver_startup(
+        self, benchmark: BenchmarkRecorder, driver_pool: DriverPool
+    ) -> None:
+        """
+        Measures a cold browser launch against resetting a pooled browser.
+
+        :param benchmark: The benchmark recorder.
+        :param driver_pool: The session-wide driver pool.
+        """
+        benchmark.measure(
+            "driver_startup_cold",
+            lambda: driver_pool.driver_factory().quit(),
+            rounds=3,
+        )
+        result = benchmark.measure(
+            "driver_startup_pool_reset",
+            lambda: driver_pool.reset_driver(self.driver),  # type: ignore
+            rounds=10,
+        )
+        assert result.rounds == 10
+
+    @pytest.mark.parametrize("catalog_size", CATALOG_SIZES)
+    def test_catalog_lookup(
+        self, benchmark: BenchmarkRecorder, base_url: str, catalog_size: int
+    ) -> None:
+        """
+        Measures snapshotting the catalog and adding its last product to the cart.
+
+        :param benchmark: The benchmark recorder.
+        :param base_url: URL of the stand-in app.
+        :param catalog_size: Number of generated products in the catalog.
+        """
+        last_product = f"Product {catalog_size}"
+
+        def lookup() -> None:
+            assert ShoppingPage(self.driver).find_and_add_product_to_cart(  # type: ignore
+                last_product
+            ), f"Product '{last_product}' not found"
+
+        benchmark.measure(
+            "catalog_lookup",
+            lookup,
+            setup=lambda: self.driver.get(  # type: ignore
+                f"{base_url}shop?catalog={catalog_size}&cart=0"
+            ),
+            catalog_size=catalog_size,
+        )
+
+    @pytest.mark.parametrize("mode", HomePage.FILL_MODES)
+    def test_form_fill(
+        self, benchmark: BenchmarkRecorder, base_url: str, mode: str
+    ) -> None:
+        """
+        Measures filling and submitting the home page form.
+
+        :param benchmark: The benchmark recorder.
+        :param base_url: URL of the stand-in app.
+        :param mode: Form fill strategy ("keystroke" or "fast").
+        """
+
+        def fill() -> None:
+            home_page = HomePage(self.driver)  # type: ignore
+            home_page.fill_out_form(FORM_DATA, mode=mode)
+            assert "successfully" in home_page.get_success_message()
+
+        benchmark.measure(
+            "form_fill",
+            fill,
+            setup=lambda: self.driver.get(base_url),  # type: ignore
+            mode=mode,
+        )
+
+    @pytest.mark.parametrize("cart_size", CART_SIZES)
+    def test_cart_verification(
+        self, benchmark: BenchmarkRecorder, base_url: str, cart_size: int
+    ) -> None:
+        """
+        Measures reading the checkout table and removing half of its rows.
+
+        :param benchmark: The benchmark recorder.
+        :param base_url: URL of the stand-in app.
+        :param cart_size: Number of products in the cart.
+        """
+
+        def verify() -> None:
+            checkout_page = CheckoutPage(self.driver)  # type: ignore
+            cart = checkout_page.get_cart()
+            assert len(cart) == cart_size
+            to_remove = cart.names()[::2]
+            remaining = checkout_page.remove_products_from_cart(to_remove)
+            assert len(remaining) == cart_size - len(to_remove)
+
+        benchmark.measure(
+            "cart_verification",
+            verify,
+            setup=lambda: self.driver.get(  # type: ignore
+                f"{base_url}shop/checkout?catalog={cart_size}&cart={cart_size}"
+            ),
+            cart_size=cart_size,
+        )
@@ -1,17 +1,107 @@
-from datetime import datetime
+import inspect
+from functools import partial
 from pathlib import Path
-from typing import Any, Generator, List, Optional
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence
+from urllib.parse import urlsplit
 
 import pytest
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
+from selenium.webdriver.common.service import Service
 
-from utils.config import LOG_DIR, REPORT_DIR, SCREENSHOT_DIR, URL
+from page_objects.app_state import AppState
+from page_objects.base_page import BasePage
+from page_objects.flow import Flow, FlowRunner
+from page_objects.home_page import HomePage
+from utils.benchmark import BENCHMARK_FILE_NAME, BenchmarkRecorder
+from utils.browser_context import ISOLATION_MODES, BrowserContext
+from utils.browser_logs import (
+    CONSOLE_LOG,
+    PERFORMANCE_LOG,
+    BrowserLogs,
+    drain_browser_logs,
+)
+from utils.change_selection import UsageRecorder, UsageStore, select_changed_items
+from utils.command_metrics import (
+    METRICS_FILE_NAME,
+    CommandRecorder,
+    current_page_method,
+    merge_metrics_files,
+    method_call_listeners,
+    render_html_table,
+)
+from utils.config import (
+    BASE_REPORT_DIR,
+    DEFAULT_DIAGNOSTICS_BUFFER_KB,
+    DEFAULT_DRIVER_POOL_SIZE,
+    DEFAULT_REMOTE_CONNECT_TIMEOUT,
+    DEFAULT_REMOTE_MAX_CONNECTIONS,
+    DEFAULT_REMOTE_READ_TIMEOUT,
+    DEFAULT_REMOTE_RETRIES,
+    DIAGNOSTICS_DIR,
+    DURATION_STORE_PATH,
+    LOG_DIR,
+    PROFILE_CLONE_DIR,
+    PROFILE_TEMPLATE_DIR,
+    REPORT_DIR,
+    SCREENSHOT_DIR,
+    URL,
+    USAGE_STORE_PATH,
+    WINDOW_SIZE,
+    WORKER_ID,
+)
+from utils.data_source import get_test_data_source, parse_shard, shard_rows
+from utils.diagnostics import DiagnosticsRecorder
+from utils.driver_cache import resolve_driver_path
+from utils.driver_factory import PAGE_LOAD_STRATEGIES, create_driver
+from utils.driver_pool import DriverPool
+from utils.duration_store import DurationRecorder, DurationStore
+from utils.log_manager import TestLogManager, current_test_id
+from utils.network_filter import (
+    RESOURCE_TYPES,
+    STATS_REPORT_ATTRIBUTE,
+    NetworkFilter,
+    NetworkFilterRules,
+    NetworkFilterStats,
+    NetworkFilterTotals,
+)
+from utils.parallel import (
+    RESULTS_FILE_NAME,
+    ParallelRunner,
+    WorkerResultWriter,
+    main_report_dir,
+    select_assigned_items,
+)
+from utils.profile_template import ProfileTemplate
+from utils.remote_connection import (
+    STAND_IN_REMOTE,
+    RemoteConnectionPool,
+    start_local_server,
+)
+from utils.report_store import REPORT_BACKENDS, StreamingReport
+from utils.reruns import RerunScheduler
+from utils.screenshots import ScreenshotWriter
+from utils.stand_in_server import StandInServer
+
+screenshot_writer_key = pytest.StashKey[ScreenshotWriter]()
+log_manager_key = pytest.StashKey[TestLogManager]()
+command_recorder_key = pytest.StashKey[CommandRecorder]()
+parallel_runner_key = pytest.StashKey[ParallelRunner]()
+benchmark_recorder_key = pytest.StashKey[BenchmarkRecorder]()
+network_filter_key = pytest.StashKey[Optional[NetworkFilter]]()
+network_filter_totals_key = pytest.StashKey[NetworkFilterStats]()
+# What the network filter blocked during a test's call, kept for its teardown
+test_network_stats_key = pytest.StashKey[NetworkFilterStats]()
+diagnostics_key = pytest.StashKey[Optional[DiagnosticsRecorder]]()
+browser_logs_key = pytest.StashKey[Sequence[str]]()
+driver_pool_key = pytest.StashKey[DriverPool]()
+stand_in_server_key = pytest.StashKey[StandInServer]()
+remote_pool_key = pytest.StashKey[RemoteConnectionPool]()
+flow_runner_key = pytest.StashKey[FlowRunner]()
+flow_key = pytest.StashKey[Flow]()
+profile_template_key = pytest.StashKey[ProfileTemplate]()
+remote_server_key = pytest.StashKey[Service]()
+
+REPORT_TITLE = "Selenium Test Automation Summary"
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -42,6 +132,529 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=None,
         help="Run tests in headless mode",
     )
+    parser.addoption(
+        "--pool-size",
+        action="store",
+        type=int,
+        default=DEFAULT_DRIVER_POOL_SIZE,
+        help="Maximum number of warm browser sessions kept in the driver pool",
+    )
+    parser.addoption(
+        "--offline-drivers",
+        action="store_true",
+        default=False,
+        help="Resolve driver binaries from the local cache only, never downloading",
+    )
+    parser.addoption(
+        "--profile-template",
+        action="store_true",
+        default=False,
+        help="Launch browsers from a copy of a profile prepared once, with "
+        "startup-reducing options and a fixed window size",
+    )
+    parser.addoption(
+        "--remote-url",
+        action="store",
+        default=None,
+        help="Run the browsers on a Selenium Grid or standalone server at this URL; "
+        f"'{STAND_IN_REMOTE}' starts the local driver binary as the server",
+    )
+    parser.addoption(
+        "--remote-max-connections",
+        action="store",
+        type=int,
+        default=DEFAULT_REMOTE_MAX_CONNECTIONS,
+        help="Keep-alive connections to the remote server shared by all sessions",
+    )
+    parser.addoption(
+        "--remote-connect-timeout",
+        action="store",
+        type=float,
+        default=DEFAULT_REMOTE_CONNECT_TIMEOUT,
+        help="Seconds to wait for a connection to the remote server",
+    )
+    parser.addoption(
+        "--remote-read-timeout",
+        action="store",
+        type=float,
+        default=DEFAULT_REMOTE_READ_TIMEOUT,
+        help="Seconds to wait for the remote server's response to a command",
+    )
+    parser.addoption(
+        "--remote-retries",
+        action="store",
+        type=int,
+        default=DEFAULT_REMOTE_RETRIES,
+        help="Retries of a remote command after a connection error or reset",
+    )
+    parser.addoption(
+        "--page-load-strategy",
+        action="store",
+        choices=PAGE_LOAD_STRATEGIES,
+        default="normal",
+        help="When navigation returns: after all subresources loaded (normal), once "
+        "the DOM is parsed (eager) or at once (none); page objects wait until ready",
+    )
+    parser.addoption(
+        "--isolation",
+        action="store",
+        default="class",
+        choices=ISOLATION_MODES,
+        help="Reset the pooled browser per test class, or open a fresh browser "
+        "context per test",
+    )
+    parser.addoption(
+        "--fill-mode",
+        action="store",
+        default="keystroke",
+        choices=HomePage.FILL_MODES,
+        help="Form fill strategy: realistic keystrokes or a single fast script",
+    )
+    parser.addoption(
+        "--json-logs",
+        action="store_true",
+        default=False,
+        help="Also write test logs as JSON lines to test_execution.jsonl",
+    )
+    parser.addoption(
+        "--shard",
+        action="store",
+        type=parse_shard,
+        default=None,
+        help="Run only shard I/N of the rows of data-driven tests, e.g. --shard=2/4",
+    )
+    parser.addoption(
+        "--block-resource-types",
+        action="store",
+        default="",
+        help=f"Comma-separated resource types the browser must not load "
+        f"({', '.join(RESOURCE_TYPES)}); stylesheets and scripts are only blocked "
+        "on the --allow-host hosts other than the app's",
+    )
+    parser.addoption(
+        "--block-url",
+        action="append",
+        default=[],
+        help="URL glob pattern the browser must not load (Chrome only; repeatable)",
+    )
+    parser.addoption(
+        "--block-host",
+        action="append",
+        default=[],
+        help="Host glob pattern the browser must not connect to (repeatable)",
+    )
+    parser.addoption(
+        "--allow-host",
+        action="append",
+        default=[],
+        help="Host glob pattern the browser may connect to; all other hosts except "
+        "the app's are blocked (repeatable)",
+    )
+    parser.addoption(
+        "--probe-blocked-sizes",
+        action="store_true",
+        default=False,
+        help="Estimate the bytes the network filter saved with HEAD requests to the "
+        "blocked URLs, sent in the background",
+    )
+    parser.addoption(
+        "--diagnostics-buffer-kb",
+        action="store",
+        type=int,
+        default=DEFAULT_DIAGNOSTICS_BUFFER_KB,
+        help="Memory cap of each test's buffer of recent commands, console messages "
+        "and network events, written to tmp/diagnostics on failure; 0 disables it",
+    )
+    parser.addoption(
+        "--diagnostics-browser-logs",
+        action="store_true",
+        default=False,
+        help="Also capture Chrome's console messages and network events for the "
+        "failure diagnostics; reads the browser logs after every test",
+    )
+    parser.addoption(
+        "--reruns",
+        action="store",
+        type=int,
+        default=0,
+        help="Rerun failed tests up to N times at the end of the session, on the "
+        "already launched browsers; the reruns marker overrides it per test",
+    )
+    parser.addoption(
+        "--changed-since",
+        action="store",
+        default=None,
+        metavar="REF",
+        help="Run only the tests affected by the changes since a git revision, "
+        "based on the page objects and test data each test used in earlier runs",
+    )
+    parser.addoption(
+        "--report-backend",
+        action="store",
+        choices=REPORT_BACKENDS,
+        default="html",
+        help="Report format: pytest-html's single file, or results streamed to disk "
+        "as tests finish with a paged index at the --html path, for large runs",
+    )
+    parser.addoption(
+        "--stand-in",
+        action="store_true",
+        default=False,
+        help="Run against the bundled local stand-in app instead of the live site",
+    )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the framework benchmarks (implies --stand-in)",
+    )
+    parser.addoption(
+        "--workers",
+        action="store",
+        type=int,
+        default=1,
+        help="Run tests in N parallel worker processes, each with its own driver pool",
+    )
+    parser.addoption(
+        "--worker-nodeids",
+        action="store",
+        default=None,
+        help="Internal: file with the node IDs assigned to this worker process",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    """
+    Register custom markers, start the logging subsystem and the background
+    screenshot writer and, when running as a parallel worker, the result stream.
+    Runs before pytest-html's configure hook, so the streaming report can take over
+    the HTML report's path and keep pytest-html from collecting results.
+
+    :param config: The pytest config object.
+    """
+    if config.getoption("report_backend") == "stream":
+        config.option.report_index_path = config.option.htmlpath or str(
+            BASE_REPORT_DIR / "report.html"
+        )
+        config.option.htmlpath = None
+        if not WORKER_ID and not config.option.collectonly:
+            config.pluginmanager.register(
+                StreamingReport(
+                    main_report_dir(config)
+                    / Path(config.option.report_index_path).name,
+                    REPORT_TITLE,
+                ),
+                "streaming_report",
+            )
+    # pytest's log capture already reports each test's records; keep them for the
+    # report ourselves only when it is disabled (-p no:logging)
+    log_manager = TestLogManager(
+        LOG_DIR,
+        json_lines=config.getoption("json_logs"),
+        per_test_logs=not config.pluginmanager.has_plugin("logging"),
+    )
+    log_manager.start()
+    config.stash[log_manager_key] = log_manager
+    config.stash[command_recorder_key] = CommandRecorder()
+    config.stash[benchmark_recorder_key] = BenchmarkRecorder()
+    config.stash[network_filter_key] = create_network_filter(config)
+    config.stash[network_filter_totals_key] = NetworkFilterStats()
+    if config.stash[network_filter_key]:
+        config.pluginmanager.register(
+            NetworkFilterTotals(config.stash[network_filter_totals_key]),
+            "network_filter_totals",
+        )
+    buffer_kb = config.getoption("diagnostics_buffer_kb")
+    diagnostics = (
+        DiagnosticsRecorder(DIAGNOSTICS_DIR, main_report_dir(config), buffer_kb * 1024)
+        if buffer_kb > 0
+        else None
+    )
+    if diagnostics:
+        config.stash[command_recorder_key].listeners.append(diagnostics.record_command)
+    config.stash[diagnostics_key] = diagnostics
+    # Chrome's logs cost a read after every test, so they are only enabled for the
+    # network filter or when requested for the diagnostics
+    diagnostics_logs = bool(diagnostics) and config.getoption(
+        "diagnostics_browser_logs"
+    )
+    browser_logs: List[str] = []
+    if config.stash[network_filter_key] or diagnostics_logs:
+        browser_logs.append(PERFORMANCE_LOG)
+    if diagnostics_logs:
+        browser_logs.append(CONSOLE_LOG)
+    config.stash[browser_logs_key] = browser_logs
+    screenshot_writer = ScreenshotWriter(SCREENSHOT_DIR, main_report_dir(config))
+    screenshot_writer.start()
+    config.stash[screenshot_writer_key] = screenshot_writer
+    config.addinivalue_line(
+        "markers",
+        "fill_mode(mode): form fill strategy for the test, overriding --fill-mode",
+    )
+    config.addinivalue_line(
+        "markers",
+        "test_data(file_name): parametrize the test_data fixture with the rows of a "
+        "file in the test_data directory",
+    )
+    config.addinivalue_line(
+        "markers",
+        "benchmark: framework benchmark, skipped unless --benchmark is given",
+    )
+    config.addinivalue_line(
+        "markers",
+        "flow(builder): build the test's flow for the run_flow fixture by calling "
+        "builder with the test's parameters",
+    )
+    config.stash[flow_runner_key] = FlowRunner(AppState.STORAGE_KEY)
+    config.addinivalue_line(
+        "markers",
+        "reruns(n): rerun the test up to n times at the end of the session if it "
+        "fails, overriding --reruns",
+    )
+    config.pluginmanager.register(
+        RerunScheduler(config.getoption("reruns")), "rerun_scheduler"
+    )
+    if config.getoption("worker_nodeids"):
+        config.pluginmanager.register(
+            WorkerResultWriter(config, REPORT_DIR / RESULTS_FILE_NAME),
+            "worker_result_writer",
+        )
+    elif not WORKER_ID:
+        # Workers' reports are replayed by the controller, which records them all
+        config.pluginmanager.register(
+            DurationRecorder(DurationStore(DURATION_STORE_PATH)), "duration_recorder"
+        )
+    if WORKER_ID or config.getoption("workers") <= 1:
+        # Page-object calls are only seen by the process running the test
+        usage_recorder = UsageRecorder(UsageStore(USAGE_STORE_PATH))
+        method_call_listeners.append(usage_recorder.record_method)
+        config.pluginmanager.register(usage_recorder, "usage_recorder")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """
+    Quit the pooled browsers, stop the stand-in app and flush the screenshots and
+    log records still queued for writing.
+
+    :param config: The pytest config object.
+    """
+    pool = config.stash.get(driver_pool_key, None)
+    if pool:
+        pool.close()
+    profile_template = config.stash.get(profile_template_key, None)
+    if profile_template:
+        profile_template.cleanup()
+    remote_pool = config.stash.get(remote_pool_key, None)
+    if remote_pool:
+        remote_pool.close()
+    remote_server = config.stash.get(remote_server_key, None)
+    if remote_server:
+        remote_server.stop()
+    network_filter = config.stash.get(network_filter_key, None)
+    if network_filter:
+        network_filter.close()
+    server = config.stash.get(stand_in_server_key, None)
+    if server:
+        server.stop()
+    screenshot_writer = config.stash.get(screenshot_writer_key, None)
+    if screenshot_writer:
+        screenshot_writer.stop()
+    log_manager = config.stash.get(log_manager_key, None)
+    if log_manager:
+        log_manager.stop()
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """
+    Parametrize tests marked with test_data by row index. Collection only reads the
+    file's row index; each row is parsed by the test_data fixture when its test runs.
+    With --shard, only the shard's slice of rows is generated.
+
+    :param metafunc: The pytest metafunc object of the test function.
+    """
+    marker: Optional[pytest.Mark] = metafunc.definition.get_closest_marker("test_data")
+    if marker and "test_data" in metafunc.fixturenames:
+        source = get_test_data_source(marker.args[0])
+        rows = shard_rows(len(source), metafunc.config.getoption("shard"))
+        metafunc.parametrize(
+            "test_data", rows, indirect=True, ids=[f"row{row}" for row in rows]
+        )
+
+
+def create_network_filter(config: pytest.Config) -> Optional[NetworkFilter]:
+    """
+    Build the network filter from the command-line rules. When hosts are allowed,
+    the app's own host is always allowed as well, and stylesheets and scripts are
+    blocked on the other allowed hosts only.
+
+    :param config: The pytest config object.
+    :return: The network filter, or None if no rule is configured.
+    :raises pytest.UsageError: If a resource type is unknown, or stylesheets or
+                               scripts are blocked without a third-party host.
+    """
+    block_types = config.getoption("block_resource_types")
+    allow_hosts = config.getoption("allow_host")
+    app_host = urlsplit(URL).hostname or ""
+    try:
+        rules = NetworkFilterRules(
+            block_types=tuple(
+                resource_type.strip()
+                for resource_type in block_types.split(",")
+                if resource_type.strip()
+            ),
+            block_urls=tuple(config.getoption("block_url")),
+            block_hosts=tuple(config.getoption("block_host")),
+            allow_hosts=tuple(allow_hosts + [app_host] if allow_hosts else []),
+            app_hosts=(app_host,),
+        )
+    except ValueError as error:
+        raise pytest.UsageError(str(error)) from error
+    if not rules.enabled:
+        return None
+    return NetworkFilter(rules, probe_sizes=config.getoption("probe_blocked_sizes"))
+
+
+def create_remote_pool(
+    config: pytest.Config, driver_path: Optional[str]
+) -> RemoteConnectionPool:
+    """
+    Build the connection pool to the --remote-url server, starting the local driver
+    binary as the server for --remote-url=stand-in.
+
+    :param config: The pytest config object.
+    :param driver_path: Path of the local driver binary, for the stand-in server.
+    :return: The remote connection pool.
+    """
+    remote_url: str = config.getoption("remote_url")
+    if remote_url == STAND_IN_REMOTE:
+        server = start_local_server(config.getoption("browser"), str(driver_path))
+        config.stash[remote_server_key] = server
+        remote_url = server.service_url
+    remote_pool = RemoteConnectionPool(
+        remote_url,
+        max_connections=config.getoption("remote_max_connections"),
+        connect_timeout=config.getoption("remote_connect_timeout"),
+        read_timeout=config.getoption("remote_read_timeout"),
+        retries=config.getoption("remote_retries"),
+    )
+    config.stash[remote_pool_key] = remote_pool
+    return remote_pool
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    """
+    Skip the benchmarks unless --benchmark is given, and keep only the tests
+    assigned to this process when running as a parallel worker, or the tests
+    affected by the changes since --changed-since otherwise. Then build the flows of
+    the remaining tests, so prefixes they share run once.
+
+    :param config: The pytest config object.
+    :param items: The collected test items, modified in place.
+    """
+    if not config.getoption("benchmark"):
+        skip_benchmark = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+        for item in items:
+            if item.get_closest_marker("benchmark"):
+                item.add_marker(skip_benchmark)
+    nodeids_file: Optional[str] = config.getoption("worker_nodeids")
+    if nodeids_file:
+        select_assigned_items(config, items, Path(nodeids_file))
+    elif config.getoption("changed_since"):
+        select_changed_items(
+            config,
+            items,
+            config.getoption("changed_since"),
+            UsageStore(USAGE_STORE_PATH),
+        )
+    collect_flows(config, items)
+
+
+def collect_flows(config: pytest.Config, items: List[pytest.Item]) -> None:
+    """
+    Builds the flow of every test with a flow marker and adds it to the session's
+    flow trie. The marker's builder is called with the test's parameters that it
+    accepts.
+
+    :param config: The pytest config object.
+    :param items: The collected test items.
+    """
+    runner = config.stash[flow_runner_key]
+    for item in items:
+        marker = item.get_closest_marker("flow")
+        if marker is None:
+            continue
+        builder = marker.args[0]
+        params = getattr(item, "callspec", None)
+        accepted = inspect.signature(builder).parameters
+        flow: Flow = builder(
+            **{
+                name: value
+                for name, value in (params.params if params else {}).items()
+                if name in accepted
+            }
+        )
+        item.stash[flow_key] = flow
+        runner.trie.add(flow)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session: pytest.Session) -> Optional[bool]:
+    """
+    Hand the collected tests to parallel workers when --workers is greater than 1.
+    Returning None falls back to pytest's serial run loop.
+
+    :param session: The pytest session with collected items.
+    """
+    workers: int = session.config.getoption("workers")
+    if (
+        workers <= 1
+        or WORKER_ID
+        or session.config.option.collectonly
+        or session.testsfailed
+    ):
+        return None
+    # Resolve the driver once here; workers inherit the published path
+    if session.config.getoption("remote_url") in (None, STAND_IN_REMOTE):
+        resolve_driver_path(
+            session.config.getoption("browser"),
+            offline=session.config.getoption("offline_drivers"),
+        )
+    runner = ParallelRunner(
+        session, workers, DurationStore(DURATION_STORE_PATH).estimates()
+    )
+    session.config.stash[parallel_runner_key] = runner
+    runner.run()
+    return True
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """
+    Write the per-test WebDriver command latency summaries and the benchmark results
+    to JSON files in the report directory. The controller of a parallel run merges
+    its workers' latency files.
+
+    :param session: The pytest session.
+    """
+    if session.config.option.collectonly:
+        return
+    metrics_path = REPORT_DIR / METRICS_FILE_NAME
+    runner = session.config.stash.get(parallel_runner_key, None)
+    if runner:
+        merge_metrics_files(
+            (
+                BASE_REPORT_DIR / worker_id / METRICS_FILE_NAME
+                for worker_id in runner.worker_ids
+            ),
+            metrics_path,
+        )
+    else:
+        session.config.stash[command_recorder_key].write(metrics_path)
+    benchmarks = session.config.stash[benchmark_recorder_key]
+    if benchmarks.results:
+        benchmarks.write(REPORT_DIR / BENCHMARK_FILE_NAME)
 
 
 def pytest_html_report_title(report: pytest.TestReport) -> None:
@@ -50,45 +663,264 @@ def pytest_html_report_title(report: pytest.TestReport) -> None:
 
     :param report: The report object to modify the title.
     """
-    report.title = "Selenium Test Automation Summary"  # type: ignore
+    report.title = REPORT_TITLE  # type: ignore
 
 
-@pytest.fixture(scope="class")
-def setup(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+@pytest.fixture(scope="session")
+def base_url(request: pytest.FixtureRequest) -> str:
+    """
+    URL of the app under test: the live site, or the bundled stand-in app served
+    locally with --stand-in or --benchmark. The server runs until the end of the run,
+    so tests rerun at the end of the session find it at the same address.
+
+    :param request: The pytest fixture request object containing the test's configuration.
+    :return: The URL, ending with a slash.
+    """
+    if not (
+        request.config.getoption("stand_in") or request.config.getoption("benchmark")
+    ):
+        return URL
+    server = request.config.stash.get(stand_in_server_key, None)
+    if server is None:
+        server = StandInServer()
+        server.start()
+        request.config.stash[stand_in_server_key] = server
+    return server.url
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request: pytest.FixtureRequest, base_url: str) -> DriverPool:
     """
-    Set up the browser and start the test session.
+    The pool of warm browsers. It is created on first use and closed when the run
+    ends, after the tests rerun at the end of the session, which reuse its browsers.
 
     :param request: The pytest fixture request object containing the test's configuration.
+    :param base_url: URL every browser starts on and is reset to.
+    :return: The driver pool.
     """
+    pool = request.config.stash.get(driver_pool_key, None)
+    if pool is not None:
+        return pool
     browser_name: str = request.config.getoption("browser")
-    headless: str = request.config.getoption("headless")
-    driver: Optional[webdriver.Chrome | webdriver.Firefox] = None
-
-    if browser_name == "chrome":
-        chrome_service = ChromeService(ChromeDriverManager().install())
-        chrome_options: ChromeOptions = ChromeOptions()
-        if headless:
-            chrome_options.add_argument("--headless")
-        driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
-    elif browser_name == "firefox":
-        firefox_options: FirefoxOptions = FirefoxOptions()
-        if headless:
-            firefox_options.add_argument("--headless")
-        firefox_service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=firefox_service, options=firefox_options)
-    else:
-        raise ValueError(f"Unsupported browser: {browser_name}")
-    driver.get(URL)
-    driver.maximize_window()
+    headless: bool = bool(request.config.getoption("headless"))
+    remote_url: Optional[str] = request.config.getoption("remote_url")
+    driver_path: Optional[str] = None
+    if remote_url in (None, STAND_IN_REMOTE):
+        driver_path = resolve_driver_path(
+            browser_name, offline=request.config.getoption("offline_drivers")
+        )
+    remote_pool = (
+        create_remote_pool(request.config, driver_path) if remote_url else None
+    )
+    profile_template: Optional[ProfileTemplate] = None
+    if request.config.getoption("profile_template"):
+        profile_template = ProfileTemplate(
+            browser_name, PROFILE_TEMPLATE_DIR, PROFILE_CLONE_DIR, WINDOW_SIZE
+        )
+        request.config.stash[profile_template_key] = profile_template
+    pool = DriverPool(
+        driver_factory=partial(
+            create_driver,
+            browser_name,
+            headless,
+            driver_path,
+            request.config.stash[network_filter_key],
+            enable_bidi=request.config.getoption("isolation") == "context",
+            browser_logs=request.config.stash[browser_logs_key],
+            page_load_strategy=request.config.getoption("page_load_strategy"),
+            remote_pool=remote_pool,
+            profile_template=profile_template,
+        ),
+        start_url=base_url,
+        size=request.config.getoption("pool_size"),
+    )
+    request.config.stash[driver_pool_key] = pool
+    return pool
+
+
+@pytest.fixture(scope="class")
+def setup(
+    request: pytest.FixtureRequest, driver_pool: DriverPool
+) -> Generator[None, None, None]:
+    """
+    Lease a warm browser from the pool for the test class and return it, reset, afterwards.
+    The browser's commands are timed for the command latency report.
+
+    :param request: The pytest fixture request object containing the test's configuration.
+    :param driver_pool: The session-wide driver pool.
+    """
+    driver = driver_pool.acquire()
+    request.config.stash[command_recorder_key].instrument(driver)
+    # Discard log entries from the pool's reset of the browser
+    drain_browser_logs(driver, request.config.stash[browser_logs_key])
     request.cls.driver = driver
     yield
-    driver.close()
+    # Attribute the reset commands to the pool rather than to the last test's code
+    token = current_page_method.set("DriverPool.release")
+    driver_pool.release(driver)
+    current_page_method.reset(token)
+
+
+@pytest.fixture
+def isolation(
+    request: pytest.FixtureRequest, setup: None, driver_pool: DriverPool, base_url: str
+) -> Generator[None, None, None]:
+    """
+    With --isolation=context, run each test in a fresh browser context of the test
+    class's browser (clean cookies, storage and cache) and dispose of it afterwards.
+    If the browser cannot create contexts, its state is reset before each test instead.
+
+    :param request: The pytest fixture request object containing the test's configuration.
+    :param setup: The test class's browser lease.
+    :param driver_pool: The session-wide driver pool.
+    :param base_url: URL every context starts on.
+    """
+    if request.config.getoption("isolation") != "context":
+        yield
+        return
+    driver = request.cls.driver
+    network_filter = request.config.stash[network_filter_key]
+    context = BrowserContext.open(driver, base_url)
+    if context is None:
+        driver_pool.reset_driver(driver)
+    elif network_filter:
+        # CDP blocking rules apply per tab, so install them in the new one too
+        network_filter.attach(driver, driver.capabilities.get("browserName", ""))
+    yield
+    if context:
+        context.close()
+
+
+@pytest.fixture
+def app_state(request: pytest.FixtureRequest, base_url: str) -> AppState:
+    """
+    State setup for the test class's browser: opens the app directly in a named
+    state (shop, checkout or purchase page with a given cart).
+
+    :param request: The pytest fixture request object.
+    :param base_url: URL of the app under test.
+    :return: The state setup helper.
+    """
+    return AppState(request.cls.driver, base_url)
+
+
+@pytest.fixture
+def run_flow(request: pytest.FixtureRequest, app_state: AppState) -> Callable[[], Any]:
+    """
+    Runs the test's flow (see the flow marker) from the deepest branch point an
+    earlier test saved, or from the start.
+
+    :param request: The pytest fixture request object.
+    :param app_state: State setup the flow starts from.
+    :return: A callable running the flow and returning the page object it ends on.
+    """
+    flow = request.node.stash.get(flow_key, None)
+    if flow is None:
+        pytest.fail("run_flow needs a flow marker on the test", pytrace=False)
+    runner = request.config.stash[flow_runner_key]
+    return lambda: runner.run(flow, app_state)
+
+
+@pytest.fixture
+def fill_mode(request: pytest.FixtureRequest) -> str:
+    """
+    Form fill strategy for the current test: the fill_mode marker if present,
+    otherwise the --fill-mode command-line option.
+
+    :param request: The pytest fixture request object.
+    :return: "keystroke" or "fast".
+    """
+    marker: Optional[pytest.Mark] = request.node.get_closest_marker("fill_mode")
+    if marker:
+        mode: str = marker.args[0]
+        if mode not in HomePage.FILL_MODES:
+            raise ValueError(f"Invalid fill mode in marker: {mode}")
+        return mode
+    return str(request.config.getoption("fill_mode"))
+
+
+@pytest.fixture
+def test_data(request: pytest.FixtureRequest) -> Dict[str, Any]:
+    """
+    The row of the test_data marker's file this test instance was parametrized with.
+
+    :param request: The pytest fixture request object.
+    :return: The row as a dictionary.
+    """
+    marker: pytest.Mark = request.node.get_closest_marker("test_data")
+    return get_test_data_source(marker.args[0]).read_row(request.param)
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> BenchmarkRecorder:
+    """
+    The session's benchmark recorder; results are printed in the terminal summary.
+
+    :param request: The pytest fixture request object.
+    :return: The benchmark recorder.
+    """
+    return request.config.stash[benchmark_recorder_key]
+
+
+def pytest_terminal_summary(terminalreporter: Any) -> None:
+    """
+    Print how many element lookups the page objects' element cache saved, the
+    remote server's round-trip time, what the network filter blocked, the flow
+    steps restored instead of replayed, and the benchmark results.
+
+    :param terminalreporter: The pytest terminal reporter.
+    """
+    totals = BasePage.element_cache_totals
+    if totals["hits"] or totals["misses"]:
+        terminalreporter.write_line(
+            f"Element cache: {totals['hits']} hits (round-trips saved), "
+            f"{totals['misses']} misses, {totals['stale']} stale re-resolves"
+        )
+    remote_pool = terminalreporter.config.stash.get(remote_pool_key, None)
+    if remote_pool and remote_pool.requests:
+        terminalreporter.write_line(
+            f"Remote WebDriver at {remote_pool.url}: {remote_pool.requests} requests, "
+            f"{remote_pool.request_time / remote_pool.requests * 1000:.1f} ms each "
+            "on average"
+        )
+    if terminalreporter.config.stash[network_filter_key]:
+        totals = terminalreporter.config.stash[network_filter_totals_key]
+        terminalreporter.write_line(totals.describe())
+    flow_stats = terminalreporter.config.stash[flow_runner_key].stats
+    if flow_stats["restored"]:
+        terminalreporter.write_line(
+            f"Flows: {flow_stats['saved']} branch point(s) saved, restored "
+            f"{flow_stats['restored']} time(s), {flow_stats['skipped steps']} shared "
+            "steps not replayed"
+        )
+    benchmarks = terminalreporter.config.stash[benchmark_recorder_key]
+    if benchmarks.results:
+        terminalreporter.write_sep("-", "framework benchmarks")
+        for line in benchmarks.summary_lines():
+            terminalreporter.write_line(line)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: pytest.Item) -> Generator[None, None, None]:
+    """
+    Tag every log record emitted while the test runs with its node ID.
+
+    :param item: The pytest item (test) that is being executed.
+    """
+    token = current_test_id.set(item.nodeid)
+    yield
+    current_test_id.reset(token)
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item: pytest.Item) -> Generator[None, None, None]:
     """
-    Take a screenshot and attach it to the HTML report if the test fails.
+    Capture a screenshot and write the test's diagnostics buffer (recent commands,
+    console messages and network events) if the test fails, and link both from the
+    HTML report. The screenshot is handed to the background writer, so the hook never
+    waits for image encoding.
+    After the call, attach what the network filter blocked during the test; after
+    teardown, attach the test's WebDriver command latency table.
 
     :param item: The pytest item (test) that is being executed.
     """
@@ -101,27 +933,61 @@ def pytest_runtest_makereport(item: pytest.Item) -> Generator[None, None, None]:
 
     # Proceed only if report is not None
     if report:
+        test_log = item.config.stash[log_manager_key].pop_test_log(item.nodeid)
+        if test_log:
+            report.sections.append((f"Captured test log {report.when}", test_log))
         if report.when == "call" or report.when == "setup":
             xfail = hasattr(report, "wasxfail")
             # Ensure the test failed or was expected to fail
-            if (report.skipped and xfail) or (report.failed and not xfail):
-                # Get the driver from the class level
-                driver: Optional[webdriver.Remote] = getattr(item.cls, "driver", None)  # type: ignore
-                if driver:
-                    # Generate a unique file name using test name, status, and timestamp
-                    timestamp: str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                    test_case_name: str = report.nodeid.split("::")[-1]
-                    file_name: str = f"{test_case_name}_failed_{timestamp}.png"
-                    screenshot_path: Path = SCREENSHOT_DIR / file_name
-                    # Take the screenshot
-                    driver.save_screenshot(str(screenshot_path))
-                    if screenshot_path.exists():
-                        html = (
-                            f'<div><img src="{screenshot_path}" alt="screenshot" style="width:304px;height:228px;" '
-                            'onclick="window.open(this.src)" align="right"/></div>'
-                        )
-                        if pytest_html:
-                            extras.append(pytest_html.extras.url(driver.current_url))
-                            extras.append(pytest_html.extras.html(html))
-
-            report.extras = extras  # type: ignore
+            failed = (report.skipped and xfail) or (report.failed and not xfail)
+            # Get the driver from the class level
+            driver: Optional[webdriver.Remote] = getattr(item.cls, "driver", None)  # type: ignore
+            logs = BrowserLogs()
+            if driver and (report.when == "call" or failed):
+                logs = drain_browser_logs(driver, item.config.stash[browser_logs_key])
+            if failed and driver:
+                # Capture in memory; the writer stores it under its content hash
+                png: bytes = driver.get_screenshot_as_png()
+                links = item.config.stash[screenshot_writer_key].submit(png)
+                if links:
+                    html = (
+                        f'<div><a href="{links.full}" target="_blank">'
+                        f'<img src="{links.thumbnail}" alt="screenshot" '
+                        'style="width:304px;height:228px;object-fit:contain;" '
+                        'align="right"/></a></div>'
+                    )
+                    if pytest_html:
+                        extras.append(pytest_html.extras.url(driver.current_url))
+                        extras.append(pytest_html.extras.html(html))
+            diagnostics = item.config.stash[diagnostics_key]
+            if failed and diagnostics:
+                diagnostics.record_browser_logs(item.nodeid, logs)
+                link = diagnostics.dump(item.nodeid)
+                if link and pytest_html:
+                    extras.append(pytest_html.extras.url(link, name="Diagnostics"))
+            network_filter = item.config.stash[network_filter_key]
+            if report.when == "call" and network_filter and driver:
+                # Sizes are looked up in the background until the test's teardown
+                item.stash[test_network_stats_key] = network_filter.collect(
+                    driver, logs.network
+                )
+
+        if report.when == "teardown":
+            network_filter = item.config.stash[network_filter_key]
+            stats = item.stash.get(test_network_stats_key, None)
+            if stats:
+                del item.stash[test_network_stats_key]
+            if network_filter and stats:
+                network_filter.estimate_bytes_saved(stats)
+                # Sent with the report, so a parallel run's controller can add it up
+                setattr(report, STATS_REPORT_ATTRIBUTE, stats.counts())
+                if pytest_html:
+                    extras.append(pytest_html.extras.html(f"<p>{stats.describe()}</p>"))
+            recorder = item.config.stash[command_recorder_key]
+            summary = recorder.summarize(item.nodeid)
+            if summary and pytest_html:
+                extras.append(pytest_html.extras.html(render_html_table(summary)))
+            diagnostics = item.config.stash[diagnostics_key]
+            if diagnostics:
+                diagnostics.discard(item.nodeid)
+        report.extras = extras  # type: ignore
@@ -1,54 +1,128 @@
 import logging
-from typing import List
+from typing import Any, Callable, List, Sequence
 
 import pytest
-from selenium.webdriver.remote.webelement import WebElement
 
 from page_objects.checkout_page import CheckoutPage
-from page_objects.home_page import HomePage
+from page_objects.flow import Flow
 from page_objects.purchase_page import PurchasePage
 from page_objects.shopping_page import ShoppingPage
 from utils.test_utilities import TestUtilities
 
 
+def add_product_to_cart(shopping_page: ShoppingPage, product: str) -> None:
+    """
+    Flow step adding a product to the cart from the shop page.
+
+    :param shopping_page: The shopping page object.
+    :param product: Name of the product to add.
+    """
+    TestECommercePurchaseFlow._add_products_to_cart(
+        shopping_page, [product], TestUtilities.create_logger()
+    )
+
+
+def verify_cart_items(checkout_page: CheckoutPage, expected_products: List[str]) -> None:
+    """
+    Flow step verifying the cart on the checkout page.
+
+    :param checkout_page: The checkout page object.
+    :param expected_products: List of expected product names.
+    """
+    TestECommercePurchaseFlow._verify_cart_items(
+        checkout_page, expected_products, TestUtilities.create_logger()
+    )
+
+
+def set_quantity(checkout_page: CheckoutPage, quantity: int) -> None:
+    """
+    Flow step updating the quantity of the product in the cart, if above one, and
+    verifying it.
+
+    :param checkout_page: The checkout page object.
+    :param quantity: Quantity of the product to purchase.
+    """
+    if quantity > 1:
+        TestUtilities.create_logger().info(f"Updating quantity to {quantity}.")
+        checkout_page.enter_quantity(quantity)
+    actual_quantity: int = int(checkout_page.get_quantity())
+    assert (
+        actual_quantity == quantity
+    ), f"Expected quantity {quantity}, but got {actual_quantity}."
+
+
+def cart_flow(products: Sequence[str]) -> Flow:
+    """
+    Opens the shop, adds the products one by one and verifies them in the checkout.
+    Carts starting with the same products share those steps.
+
+    :param products: Names of the products to add.
+    :return: The flow.
+    """
+    flow = Flow().call("open_shop")
+    for product in products:
+        flow.then(add_product_to_cart, product)
+    return flow.call("click_checkout").then(verify_cart_items, list(products))
+
+
+def product_purchase_flow(product_to_buy: str, quantity: int) -> Flow:
+    """
+    Opens the checkout with the product in the cart, sets the quantity and completes
+    the purchase. Purchases of the same product share the steps up to the quantity.
+
+    :param product_to_buy: Name of the product to be purchased.
+    :param quantity: Quantity of the product to purchase.
+    :return: The flow.
+    """
+    return (
+        Flow()
+        .call("open_checkout", [product_to_buy])
+        .then(verify_cart_items, [product_to_buy])
+        .then(set_quantity, quantity)
+        .call("proceed_to_purchase")
+        .call("select_delivery_location", "ind")
+        .call("accept_terms_and_conditions")
+        .call("complete_purchase")
+    )
+
+
 class TestECommercePurchaseFlow(TestUtilities):
     """
     Tests for the e-commerce purchase flow.
     """
 
-    def test_add_two_products_and_verify_cart_items_in_checkout(self) -> None:
+    @pytest.mark.flow.with_args(lambda: cart_flow(["Nokia Edge", "Samsung Note 8"]))
+    def test_add_two_products_and_verify_cart_items_in_checkout(
+        self, run_flow: Callable[[], Any]
+    ) -> None:
         """
         Verifies that two products can be added to the cart and checked out successfully.
+
+        :param run_flow: Runs the test's flow: open the shop, add the products and
+                         verify them in the checkout.
         """
         logger: logging.Logger = self.create_logger()
-        products_to_buy: List[str] = ["Nokia Edge", "Samsung Note 8"]
 
-        # Navigate to shop page and add products
-        shopping_page: ShoppingPage = self._navigate_to_shop_page(logger)
-        self._add_products_to_cart(shopping_page, products_to_buy, logger)
+        logger.info("Adding 'Nokia Edge' and 'Samsung Note 8' and proceeding to checkout.")
+        run_flow()
 
-        # Proceed to checkout and verify cart
-        logger.info("Proceeding to checkout.")
-        checkout_page: CheckoutPage = shopping_page.click_checkout()
-        self._verify_cart_items(checkout_page, products_to_buy, logger)
-        self.driver.refresh()  # type: ignore
-
-    def test_add_two_products_remove_one_and_verify_cart(self) -> None:
+    @pytest.mark.flow.with_args(lambda: cart_flow(["Nokia Edge", "Blackberry"]))
+    def test_add_two_products_remove_one_and_verify_cart(
+        self, run_flow: Callable[[], Any]
+    ) -> None:
         """
         Verifies that one of two added products can be removed from the cart.
+
+        :param run_flow: Runs the test's flow: open the shop, add the products and
+                         verify them in the checkout.
         """
         logger: logging.Logger = self.create_logger()
         products_to_buy: List[str] = ["Nokia Edge", "Blackberry"]
         product_to_remove: str = "Blackberry"
 
-        # Navigate to shop page and add products
-        shopping_page: ShoppingPage = self._navigate_to_shop_page(logger)
-        self._add_products_to_cart(shopping_page, products_to_buy, logger)
-
-        # Proceed to checkout and verify cart
-        logger.info("Proceeding to checkout.")
-        checkout_page: CheckoutPage = shopping_page.click_checkout()
-        self._verify_cart_items(checkout_page, products_to_buy, logger)
+        # Add the products and verify them in the checkout
+        logger.info(f"Adding {products_to_buy} and proceeding to checkout.")
+        checkout_page: CheckoutPage = run_flow()
 
         # Remove a product and verify the cart again
         logger.info(f"Removing product '{product_to_remove}' from the cart.")
@@ -59,54 +133,34 @@ class TestECommercePurchaseFlow(TestUtilities):
             product for product in products_to_buy if product != product_to_remove
         ]
         self._verify_cart_items(checkout_page, remaining_products, logger)
-        self.driver.refresh()  # type: ignore
 
+    @pytest.mark.flow.with_args(product_purchase_flow)
     @pytest.mark.parametrize(
         "product_to_buy, quantity", [("Blackberry", 1), ("Blackberry", 2)]
     )
-    def test_product_purchase_flow(self, product_to_buy: str, quantity: int) -> None:
+    def test_product_purchase_flow(
+        self, run_flow: Callable[[], Any], product_to_buy: str, quantity: int
+    ) -> None:
         """
         Verifies the successful purchase process for a specific product.
 
+        :param run_flow: Runs the test's flow: open the checkout with the product in
+                         the cart, set the quantity and complete the purchase.
         :param product_to_buy: Name of the product to be purchased.
         :param quantity: Quantity of the product to purchase.
         """
         logger: logging.Logger = self.create_logger()
 
         # Constants
-        country_code: str = "ind"
         expected_success_keyword: str = "Success"
 
         logger.info(
             f"Starting test for product '{product_to_buy}' with quantity {quantity}."
         )
 
-        # Navigate to shop page and add product
-        shopping_page: ShoppingPage = self._navigate_to_shop_page(logger)
-        self._add_products_to_cart(shopping_page, [product_to_buy], logger)
-
-        # Proceed to checkout
-        logger.info("Proceeding to checkout.")
-        checkout_page: CheckoutPage = shopping_page.click_checkout()
-        self._verify_cart_items(checkout_page, [product_to_buy], logger)
-
-        # Update quantity if applicable
-        if quantity > 1:
-            logger.info(
-                f"Updating quantity to {quantity} for product '{product_to_buy}'."
-            )
-            checkout_page.enter_quantity(quantity)
-        actual_quantity: int = int(checkout_page.get_quantity())
-        assert (
-            actual_quantity == quantity
-        ), f"Expected quantity {quantity}, but got {actual_quantity}."
-
-        # Complete the purchase
-        purchase_page: PurchasePage = checkout_page.proceed_to_purchase()
+        # Open the checkout, set the quantity and complete the purchase
         logger.info("Completing the purchase process.")
-        purchase_page.select_delivery_location(country_code)
-        purchase_page.accept_terms_and_conditions()
-        purchase_page.complete_purchase()
+        purchase_page: PurchasePage = run_flow()
 
         # Verify success message
         actual_message: str = purchase_page.get_success_message()
@@ -116,19 +170,6 @@ class TestECommercePurchaseFlow(TestUtilities):
         ), f"Expected success message to contain '{expected_success_keyword}', but got: {actual_message}"
         logger.info("Purchase successful. Test passed.")
 
-        self.driver.refresh()  # type: ignore
-
-    def _navigate_to_shop_page(self, logger: logging.Logger) -> ShoppingPage:
-        """
-        Navigates to the shop page and returns the shopping page object.
-
-        :param logger: Logger instance for logging the navigation step.
-        :return: ShoppingPage instance.
-        """
-        home_page: HomePage = HomePage(self.driver)  # type: ignore
-        logger.info("Navigating to the shop page.")
-        return home_page.navigate_to_shop_page()
-
     @staticmethod
     def _add_products_to_cart(
         shopping_page: ShoppingPage, products: List[str], logger: logging.Logger
@@ -159,11 +200,10 @@ class TestECommercePurchaseFlow(TestUtilities):
         :param expected_products: List of expected product names.
         :param logger: Logger instance for logging the verification process.
         """
-        cart_items: List[WebElement] = checkout_page.get_cart_items()
+        cart_item_names: List[str] = checkout_page.get_cart().names()
         assert (
-            len(cart_items) == len(expected_products)
-        ), f"Expected {len(expected_products)} products in cart but got: {len(cart_items)}"
-        cart_item_names: List[str] = [item.text for item in cart_items]
+            len(cart_item_names) == len(expected_products)
+        ), f"Expected {len(expected_products)} products in cart but got: {len(cart_item_names)}"
         assert (
             sorted(cart_item_names) == sorted(expected_products)
         ), f"Cart items mismatch. Expected {expected_products}, but got {cart_item_names}."
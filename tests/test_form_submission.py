@@ -12,21 +12,20 @@ class TestFormSubmission(TestUtilities):
     Test class for validating form submissions on the homepage.
     """
 
-    @pytest.mark.parametrize(
-        "test_data", TestUtilities.load_test_data("form_submission.json")
-    )
-    def test_form_submission(self, test_data: Dict[str, Any]) -> None:
+    @pytest.mark.test_data("form_submission.json")
+    def test_form_submission(self, test_data: Dict[str, Any], fill_mode: str) -> None:
         """
         Validates the form submission process using parameterized test data.
 
         :param test_data: A dictionary containing the test data for form fields.
+        :param fill_mode: Form fill strategy ("keystroke" or "fast").
         """
         logger: logging.Logger = self.create_logger()
         home_page: HomePage = HomePage(self.driver)  # type: ignore
         logger.info(f"Starting form submission test with data: {test_data}")
 
         # Fill out the form
-        home_page.fill_out_form(test_data)
+        home_page.fill_out_form(test_data, mode=fill_mode)
 
         # Validate success message
         actual_message: str = home_page.get_success_message()
@@ -0,0 +1,226 @@
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set
+
+import pytest
+
+from utils import change_selection
+from utils.change_selection import (
+    ChangeSet,
+    _uses_change,
+    _widen_unrecorded,
+    changed_files,
+    classify_changes,
+    import_closure,
+)
+
+PAGE = "page_objects/checkout_page.py"
+
+PAGE_SOURCE = """\
+from typing import Any
+
+
+def parse_amount(text: str) -> float:
+    return float(text)
+
+
+class Cart:
+    def get(self, name: str) -> str:
+        return name
+
+
+class CheckoutPage:
+    QUANTITY = ("id", "quantity")
+
+    def get_quantity(self) -> Any:
+        return self.QUANTITY
+
+    def proceed(self) -> int:
+        return 1
+"""
+
+DIFF = """\
+diff --git a/page_objects/checkout_page.py b/page_objects/checkout_page.py
+index 1111111..2222222 100644
+--- a/page_objects/checkout_page.py
++++ b/page_objects/checkout_page.py
+@@ -5 +5 @@ def parse_amount(text: str) -> float:
+-    return float(text.strip())
++    return float(text)
+@@ -16,0 +17,2 @@ class CheckoutPage:
++    def get_quantity(self) -> Any:
++        return self.QUANTITY
+@@ -30,3 +31,0 @@ class CheckoutPage:
+-    def removed(self) -> None:
+-        pass
+-
+diff --git a/test_data/products.csv b/test_data/products.csv
+new file mode 100644
+index 0000000..3333333
+--- /dev/null
++++ b/test_data/products.csv
+@@ -0,0 +1,2 @@
++name
++Blackberry
+diff --git a/page_objects/logo.png b/page_objects/logo.png
+index 4444444..5555555 100644
+Binary files a/page_objects/logo.png and b/page_objects/logo.png differ
+diff --git a/utils/old.py b/utils/old.py
+deleted file mode 100644
+index 6666666..0000000
+--- a/utils/old.py
++++ /dev/null
+@@ -1 +0,0 @@
+-VALUE = 1
+"""
+
+
+@pytest.fixture
+def repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """
+    Points change selection at a temporary repository root holding a page-object
+    module and a utility module importing another.
+
+    :return: The repository root.
+    """
+    (tmp_path / "page_objects").mkdir()
+    (tmp_path / PAGE).write_text(PAGE_SOURCE, encoding="utf-8")
+    (tmp_path / "utils").mkdir()
+    (tmp_path / "utils" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "utils" / "a.py").write_text("from .b import VALUE\n", encoding="utf-8")
+    (tmp_path / "utils" / "b.py").write_text("VALUE = 1\n", encoding="utf-8")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_x.py").write_text(
+        "from utils.a import VALUE\n", encoding="utf-8"
+    )
+    monkeypatch.setattr(change_selection, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(change_selection, "BASE_TMP_DIR", tmp_path / "tmp")
+    monkeypatch.setattr(change_selection, "TEST_DATA_DIR", tmp_path / "test_data")
+    import_closure.cache_clear()
+    yield tmp_path
+    import_closure.cache_clear()
+
+
+def fake_git(outputs: Dict[str, str]) -> Callable[..., str]:
+    """
+    Builds a stand-in for change_selection.git answering by subcommand.
+
+    :param outputs: Output per git subcommand ("diff", "ls-files").
+    :return: The stand-in function.
+    """
+    return lambda *args: outputs[args[0]]
+
+
+def test_changed_files_parses_hunks(
+    repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Modified files map to their changed lines, including both neighbours of a pure
+    deletion; added, deleted, binary and untracked files change as a whole, and
+    run artifacts under tmp are ignored.
+    """
+    monkeypatch.setattr(
+        change_selection,
+        "git",
+        fake_git({"diff": DIFF, "ls-files": "tmp/usage.sqlite\nnotes.txt\n"}),
+    )
+    assert changed_files("origin/main") == {
+        PAGE: {5, 17, 18, 31, 32},
+        "test_data/products.csv": None,
+        "page_objects/logo.png": None,
+        "utils/old.py": None,
+        "notes.txt": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "line, attribute, expected",
+    [
+        (5, "methods", {f"{PAGE}::parse_amount"}),
+        (10, "methods", {f"{PAGE}::Cart.get"}),
+        (14, "constants", {"QUANTITY"}),
+        (17, "methods", {f"{PAGE}::CheckoutPage.get_quantity"}),
+        (15, "classes", {f"{PAGE}::CheckoutPage"}),
+        (1, "files", {PAGE}),
+    ],
+)
+def test_page_object_lines_map_to_symbols(
+    repo: Path, line: int, attribute: str, expected: Set[str]
+) -> None:
+    """
+    A changed line of a page object maps to the innermost function, class
+    constant or class containing it, or to the whole module outside any class.
+    """
+    assert getattr(classify_changes({PAGE: {line}}), attribute) == expected
+
+
+@pytest.mark.parametrize(
+    "path, lines, attribute, expected",
+    [
+        ("tests/conftest.py", None, "run_all", "tests/conftest.py changed"),
+        ("requirements.txt", None, "run_all", "requirements.txt changed"),
+        ("utils/stand_in/app.html", None, "run_all", "utils/stand_in/app.html changed"),
+        ("utils/a.py", {1}, "utils_modules", {"utils/a.py"}),
+        ("tests/test_x.py", {1}, "test_modules", {"tests/test_x.py"}),
+        ("test_data/products.csv", None, "files", {"test_data/products.csv"}),
+        (PAGE, None, "files", {PAGE}),
+    ],
+)
+def test_classify_changes_by_location(
+    repo: Path,
+    path: str,
+    lines: Optional[Set[int]],
+    attribute: str,
+    expected: object,
+) -> None:
+    """
+    Changed files are sorted by where they live in the repository.
+    """
+    assert getattr(classify_changes({path: lines}), attribute) == expected
+
+
+def test_constant_change_selects_methods_referring_to_it(repo: Path) -> None:
+    """
+    A changed locator affects the tests whose recorded methods refer to it.
+    """
+    changes = classify_changes({PAGE: {14}})
+    assert _uses_change({f"{PAGE}::CheckoutPage.get_quantity"}, changes)
+    assert not _uses_change({f"{PAGE}::CheckoutPage.proceed"}, changes)
+
+
+def test_unrecorded_changes_cover_their_module(repo: Path) -> None:
+    """
+    Changes to functions and classes no test records using (module helpers, helper
+    classes) select every test using the module; recorded ones stay narrow.
+    """
+    usage = {
+        "tests/test_x.py::test_quantity": {f"{PAGE}::CheckoutPage.get_quantity"},
+        "tests/test_x.py::test_proceed": {f"{PAGE}::CheckoutPage.proceed"},
+        "tests/test_x.py::test_other": {"page_objects/home_page.py::HomePage.open"},
+    }
+    helper = classify_changes({PAGE: {5, 10}})
+    _widen_unrecorded(helper, usage)
+    assert helper.files == {PAGE}
+    assert _uses_change(usage["tests/test_x.py::test_proceed"], helper)
+    assert not _uses_change(usage["tests/test_x.py::test_other"], helper)
+
+    recorded = classify_changes({PAGE: {17}})
+    _widen_unrecorded(recorded, usage)
+    assert recorded.files == set()
+    assert _uses_change(usage["tests/test_x.py::test_quantity"], recorded)
+    assert not _uses_change(usage["tests/test_x.py::test_proceed"], recorded)
+
+
+def test_unrecorded_class_covers_its_module(repo: Path) -> None:
+    """
+    A change to a class line of a class no test records widens to its module.
+    """
+    changes = ChangeSet(classes={f"{PAGE}::Cart"})
+    _widen_unrecorded(changes, {"t": {f"{PAGE}::CheckoutPage.proceed"}})
+    assert changes.files == {PAGE}
+
+
+def test_import_closure_follows_relative_imports(repo: Path) -> None:
+    """
+    A test module's closure includes the utility modules it imports indirectly.
+    """
+    assert {"utils/a.py", "utils/b.py"} <= import_closure("tests/test_x.py")
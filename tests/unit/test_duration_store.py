@@ -0,0 +1,97 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List
+
+from utils.duration_store import EXPIRY_FACTOR, DurationStore
+
+TEST = "tests/test_a.py::TestA::test_one"
+OTHER = "tests/test_a.py::TestA::test_two"
+
+
+def call_durations(store: DurationStore, nodeid: str) -> List[float]:
+    """
+    Reads the stored call durations of a test, oldest run first.
+
+    :param store: The duration store.
+    :param nodeid: The test's node ID.
+    :return: The call durations.
+    """
+    with closing(sqlite3.connect(store.path)) as connection:
+        return [
+            call
+            for (call,) in connection.execute(
+                "SELECT call FROM durations WHERE nodeid = ? ORDER BY run", (nodeid,)
+            )
+        ]
+
+
+def phases(call: float) -> Dict[str, float]:
+    """
+    Builds the phase durations of a test whose setup and teardown take no time.
+
+    :param call: Duration of the call phase.
+    :return: The phase durations.
+    """
+    return {"setup": 0.0, "call": call, "teardown": 0.0}
+
+
+def test_window_keeps_recent_runs(tmp_path: Path) -> None:
+    """
+    Each test keeps only its most recent ``window`` runs, and estimates are the
+    median of those.
+    """
+    store = DurationStore(tmp_path / "durations.sqlite", window=3)
+    for call in (100.0, 1.0, 2.0, 3.0, 4.0):
+        store.record_run({TEST: phases(call)})
+    assert call_durations(store, TEST) == [2.0, 3.0, 4.0]
+    assert store.estimates() == {TEST: 3.0}
+
+
+def test_window_is_per_test(tmp_path: Path) -> None:
+    """
+    A test that ran in fewer runs keeps its history while others are trimmed.
+    """
+    store = DurationStore(tmp_path / "durations.sqlite", window=2)
+    store.record_run({TEST: phases(1.0), OTHER: phases(5.0)})
+    store.record_run({TEST: phases(2.0)})
+    store.record_run({TEST: phases(3.0)})
+    assert call_durations(store, TEST) == [2.0, 3.0]
+    assert call_durations(store, OTHER) == [5.0]
+
+
+def test_stopped_tests_expire(tmp_path: Path) -> None:
+    """
+    The history of a test that stopped running is dropped after ``window`` times
+    EXPIRY_FACTOR runs, along with runs nothing refers to.
+    """
+    store = DurationStore(tmp_path / "durations.sqlite", window=2)
+    store.record_run({OTHER: phases(5.0)})
+    for _ in range(2 * EXPIRY_FACTOR - 1):
+        store.record_run({TEST: phases(1.0)})
+    assert call_durations(store, OTHER) == [5.0]
+    store.record_run({TEST: phases(1.0)})
+    assert call_durations(store, OTHER) == []
+    with closing(sqlite3.connect(store.path)) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM runs").fetchone() == (2,)
+
+
+def test_flakiness_counts_passes_after_reruns(tmp_path: Path) -> None:
+    """
+    Runs that passed only after a rerun count as flaky.
+    """
+    store = DurationStore(tmp_path / "durations.sqlite", window=10)
+    store.record_run({TEST: phases(1.0)}, {TEST: ("passed", 1)})
+    store.record_run({TEST: phases(1.0)}, {TEST: ("passed", 0)})
+    store.record_run({TEST: phases(1.0)}, {TEST: ("failed", 2)})
+    assert store.flakiness([TEST, OTHER]) == {TEST: (1, 3)}
+
+
+def test_missing_store_has_no_estimates(tmp_path: Path) -> None:
+    """
+    A store that was never written estimates nothing and is not created.
+    """
+    store = DurationStore(tmp_path / "durations.sqlite")
+    assert store.estimates() == {}
+    assert store.flakiness([TEST]) == {}
+    assert not store.path.exists()
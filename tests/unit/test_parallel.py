@@ -0,0 +1,72 @@
+from utils.parallel import class_scope, partition_nodeids
+
+NODEIDS = [
+    "tests/test_a.py::TestA::test_one[row0]",
+    "tests/test_a.py::TestA::test_one[row1]",
+    "tests/test_a.py::TestA::test_two",
+    "tests/test_b.py::TestB::test_one",
+    "tests/test_b.py::test_function",
+    "tests/test_c.py::TestC::test_one",
+]
+
+
+def test_class_scope() -> None:
+    """
+    Parametrized and plain tests map to their class; module-level tests to
+    themselves.
+    """
+    assert class_scope("tests/test_a.py::TestA::test_one[row0]") == (
+        "tests/test_a.py::TestA"
+    )
+    assert class_scope("tests/test_a.py::TestA::test_two") == "tests/test_a.py::TestA"
+    assert class_scope("tests/test_b.py::test_function") == (
+        "tests/test_b.py::test_function"
+    )
+    assert class_scope("tests/test_b.py::test_function[x::y]") == (
+        "tests/test_b.py::test_function[x::y]"
+    )
+
+
+def test_partition_keeps_classes_together() -> None:
+    """
+    Every test of a class goes to the same worker, in collection order.
+    """
+    buckets = partition_nodeids(NODEIDS, 3)
+    assert sorted(nodeid for bucket in buckets for nodeid in bucket) == sorted(NODEIDS)
+    owner = {nodeid: index for index, bucket in enumerate(buckets) for nodeid in bucket}
+    class_a = [nodeid for nodeid in NODEIDS if "::TestA::" in nodeid]
+    assert len({owner[nodeid] for nodeid in class_a}) == 1
+    assert [nodeid for nodeid in buckets[owner[class_a[0]]] if nodeid in class_a] == (
+        class_a
+    )
+
+
+def test_partition_balances_by_duration() -> None:
+    """
+    The longest class goes first to its own worker and the shorter ones share the
+    other worker; unknown tests count as the median known duration.
+    """
+    durations = {
+        "tests/test_a.py::TestA::test_one[row0]": 1.0,
+        "tests/test_a.py::TestA::test_one[row1]": 1.0,
+        "tests/test_a.py::TestA::test_two": 1.0,
+        "tests/test_b.py::TestB::test_one": 10.0,
+        "tests/test_c.py::TestC::test_one": 2.0,
+    }
+    buckets = partition_nodeids(NODEIDS, 2, durations)
+    assert buckets[0] == ["tests/test_b.py::TestB::test_one"]
+    assert buckets[1] == [
+        "tests/test_a.py::TestA::test_one[row0]",
+        "tests/test_a.py::TestA::test_one[row1]",
+        "tests/test_a.py::TestA::test_two",
+        "tests/test_c.py::TestC::test_one",
+        "tests/test_b.py::test_function",
+    ]
+
+
+def test_partition_with_more_workers_than_classes() -> None:
+    """
+    Workers without a class get an empty list.
+    """
+    buckets = partition_nodeids(NODEIDS[:3], 3)
+    assert buckets == [NODEIDS[:3], [], []]
@@ -0,0 +1,79 @@
+import socket
+import threading
+from typing import Iterator, List
+
+import pytest
+from urllib3.exceptions import MaxRetryError, ProtocolError
+
+from utils.remote_connection import RemoteConnectionPool
+
+
+class HangUpServer:
+    """
+    Local HTTP server that reads each request and closes the connection without
+    replying, as a Grid node does when it dies while running a command.
+    """
+
+    def __init__(self) -> None:
+        self.requests: List[bytes] = []
+        self._socket = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._socket.getsockname()[1]}"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        """
+        Accepts connections until the server is closed, recording each request.
+        """
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            with connection:
+                self.requests.append(connection.recv(65536))
+
+    def close(self) -> None:
+        """
+        Stops accepting connections.
+        """
+        self._socket.close()
+
+
+@pytest.fixture
+def server() -> Iterator[HangUpServer]:
+    """
+    Runs a server that hangs up on every request.
+
+    :return: The running server.
+    """
+    hang_up_server = HangUpServer()
+    yield hang_up_server
+    hang_up_server.close()
+
+
+def test_post_is_not_resent_after_server_hangs_up(server: HangUpServer) -> None:
+    """
+    A command the server may have run is sent once, whatever the retry budget.
+    """
+    pool = RemoteConnectionPool(
+        server.url, max_connections=1, connect_timeout=2, read_timeout=2, retries=2
+    )
+    connection = pool.connection("chrome")
+    with pytest.raises((ProtocolError, MaxRetryError)):
+        connection.execute("clickElement", {"sessionId": "s1", "id": "e1"})  # type: ignore[no-untyped-call]
+    pool.close()
+    assert [request.split(b" ", 1)[0] for request in server.requests] == [b"POST"]
+
+
+def test_get_is_retried_after_server_hangs_up(server: HangUpServer) -> None:
+    """
+    A read-only command is retried up to the retry budget.
+    """
+    pool = RemoteConnectionPool(
+        server.url, max_connections=1, connect_timeout=2, read_timeout=2, retries=2
+    )
+    connection = pool.connection("chrome")
+    with pytest.raises((ProtocolError, MaxRetryError)):
+        connection.execute("getTitle", {"sessionId": "s1"})  # type: ignore[no-untyped-call]
+    pool.close()
+    assert len(server.requests) == 3
@@ -0,0 +1,99 @@
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Name of the file the benchmark results are written to
+BENCHMARK_FILE_NAME = "benchmarks.json"
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """
+    Timings of one benchmarked operation, in seconds.
+    """
+
+    name: str
+    params: Dict[str, Any]
+    rounds: int
+    min: float
+    median: float
+    max: float
+    samples: List[float] = field(repr=False)
+
+
+class BenchmarkRecorder:
+    """
+    Times framework operations over several rounds and collects the results of the
+    session for the terminal summary and a JSON file.
+    """
+
+    def __init__(self) -> None:
+        self.results: List[BenchmarkResult] = []
+
+    def measure(
+        self,
+        name: str,
+        operation: Callable[[], Any],
+        rounds: int = 5,
+        setup: Optional[Callable[[], Any]] = None,
+        **params: Any,
+    ) -> BenchmarkResult:
+        """
+        Runs an operation several times and records its durations. The setup
+        callable runs before every round and is not timed.
+
+        :param name: Name of the benchmark (e.g., "catalog_lookup").
+        :param operation: The operation to time.
+        :param rounds: Number of timed rounds.
+        :param setup: Optional untimed preparation run before each round.
+        :param params: Parameters of the benchmark (e.g., catalog_size=500).
+        :return: The recorded result.
+        """
+        samples: List[float] = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            operation()
+            samples.append(time.perf_counter() - start)
+        result = BenchmarkResult(
+            name=name,
+            params=params,
+            rounds=rounds,
+            min=min(samples),
+            median=statistics.median(samples),
+            max=max(samples),
+            samples=samples,
+        )
+        self.results.append(result)
+        return result
+
+    def summary_lines(self) -> List[str]:
+        """
+        Formats the results as a table for the terminal summary.
+
+        :return: The table lines, header first.
+        """
+        lines = [f"{'benchmark':<48} {'min ms':>10} {'median ms':>10} {'max ms':>10}"]
+        for result in self.results:
+            params = ",".join(f"{key}={value}" for key, value in result.params.items())
+            label = f"{result.name}[{params}]" if params else result.name
+            lines.append(
+                f"{label:<48} {result.min * 1000:>10.1f} "
+                f"{result.median * 1000:>10.1f} {result.max * 1000:>10.1f}"
+            )
+        return lines
+
+    def write(self, path: Path) -> None:
+        """
+        Writes the results as JSON.
+
+        :param path: Destination of the results file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps([asdict(result) for result in self.results], indent=2)
+        )
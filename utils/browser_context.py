@@ -0,0 +1,172 @@
+import logging
+from typing import Any, Dict, Generator, Optional, cast
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.websocket_connection import WebSocketConnection
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Test isolation modes: a pooled browser reset per test class, or a fresh browser
+# context per test inside the pooled browser
+ISOLATION_MODES = ("class", "context")
+
+
+def _bidi_command(
+    method: str, params: Dict[str, Any]
+) -> Generator[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    A WebDriver BiDi command in the form Selenium's WebSocket connection executes.
+
+    :param method: The BiDi method, e.g. "browser.createUserContext".
+    :param params: The method's parameters.
+    :return: The command's result.
+    """
+    result = yield {"method": method, "params": params}
+    return result
+
+
+def bidi_connection(driver: WebDriver) -> WebSocketConnection:
+    """
+    Returns the session's WebDriver BiDi connection, opening it on first use.
+
+    Selenium has no public API for raw BiDi commands, so this relies on the private
+    ``WebDriver._start_bidi()`` and ``WebDriver._websocket_connection`` of Selenium
+    4.25 (pinned in requirements.txt). Check them again when upgrading Selenium.
+
+    :param driver: The WebDriver; its session must have the ``webSocketUrl``
+                   capability.
+    :return: The WebSocket connection.
+    :raises WebDriverException: If the session has no BiDi endpoint.
+    """
+    if getattr(driver, "_websocket_connection", None) is None:
+        driver._start_bidi()  # type: ignore[no-untyped-call]
+    connection = cast(
+        Optional[WebSocketConnection], getattr(driver, "_websocket_connection", None)
+    )
+    if connection is None:
+        raise WebDriverException("The session has no WebDriver BiDi connection")
+    return connection
+
+
+def execute_bidi(driver: WebDriver, method: str, params: Dict[str, Any]) -> Any:
+    """
+    Sends a WebDriver BiDi command over the session's WebSocket connection, opening
+    the connection on first use. The session must have been created with the
+    ``webSocketUrl`` capability.
+
+    :param driver: The WebDriver.
+    :param method: The BiDi method.
+    :param params: The method's parameters.
+    :return: The command's result.
+    :raises WebDriverException: If the session has no BiDi connection or the command
+                                fails.
+    """
+    try:
+        connection = bidi_connection(driver)
+        # WebSocketConnection.execute is unannotated in Selenium
+        return connection.execute(  # type: ignore[no-untyped-call]
+            _bidi_command(method, params)
+        )
+    except WebDriverException:
+        raise
+    except Exception as error:
+        # The WebSocket connection raises bare exceptions carrying the error response
+        raise WebDriverException(f"BiDi command {method} failed: {error}") from error
+
+
+class BrowserContext:
+    """
+    An incognito-style browser context opened inside a running browser, with its
+    own cookies, storage and cache. Opening and disposing of a context costs a
+    fraction of a browser launch, so each test can start from a clean state while
+    the browser process is reused.
+
+    Chrome creates contexts through CDP (Target.createBrowserContext), Firefox
+    through WebDriver BiDi user contexts. The driver is switched to a tab of the
+    context while it is open, and back to the browser's original tab when closed.
+    """
+
+    def __init__(
+        self, driver: WebDriver, context_id: str, window_handle: str, parent_handle: str
+    ):
+        """
+        Wraps an opened context. Use :meth:`open` to create one.
+
+        :param driver: The WebDriver the context belongs to.
+        :param context_id: CDP browser context ID or BiDi user context ID.
+        :param window_handle: Handle of the context's tab.
+        :param parent_handle: Handle of the tab to return to when the context closes.
+        """
+        self.driver = driver
+        self.context_id = context_id
+        self.window_handle = window_handle
+        self.parent_handle = parent_handle
+
+    @classmethod
+    def open(cls, driver: WebDriver, start_url: str) -> Optional["BrowserContext"]:
+        """
+        Opens a new context with one tab on the start URL and switches the driver to it.
+
+        :param driver: The WebDriver of the browser to open the context in.
+        :param start_url: URL the context's tab is opened on.
+        :return: The context, or None if the browser cannot create contexts.
+        """
+        browser_name = driver.capabilities.get("browserName", "")
+        parent_handle = driver.current_window_handle
+        try:
+            if browser_name == "chrome":
+                context_id = driver.execute_cdp_cmd(  # type: ignore[attr-defined]
+                    "Target.createBrowserContext", {}
+                )["browserContextId"]
+                # ChromeDriver's window handles are the DevTools target IDs
+                window_handle = driver.execute_cdp_cmd(  # type: ignore[attr-defined]
+                    "Target.createTarget",
+                    {"url": "about:blank", "browserContextId": context_id},
+                )["targetId"]
+            elif browser_name == "firefox":
+                context_id = execute_bidi(driver, "browser.createUserContext", {})[
+                    "userContext"
+                ]
+                # GeckoDriver's window handles are the BiDi browsing context IDs
+                window_handle = execute_bidi(
+                    driver,
+                    "browsingContext.create",
+                    {"type": "tab", "userContext": context_id},
+                )["context"]
+            else:
+                logger.warning("Browser contexts are not supported in %s", browser_name)
+                return None
+        except (WebDriverException, KeyError) as error:
+            logger.warning("Could not open a browser context: %s", error)
+            return None
+        context = cls(driver, context_id, window_handle, parent_handle)
+        try:
+            driver.switch_to.window(window_handle)
+            driver.get(start_url)
+        except WebDriverException as error:
+            logger.warning("Could not switch to the new browser context: %s", error)
+            context.close()
+            return None
+        return context
+
+    def close(self) -> None:
+        """
+        Disposes of the context, closing its tabs and discarding its cookies and
+        storage, and switches the driver back to the original tab.
+        """
+        try:
+            self.driver.switch_to.window(self.parent_handle)
+            if self.driver.capabilities.get("browserName") == "chrome":
+                self.driver.execute_cdp_cmd(  # type: ignore[attr-defined]
+                    "Target.disposeBrowserContext",
+                    {"browserContextId": self.context_id},
+                )
+            else:
+                execute_bidi(
+                    self.driver,
+                    "browser.removeUserContext",
+                    {"userContext": self.context_id},
+                )
+        except WebDriverException as error:
+            logger.warning("Could not dispose of browser context: %s", error)
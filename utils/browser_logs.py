@@ -0,0 +1,78 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Chrome log types: DevTools events (network) and the browser console
+PERFORMANCE_LOG = "performance"
+CONSOLE_LOG = "browser"
+
+
+@dataclass
+class BrowserLogs:
+    """
+    Entries drained from a browser's logs. Both lists are empty for browsers that
+    don't expose logs through WebDriver (Firefox).
+    """
+
+    console: List[Dict[str, Any]] = field(default_factory=list)
+    network: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def enable_chrome_logs(options: ChromeOptions, log_types: Sequence[str]) -> None:
+    """
+    Enables Chrome logs, keeping the ones other components already enabled. The
+    performance log records network events only.
+
+    :param options: The Chrome options of the browser to launch.
+    :param log_types: Log types to enable ("performance", "browser").
+    """
+    if not log_types:
+        return
+    preferences = dict(options.capabilities.get("goog:loggingPrefs", {}))
+    preferences.update({log_type: "ALL" for log_type in log_types})
+    options.set_capability("goog:loggingPrefs", preferences)
+    if PERFORMANCE_LOG in log_types:
+        options.add_experimental_option(
+            "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}
+        )
+
+
+def read_performance_events(driver: WebDriver) -> List[Dict[str, Any]]:
+    """
+    Drains Chrome's performance log and returns the DevTools events in it.
+
+    :param driver: The (Chrome) WebDriver.
+    :return: The events as {"method": ..., "params": ..., "timestamp": ...}
+             dictionaries, oldest first. The timestamp is in epoch milliseconds.
+    """
+    events: List[Dict[str, Any]] = []
+    for entry in driver.get_log(PERFORMANCE_LOG):  # type: ignore[no-untyped-call]
+        try:
+            event = json.loads(entry["message"])["message"]
+            event["timestamp"] = entry.get("timestamp")
+            events.append(event)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return events
+
+
+def drain_browser_logs(driver: WebDriver, log_types: Sequence[str]) -> BrowserLogs:
+    """
+    Reads and clears the browser's logs in one pass, so every consumer of a log
+    (network filter, diagnostics) works from the same entries.
+
+    :param driver: The WebDriver.
+    :param log_types: Log types enabled for the browser ("performance", "browser").
+    :return: The drained entries.
+    """
+    logs = BrowserLogs()
+    if driver.capabilities.get("browserName") != "chrome":
+        return logs
+    if PERFORMANCE_LOG in log_types:
+        logs.network = read_performance_events(driver)
+    if CONSOLE_LOG in log_types:
+        logs.console = driver.get_log(CONSOLE_LOG)  # type: ignore[no-untyped-call]
+    return logs
@@ -0,0 +1,553 @@
+import ast
+import logging
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import pytest
+
+from .config import BASE_DIR, BASE_TMP_DIR, TEST_DATA_DIR
+from .log_manager import current_test_id
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Changed files that select every test, relative to the repository root. Any
+# conftest.py does so as well.
+RUN_ALL_FILES = ("utils/config.py", "pytest.ini", "requirements.txt")
+
+# Directories whose files are mapped to the tests that use them
+PAGE_OBJECTS_DIR = "page_objects"
+UTILS_DIR = "utils"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    nodeid TEXT PRIMARY KEY,
+    recorded REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS usage (
+    nodeid TEXT NOT NULL REFERENCES tests(nodeid),
+    symbol TEXT NOT NULL,
+    PRIMARY KEY (nodeid, symbol)
+);
+"""
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def relative_path(path: Path) -> Optional[str]:
+    """
+    Returns a path relative to the repository root, with forward slashes.
+
+    :param path: An absolute path.
+    :return: The relative path, or None if the path is outside the repository.
+    """
+    try:
+        return Path(path).resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return None
+
+
+class UsageStore:
+    """
+    SQLite store of what each test used when it last ran: the page-object methods
+    it called, as "<file>::<Class>.<method>", and the test data files it read.
+    Written by every process that runs tests, so parallel workers share it.
+    """
+
+    def __init__(self, path: Path):
+        """
+        :param path: The SQLite database file; created on first use.
+        """
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database, creating the schema if needed.
+
+        :return: The connection.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record(self, usage: Dict[str, Set[str]]) -> None:
+        """
+        Replaces the usage of the given tests.
+
+        :param usage: Symbols used per test node ID, for the tests that ran.
+        """
+        if not usage:
+            return
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "DELETE FROM usage WHERE nodeid = ?", ((nodeid,) for nodeid in usage)
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO tests (nodeid, recorded) VALUES (?, ?)",
+                ((nodeid, time.time()) for nodeid in usage),
+            )
+            connection.executemany(
+                "INSERT INTO usage (nodeid, symbol) VALUES (?, ?)",
+                (
+                    (nodeid, symbol)
+                    for nodeid, symbols in usage.items()
+                    for symbol in symbols
+                ),
+            )
+
+    def load(self) -> Dict[str, Set[str]]:
+        """
+        Reads the recorded usage of every known test.
+
+        :return: Symbols used per test node ID; tests never recorded are absent.
+        """
+        if not self.path.exists():
+            return {}
+        with closing(self._connect()) as connection:
+            usage: Dict[str, Set[str]] = {
+                nodeid: set()
+                for (nodeid,) in connection.execute("SELECT nodeid FROM tests")
+            }
+            for nodeid, symbol in connection.execute(
+                "SELECT nodeid, symbol FROM usage"
+            ):
+                usage.setdefault(nodeid, set()).add(symbol)
+        return usage
+
+
+class UsageRecorder:
+    """
+    Plugin registered in every process that runs tests. Records the page-object
+    methods each test calls (nested calls included, through the page objects'
+    attribution wrapper) and the test data files it is parametrized with, and
+    stores them when the session ends.
+    """
+
+    def __init__(self, store: UsageStore):
+        """
+        :param store: Store the session's usage is written to.
+        """
+        self.store = store
+        self.usage: Dict[str, Set[str]] = {}
+        self._symbols: Dict[Callable[..., Any], Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def record_method(self, method: Callable[..., Any]) -> None:
+        """
+        Records a page-object method call of the running test. Calls outside a
+        test are ignored.
+
+        :param method: The called function.
+        """
+        test_id = current_test_id.get()
+        if not test_id:
+            return
+        symbol = self._symbols.get(method, "")
+        if symbol == "":
+            path = relative_path(Path(method.__code__.co_filename))
+            symbol = f"{path}::{method.__qualname__}" if path else None
+            self._symbols[method] = symbol
+        if symbol:
+            with self._lock:
+                self.usage.setdefault(test_id, set()).add(symbol)
+
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        """
+        Records the test data file of a data-driven test.
+        """
+        for marker in item.iter_markers("test_data"):
+            path = relative_path(TEST_DATA_DIR / marker.args[0])
+            if path:
+                with self._lock:
+                    self.usage.setdefault(item.nodeid, set()).add(path)
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """
+        Marks a test as recorded once its call phase ran, even if it used no page
+        object.
+        """
+        if report.when == "call":
+            with self._lock:
+                self.usage.setdefault(report.nodeid, set())
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """
+        Stores the usage of the tests that ran.
+        """
+        if session.config.option.collectonly:
+            return
+        try:
+            self.store.record(self.usage)
+        except sqlite3.DatabaseError as error:
+            logger.warning(
+                "Could not record test usage in %s: %s", self.store.path, error
+            )
+
+
+def git(*args: str) -> str:
+    """
+    Runs a git command in the repository.
+
+    :param args: The git arguments.
+    :return: The command's output.
+    :raises pytest.UsageError: If git fails (e.g., unknown revision).
+    """
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=BASE_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as error:
+        stderr = getattr(error, "stderr", "") or ""
+        raise pytest.UsageError(f"git {' '.join(args)} failed: {stderr or error}")
+
+
+def changed_files(ref: str) -> Dict[str, Optional[Set[int]]]:
+    """
+    Lists the files changed since a git revision, including uncommitted and
+    untracked files, with the changed line numbers of the current version.
+
+    :param ref: The git revision to compare with (e.g., "origin/main").
+    :return: Changed lines per path relative to the repository root; None marks
+             files that changed as a whole (added, deleted or binary).
+    :raises pytest.UsageError: If git fails (e.g., unknown revision).
+    """
+    changes: Dict[str, Optional[Set[int]]] = {}
+    path: Optional[str] = None
+    modified = False
+    diff = git(
+        "diff", "--unified=0", "--no-color", "--no-ext-diff", "--no-renames", ref, "--"
+    )
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            # Whole-file change until hunks of a modified text file show otherwise
+            path = None
+            changes[line.split(" b/", 1)[-1]] = None
+        elif line.startswith("--- "):
+            modified = line.startswith("--- a/")
+        elif line.startswith("+++ b/") and modified:
+            path = line[len("+++ b/") :]
+            changes[path] = set()
+        elif line.startswith("@@") and path:
+            match = HUNK_HEADER.match(line)
+            if not match:
+                continue
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            # A pure deletion is located between the start line and the next one
+            changes[path].update(  # type: ignore[union-attr]
+                range(start, start + count) if count else (start, start + 1)
+            )
+    tmp_dir = relative_path(BASE_TMP_DIR)
+    for untracked in git("ls-files", "--others", "--exclude-standard").splitlines():
+        # Run artifacts, including the usage store itself, are not changes
+        if not (tmp_dir and untracked.startswith(f"{tmp_dir}/")):
+            changes[untracked] = None
+    return changes
+
+
+@dataclass
+class ModuleSymbols:
+    """
+    Line ranges of the classes, methods and class constants of a Python module,
+    and the class constants each method refers to.
+    """
+
+    # (qualified name, first line, last line) of methods and functions
+    functions: List[Tuple[str, int, int]] = field(default_factory=list)
+    # (qualified name, first line, last line) of class-level assignments
+    constants: List[Tuple[str, int, int]] = field(default_factory=list)
+    # (class name, first line, last line) of classes
+    classes: List[Tuple[str, int, int]] = field(default_factory=list)
+    # Upper-case attribute names (locators, scripts) each function refers to
+    references: Dict[str, Set[str]] = field(default_factory=dict)
+
+
+@lru_cache(maxsize=None)
+def module_symbols(path: Path) -> Optional[ModuleSymbols]:
+    """
+    Parses a module into its symbols.
+
+    :param path: The module file.
+    :return: The symbols, or None if the file is missing or not valid Python.
+    """
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+    symbols = ModuleSymbols()
+
+    def add_function(node: ast.AST, qualname: str) -> None:
+        first = min(
+            [node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])]  # type: ignore[attr-defined]
+        )
+        symbols.functions.append((qualname, first, node.end_lineno or first))  # type: ignore[attr-defined]
+        symbols.references[qualname] = {
+            child.attr
+            for child in ast.walk(node)
+            if isinstance(child, ast.Attribute) and child.attr.isupper()
+        }
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            add_function(node, node.name)
+        elif isinstance(node, ast.ClassDef):
+            symbols.classes.append(
+                (node.name, node.lineno, node.end_lineno or node.lineno)
+            )
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    add_function(member, f"{node.name}.{member.name}")
+                elif isinstance(member, (ast.Assign, ast.AnnAssign)):
+                    targets = (
+                        member.targets
+                        if isinstance(member, ast.Assign)
+                        else [member.target]
+                    )
+                    for target in targets:
+                        if isinstance(target, ast.Name):
+                            symbols.constants.append(
+                                (
+                                    f"{node.name}.{target.id}",
+                                    member.lineno,
+                                    member.end_lineno or member.lineno,
+                                )
+                            )
+    return symbols
+
+
+@dataclass
+class ChangeSet:
+    """
+    What changed, in the terms the recorded usage is kept in.
+    """
+
+    # Set when a change affects every test, with the reason
+    run_all: Optional[str] = None
+    # Changed methods, as "<file>::<Class>.<method>"
+    methods: Set[str] = field(default_factory=set)
+    # Files whose every symbol is considered changed (page objects, test data)
+    files: Set[str] = field(default_factory=set)
+    # Changed classes, as "<file>::<Class>"
+    classes: Set[str] = field(default_factory=set)
+    # Names of changed class constants (locators, scripts)
+    constants: Set[str] = field(default_factory=set)
+    # Changed test modules and utility modules
+    test_modules: Set[str] = field(default_factory=set)
+    utils_modules: Set[str] = field(default_factory=set)
+
+
+def _changed_page_object(
+    path: str, lines: Optional[Set[int]], changes: ChangeSet
+) -> None:
+    """
+    Maps the changed lines of a page-object module to its methods, constants and
+    classes. Changes outside any class (imports, module constants) count as a
+    change of the whole module.
+
+    :param path: The module, relative to the repository root.
+    :param lines: The changed lines, or None if the whole file changed.
+    :param changes: The change set to add to.
+    """
+    symbols = module_symbols(BASE_DIR / path)
+    if lines is None or symbols is None:
+        changes.files.add(path)
+        return
+    for line in lines:
+        functions = [
+            name for name, first, last in symbols.functions if first <= line <= last
+        ]
+        constants = [
+            name for name, first, last in symbols.constants if first <= line <= last
+        ]
+        classes = [
+            name for name, first, last in symbols.classes if first <= line <= last
+        ]
+        if functions:
+            changes.methods.add(f"{path}::{functions[0]}")
+        elif constants:
+            changes.constants.add(constants[0].split(".")[-1])
+        elif classes:
+            changes.classes.add(f"{path}::{classes[0]}")
+        else:
+            changes.files.add(path)
+            return
+
+
+def classify_changes(files: Dict[str, Optional[Set[int]]]) -> ChangeSet:
+    """
+    Sorts changed files into the change set that selection works on.
+
+    :param files: Changed lines per path, as returned by :func:`changed_files`.
+    :return: The change set.
+    """
+    changes = ChangeSet()
+    test_data_dir = relative_path(TEST_DATA_DIR)
+    for path, lines in sorted(files.items()):
+        top = path.split("/")[0]
+        if path in RUN_ALL_FILES or path.rsplit("/", 1)[-1] == "conftest.py":
+            changes.run_all = f"{path} changed"
+        elif top == PAGE_OBJECTS_DIR and path.endswith(".py"):
+            _changed_page_object(path, lines, changes)
+        elif test_data_dir and path.startswith(f"{test_data_dir}/"):
+            changes.files.add(path)
+        elif top == UTILS_DIR:
+            if path.endswith(".py"):
+                changes.utils_modules.add(path)
+            else:
+                # Assets such as the stand-in app are used by every test
+                changes.run_all = f"{path} changed"
+        elif top == "tests" and path.endswith(".py"):
+            changes.test_modules.add(path)
+        elif path.endswith(".py"):
+            changes.run_all = f"{path} changed"
+        if changes.run_all:
+            break
+    return changes
+
+
+@lru_cache(maxsize=None)
+def import_closure(path: str) -> Set[str]:
+    """
+    Lists the repository modules a module imports, directly or indirectly.
+
+    :param path: The module, relative to the repository root.
+    :return: Paths of the imported modules, the module itself included.
+    """
+    seen: Set[str] = set()
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            tree = ast.parse((BASE_DIR / current).read_text(encoding="utf-8"))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            continue
+        package = Path(current).parent
+        for node in ast.walk(tree):
+            names: List[str] = []
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = package
+                for _ in range(node.level - 1):
+                    base = base.parent
+                prefix = (
+                    base.as_posix().replace("/", ".") + "." if node.level else ""
+                ).lstrip(".")
+                module = f"{prefix}{node.module or ''}".strip(".")
+                names = [module] + [f"{module}.{alias.name}" for alias in node.names]
+            for name in names:
+                candidate = name.replace(".", "/")
+                for file in (f"{candidate}.py", f"{candidate}/__init__.py"):
+                    if (BASE_DIR / file).is_file():
+                        pending.append(file)
+    return seen
+
+
+def _widen_unrecorded(changes: ChangeSet, usage: Dict[str, Set[str]]) -> None:
+    """
+    Turns changed functions and classes that no test has recorded using into a
+    change of their whole module. Only page-object methods are recorded, so a
+    module-level helper or a class such as a cart snapshot is used through the
+    recorded methods of its module without showing up itself.
+
+    :param changes: The change set, modified in place.
+    :param usage: Symbols used per test node ID, as loaded from the store.
+    """
+    recorded: Set[str] = set().union(*usage.values())
+    recorded_classes = {
+        f"{path}::{qualname.split('.')[0]}"
+        for path, _, qualname in (symbol.partition("::") for symbol in recorded)
+        if qualname
+    }
+    for method in sorted(changes.methods - recorded):
+        changes.files.add(method.partition("::")[0])
+    for cls in sorted(changes.classes - recorded_classes):
+        changes.files.add(cls.partition("::")[0])
+
+
+def _uses_change(symbols: Set[str], changes: ChangeSet) -> bool:
+    """
+    Tells whether a test's recorded usage touches the change set.
+
+    :param symbols: The symbols the test used.
+    :param changes: The change set.
+    :return: True if the test has to run.
+    """
+    for symbol in symbols:
+        path, _, qualname = symbol.partition("::")
+        if path in changes.files or symbol in changes.methods:
+            return True
+        if qualname and f"{path}::{qualname.split('.')[0]}" in changes.classes:
+            return True
+        if changes.constants and qualname:
+            module = module_symbols(BASE_DIR / path)
+            if module and module.references.get(qualname, set()) & changes.constants:
+                return True
+    return False
+
+
+def select_changed_items(
+    config: pytest.Config, items: List[pytest.Item], ref: str, store: UsageStore
+) -> None:
+    """
+    Narrows the collected items to the tests affected by the changes since a git
+    revision: tests whose recorded usage includes a changed page-object method,
+    class, locator or test data file (or any symbol of a page-object module
+    whose changed function or class no test records), tests in changed test modules, tests
+    importing a changed utility module, and tests without recorded usage.
+    Changes to conftest.py, utils/config.py or a utility module every test
+    imports through conftest.py select all tests.
+
+    :param config: The pytest config.
+    :param items: The collected items, modified in place.
+    :param ref: The git revision to compare with.
+    :param store: The recorded usage.
+    """
+    changes = classify_changes(changed_files(ref))
+    if not changes.run_all:
+        conftest_imports: Set[str] = set()
+        for conftest in git("ls-files", "--", "conftest.py", "*/conftest.py").split():
+            conftest_imports |= import_closure(conftest)
+        shared = sorted(changes.utils_modules & conftest_imports)
+        if shared:
+            changes.run_all = f"{shared[0]} is used by every test"
+    if changes.run_all:
+        logger.info("Running every test: %s", changes.run_all)
+        return
+
+    usage = store.load()
+    _widen_unrecorded(changes, usage)
+    selected: List[pytest.Item] = []
+    deselected: List[pytest.Item] = []
+    for item in items:
+        test_module = relative_path(Path(item.path)) or ""
+        affected = (
+            item.nodeid not in usage
+            or test_module in changes.test_modules
+            or bool(changes.utils_modules & import_closure(test_module))
+            or _uses_change(usage[item.nodeid], changes)
+        )
+        (selected if affected else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+    logger.info(
+        "Selected %d of %d tests affected by changes since %s",
+        len(selected),
+        len(selected) + len(deselected),
+        ref,
+    )
@@ -0,0 +1,265 @@
+import functools
+import html
+import inspect
+import json
+import math
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .log_manager import current_test_id
+
+# Name of the per-process file the latency summaries are written to
+METRICS_FILE_NAME = "command_latency.json"
+
+# Attribution of commands not issued from within a page-object method
+OUTSIDE_PAGE_OBJECTS = "(test code)"
+
+# Page-object method ("ShoppingPage.find_and_add_product_to_cart") currently running
+current_page_method: ContextVar[str] = ContextVar("current_page_method", default="")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Callback notified of every instrumented command: name, parameters and duration
+CommandListener = Callable[[str, Optional[Dict[str, Any]], float], None]
+
+# Callbacks notified of every page-object method call, nested calls included, with
+# the called function
+method_call_listeners: List[Callable[[Callable[..., Any]], None]] = []
+
+
+def attributed(method: F) -> F:
+    """
+    Decorates a page-object method so the WebDriver commands it issues are attributed
+    to it. Nested page-object calls keep the outermost method's attribution, so the
+    commands of a helper like wait_for count towards the method that called it.
+
+    :param method: The page-object method.
+    :return: The wrapped method.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        for listener in method_call_listeners:
+            listener(method)
+        if current_page_method.get():
+            return method(self, *args, **kwargs)
+        token = current_page_method.set(f"{type(self).__name__}.{method.__name__}")
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            current_page_method.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def attribute_public_methods(cls: type) -> None:
+    """
+    Applies attributed() to the public methods defined directly on a class.
+
+    :param cls: The page-object class.
+    """
+    for name, value in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(value):
+            setattr(cls, name, attributed(value))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+
+    :param values: The sample values (need not be sorted).
+    :param pct: The percentile, between 0 and 100.
+    :return: The percentile value (0.0 for an empty list).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass(frozen=True)
+class CommandStats:
+    """
+    Latency summary of one WebDriver command issued by one page-object method.
+    ``network`` is the part of the total spent in the commands' HTTP requests to the
+    server, timed per request for remote sessions only; the rest is client-side time
+    in Selenium.
+    """
+
+    page_method: str
+    command: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+    network: float = 0.0
+
+
+class CommandRecorder:
+    """
+    Collects the latency of every WebDriver command per test, attributed to the
+    page-object method that issued it. Listeners are notified of every command,
+    e.g. to keep a trace of the most recent ones.
+    """
+
+    def __init__(self) -> None:
+        self.listeners: List[CommandListener] = []
+        self._samples: Dict[str, List[Tuple[str, str, float, float]]] = {}
+        self._summaries: Dict[str, List[CommandStats]] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, driver: WebDriver) -> None:
+        """
+        Wraps the driver's execute method so every command is timed. Element commands
+        go through the driver as well, so they are timed too. For remote sessions
+        whose connection times its requests (``take_request_time``), each command's
+        request time is recorded as its network time. Instrumenting an already
+        instrumented driver has no effect.
+
+        :param driver: The WebDriver instance.
+        """
+        if getattr(driver, "_command_recorder", None) is self:
+            return
+        execute = type(driver).execute
+
+        def timed_execute(
+            driver_command: str, params: Optional[Dict[str, Any]] = None
+        ) -> Dict[str, Any]:
+            start = time.perf_counter()
+            try:
+                return execute(driver, driver_command, params or {})
+            finally:
+                duration = time.perf_counter() - start
+                take_request_time = getattr(
+                    driver.command_executor, "take_request_time", None
+                )
+                network = take_request_time() if take_request_time else 0.0
+                self.record(driver_command, duration, network)
+                for listener in self.listeners:
+                    listener(driver_command, params, duration)
+
+        driver.execute = timed_execute  # type: ignore[method-assign]
+        driver._command_recorder = self  # type: ignore[attr-defined]
+
+    def record(self, command: str, duration: float, network: float = 0.0) -> None:
+        """
+        Records one command sample for the running test. Commands issued outside a
+        test (e.g. pool resets between sessions) are ignored.
+
+        :param command: The WebDriver command name (e.g., "findElement").
+        :param duration: The command's round-trip time in seconds.
+        :param network: The part of the round-trip time spent in the HTTP request.
+        """
+        test_id = current_test_id.get()
+        if not test_id:
+            return
+        sample = (
+            current_page_method.get() or OUTSIDE_PAGE_OBJECTS,
+            command,
+            duration,
+            network,
+        )
+        with self._lock:
+            self._samples.setdefault(test_id, []).append(sample)
+
+    def summarize(self, test_id: str) -> List[CommandStats]:
+        """
+        Aggregates and forgets the samples of a test. The summary is kept for the
+        session's metrics file.
+
+        :param test_id: The test's node ID.
+        :return: One entry per page-object method and command, slowest total first.
+        """
+        with self._lock:
+            samples = self._samples.pop(test_id, [])
+        groups: Dict[Tuple[str, str], List[float]] = {}
+        networks: Dict[Tuple[str, str], float] = {}
+        for page_method, command, duration, network in samples:
+            groups.setdefault((page_method, command), []).append(duration)
+            networks[page_method, command] = (
+                networks.get((page_method, command), 0.0) + network
+            )
+        summary = sorted(
+            (
+                CommandStats(
+                    page_method=page_method,
+                    command=command,
+                    count=len(durations),
+                    total=sum(durations),
+                    p50=percentile(durations, 50),
+                    p95=percentile(durations, 95),
+                    network=networks[page_method, command],
+                )
+                for (page_method, command), durations in groups.items()
+            ),
+            key=lambda stats: stats.total,
+            reverse=True,
+        )
+        if summary:
+            with self._lock:
+                self._summaries[test_id] = self._summaries.get(test_id, []) + summary
+        return summary
+
+    def write(self, path: Path) -> None:
+        """
+        Writes the summaries of all tests as JSON.
+
+        :param path: Destination of the metrics file.
+        """
+        with self._lock:
+            tests = {
+                test_id: [asdict(stats) for stats in summary]
+                for test_id, summary in self._summaries.items()
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"tests": tests}, indent=2))
+
+
+def merge_metrics_files(sources: Iterable[Path], destination: Path) -> None:
+    """
+    Merges the metrics files written by parallel workers into one file.
+
+    :param sources: The workers' metrics files; missing files are skipped.
+    :param destination: Destination of the merged metrics file.
+    """
+    tests: Dict[str, Any] = {}
+    for source in sources:
+        if source.exists():
+            tests.update(json.loads(source.read_text())["tests"])
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.write_text(json.dumps({"tests": tests}, indent=2))
+
+
+def render_html_table(summary: List[CommandStats]) -> str:
+    """
+    Renders a latency summary as an HTML table for the pytest-html report. The
+    HTTP request time column is shown for remote sessions only.
+
+    :param summary: The test's latency summary.
+    :return: The HTML table.
+    """
+    remote = any(stats.network for stats in summary)
+    rows = "".join(
+        f"<tr><td>{html.escape(stats.page_method)}</td>"
+        f"<td>{html.escape(stats.command)}</td><td>{stats.count}</td>"
+        f"<td>{stats.total * 1000:.0f}</td>"
+        + (f"<td>{stats.network * 1000:.0f}</td>" if remote else "")
+        + f"<td>{stats.p50 * 1000:.1f}</td><td>{stats.p95 * 1000:.1f}</td></tr>"
+        for stats in summary
+    )
+    return (
+        '<table class="command-latency" style="text-align:left">'
+        "<caption>WebDriver command latency</caption>"
+        "<tr><th>Page-object method</th><th>Command</th><th>Count</th>"
+        "<th>Total (ms)</th>"
+        + ("<th>HTTP request (ms)</th>" if remote else "")
+        + "<th>p50 (ms)</th><th>p95 (ms)</th></tr>"
+        f"{rows}</table>"
+    )
@@ -1,17 +1,69 @@
 import os
 from pathlib import Path
+from typing import Tuple
 
 # Test Website URL
 URL = "https://rahulshettyacademy.com/angularpractice/"
 
+# Default number of warm browser sessions kept alive per test session
+DEFAULT_DRIVER_POOL_SIZE: int = 1
+
 # Base directory of the project
 BASE_DIR: Path = Path(__file__).resolve().parent.parent
 
+# Local stand-in for the app under test (--stand-in): served files and base path
+STAND_IN_APP_DIR: Path = BASE_DIR / "utils" / "stand_in"
+STAND_IN_BASE_PATH = "/angularpractice/"
+
 # Test data directory, configurable via environment variable
 TEST_DATA_DIR: Path = Path(os.getenv("TEST_DATA_DIR", BASE_DIR / "test_data"))
 
+# Parallel worker identity, set by the controller for each worker process ("" when serial)
+WORKER_ID_ENV = "TEST_WORKER_ID"
+WORKER_ID: str = os.getenv(WORKER_ID_ENV, "")
+
+# Local cache of WebDriver binaries, configurable via environment variable
+DRIVER_CACHE_DIR: Path = Path(
+    os.getenv("DRIVER_CACHE_DIR", Path.home() / ".cache" / "selenium-pytest-framework")
+)
+
 # Temporary directories for logs, screenshots, reports
 BASE_TMP_DIR: Path = BASE_DIR / "tmp"
-LOG_DIR: Path = BASE_TMP_DIR / "logs"
-SCREENSHOT_DIR: Path = BASE_TMP_DIR / "screenshots"
-REPORT_DIR: Path = BASE_TMP_DIR / "reports"
+BASE_LOG_DIR: Path = BASE_TMP_DIR / "logs"
+BASE_SCREENSHOT_DIR: Path = BASE_TMP_DIR / "screenshots"
+BASE_REPORT_DIR: Path = BASE_TMP_DIR / "reports"
+BASE_DIAGNOSTICS_DIR: Path = BASE_TMP_DIR / "diagnostics"
+
+# Browser profile templates (--profile-template), kept across runs, and the
+# per-launch clones of them
+PROFILE_TEMPLATE_DIR: Path = BASE_TMP_DIR / "profile_templates"
+PROFILE_CLONE_DIR: Path = BASE_TMP_DIR / "profiles"
+
+# Browser window size with --profile-template, instead of maximizing the window
+WINDOW_SIZE: Tuple[int, int] = (1920, 1080)
+
+# Row-offset indexes of test data files, shared by all workers
+TEST_DATA_INDEX_DIR: Path = BASE_TMP_DIR / "test_data_index"
+
+# Durations of previous runs, used to schedule the longest tests first
+DURATION_STORE_PATH: Path = BASE_TMP_DIR / "durations.sqlite3"
+DURATION_HISTORY_RUNS: int = 10
+
+# Page objects and test data each test used when it last ran, for --changed-since
+USAGE_STORE_PATH: Path = BASE_TMP_DIR / "test_usage.sqlite3"
+
+# Per-worker directories, so parallel workers never write to the same files
+LOG_DIR: Path = BASE_LOG_DIR / WORKER_ID
+SCREENSHOT_DIR: Path = BASE_SCREENSHOT_DIR / WORKER_ID
+REPORT_DIR: Path = BASE_REPORT_DIR / WORKER_ID
+DIAGNOSTICS_DIR: Path = BASE_DIAGNOSTICS_DIR / WORKER_ID
+
+# Default memory cap of each test's diagnostics ring buffer, in kilobytes
+DEFAULT_DIAGNOSTICS_BUFFER_KB: int = 256
+
+# Remote WebDriver (--remote-url): connections shared by all sessions of a process,
+# timeouts in seconds, and retries after a connection error or reset
+DEFAULT_REMOTE_MAX_CONNECTIONS: int = 8
+DEFAULT_REMOTE_CONNECT_TIMEOUT: float = 10.0
+DEFAULT_REMOTE_READ_TIMEOUT: float = 120.0
+DEFAULT_REMOTE_RETRIES: int = 3
@@ -0,0 +1,326 @@
+import csv
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import TEST_DATA_DIR, TEST_DATA_INDEX_DIR
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = (".json", ".jsonl", ".csv")
+
+# One CSV record: unquoted characters or quoted fields (which may contain newlines)
+CSV_RECORD = re.compile(rb'(?:[^"\n]|"[^"]*")*\n?')
+
+# JSON strings and structural characters, for finding the elements of a top-level array
+JSON_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{},]', re.DOTALL)
+
+# CSV cells parsed as booleans, so CSV rows match their JSON equivalents
+CSV_BOOLEANS = {"true": True, "false": False}
+
+
+class TestDataError(Exception):
+    """
+    Raised when a test data file cannot be indexed or a row cannot be parsed.
+    """
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parses a shard specification such as "2/4" (the second of four shards).
+
+    :param value: The shard specification "<index>/<count>", 1-based.
+    :return: Tuple of shard index and shard count.
+    :raises ValueError: If the specification is malformed or out of range.
+    """
+    index, _, count = value.partition("/")
+    shard = (int(index), int(count))
+    if not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f"Invalid shard '{value}'; expected <index>/<count>")
+    return shard
+
+
+def shard_rows(row_count: int, shard: Optional[Tuple[int, int]] = None) -> range:
+    """
+    Returns the contiguous slice of rows belonging to a shard.
+
+    :param row_count: Total number of rows.
+    :param shard: Tuple of 1-based shard index and shard count, or None for all rows.
+    :return: Range of the row indexes of the shard.
+    """
+    if not shard:
+        return range(row_count)
+    index, count = shard
+    return range(row_count * (index - 1) // count, row_count * index // count)
+
+
+class TestDataSource:
+    """
+    Row-addressable view of a test data file that never loads the whole file.
+
+    Supports JSON-lines (one object per line), CSV (header row plus one record per
+    row) and JSON (a top-level array of objects). On first use the file is scanned
+    once to build an index of the byte offset of every row; the index is kept in
+    memory and on disk, keyed by the file's size and mtime, so later collections
+    and other worker processes reuse it until the file changes. Reading a row seeks
+    to its offset and parses only that row.
+    """
+
+    def __init__(self, path: Path, index_dir: Path = TEST_DATA_INDEX_DIR):
+        """
+        Initializes the source. The file is not read until rows are requested.
+
+        :param path: Path of the test data file.
+        :param index_dir: Directory the row indexes are stored in.
+        :raises TestDataError: If the file format is not supported.
+        """
+        self.path = path
+        self.format = path.suffix.lower()
+        if self.format not in SUPPORTED_FORMATS:
+            raise TestDataError(
+                f"Unsupported test data format '{path.suffix}' of '{path.name}'; "
+                f"expected one of {', '.join(SUPPORTED_FORMATS)}"
+            )
+        digest = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:16]
+        self.index_path = index_dir / f"{path.stem}-{digest}.json"
+        self._index: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def offsets(self) -> List[int]:
+        """
+        Byte offsets of the rows, followed by the end offset of the last row.
+
+        :return: The row offsets of the current version of the file.
+        """
+        offsets: List[int] = self._current_index()["offsets"]
+        return offsets
+
+    @property
+    def header(self) -> List[str]:
+        """
+        Column names of a CSV file (empty for the JSON formats).
+
+        :return: The column names.
+        """
+        header: List[str] = self._current_index()["header"]
+        return header
+
+    def read_row(self, row: int) -> Dict[str, Any]:
+        """
+        Reads and parses a single row.
+
+        :param row: Index of the row (0-based, header excluded).
+        :return: The row as a dictionary.
+        :raises IndexError: If the row does not exist.
+        :raises TestDataError: If the row cannot be parsed.
+        """
+        offsets = self.offsets
+        if not 0 <= row < len(offsets) - 1:
+            raise IndexError(f"Row {row} out of range for '{self.path.name}'")
+        with self.path.open(mode="rb") as file:
+            file.seek(offsets[row])
+            data = file.read(offsets[row + 1] - offsets[row])
+        try:
+            return self._parse(data.decode("utf-8"))
+        except (ValueError, csv.Error) as error:
+            raise TestDataError(
+                f"Invalid row {row} in '{self.path.name}': {error}"
+            ) from error
+
+    def iter_rows(
+        self, shard: Optional[Tuple[int, int]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the rows of the file, or of one shard of it, one at a time.
+
+        :param shard: Tuple of 1-based shard index and shard count, or None for all rows.
+        :return: Iterator over the rows as dictionaries.
+        """
+        for row in shard_rows(len(self), shard):
+            yield self.read_row(row)
+
+    def _parse(self, text: str) -> Dict[str, Any]:
+        """
+        Parses the text of one row.
+
+        :param text: The row as stored in the file.
+        :return: The row as a dictionary.
+        :raises ValueError: If a JSON row is not an object.
+        """
+        if self.format == ".csv":
+            cells = next(csv.reader(io.StringIO(text)))
+            return {
+                column: CSV_BOOLEANS.get(cell.lower(), cell)
+                for column, cell in zip(self.header, cells)
+            }
+        if self.format == ".json":
+            value, _ = json.JSONDecoder().raw_decode(text.lstrip())
+        else:
+            value = json.loads(text)
+        if not isinstance(value, dict):
+            raise ValueError(f"expected an object, got {type(value).__name__}")
+        row: Dict[str, Any] = value
+        return row
+
+    def _current_index(self) -> Dict[str, Any]:
+        """
+        Returns the row index, rebuilding it if the file changed since it was built.
+
+        :return: The index with the file's size, mtime, header and row offsets.
+        """
+        stat = self.path.stat()
+        key = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if self._index and all(self._index[name] == key[name] for name in key):
+            return self._index
+        index = self._load_index()
+        if not index or any(index.get(name) != key[name] for name in key):
+            index = {**key, **self._build_index()}
+            self._save_index(index)
+        self._index = index
+        return index
+
+    def _load_index(self) -> Optional[Dict[str, Any]]:
+        """
+        Loads the index stored on disk.
+
+        :return: The stored index, or None if there is no readable index.
+        """
+        try:
+            index = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return None
+        return index if isinstance(index, dict) else None
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        """
+        Stores the index on disk. The file is replaced atomically, so workers
+        indexing the same file concurrently never read a partial index.
+
+        :param index: The index to store.
+        """
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}")
+            partial.write_text(json.dumps(index))
+            os.replace(partial, self.index_path)
+        except OSError as error:
+            logger.warning(
+                "Could not store test data index %s: %s", self.index_path, error
+            )
+
+    def _build_index(self) -> Dict[str, Any]:
+        """
+        Scans the file once and records the byte offset of every row.
+
+        :return: The header and the row offsets (with a trailing end offset).
+        :raises TestDataError: If the file is not valid for its format.
+        """
+        logger.info("Indexing test data file %s", self.path)
+        if self.path.stat().st_size == 0:
+            return {"header": [], "offsets": [0]}
+        with (
+            self.path.open(mode="rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            if self.format == ".jsonl":
+                return {"header": [], "offsets": self._index_lines(data)}
+            if self.format == ".csv":
+                return self._index_csv(data)
+            return {"header": [], "offsets": self._index_json_array(data)}
+
+    @staticmethod
+    def _index_lines(data: mmap.mmap) -> List[int]:
+        """
+        Indexes a JSON-lines file, skipping blank lines.
+
+        :param data: The file contents.
+        :return: The row offsets with a trailing end offset.
+        """
+        offsets: List[int] = []
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            end = len(data) if end == -1 else end + 1
+            if data[start:end].strip():
+                offsets.append(start)
+            start = end
+        offsets.append(len(data))
+        return offsets
+
+    def _index_csv(self, data: mmap.mmap) -> Dict[str, Any]:
+        """
+        Indexes a CSV file. Records may span lines inside quoted fields.
+
+        :param data: The file contents.
+        :return: The header and the row offsets with a trailing end offset.
+        """
+        records = [
+            match.start()
+            for match in CSV_RECORD.finditer(data)
+            if match.group().strip()
+        ]
+        header_end = records[1] if len(records) > 1 else len(data)
+        header = next(csv.reader(io.StringIO(data[:header_end].decode("utf-8"))))
+        return {"header": header, "offsets": records[1:] + [len(data)]}
+
+    def _index_json_array(self, data: mmap.mmap) -> List[int]:
+        """
+        Indexes the elements of a top-level JSON array by tracking nesting depth
+        over the file's strings and structural characters; an element spans from
+        the '[' or ',' before it to the ',' or ']' after it at depth 1.
+
+        :param data: The file contents.
+        :return: The element offsets followed by the offset of the closing bracket.
+        :raises TestDataError: If the file is not a JSON array.
+        """
+        offsets: List[int] = []
+        depth = 0
+        element_start = 0
+        for match in JSON_TOKEN.finditer(data):
+            token = match.group()
+            if depth == 0 and token != b"[":
+                break
+            if token in (b"[", b"{"):
+                depth += 1
+                if depth == 1:
+                    element_start = match.end()
+            elif token in (b"]", b"}") or (token == b"," and depth == 1):
+                if depth == 1 and data[element_start : match.start()].strip():
+                    offsets.append(element_start)
+                if token == b",":
+                    element_start = match.end()
+                    continue
+                depth -= 1
+                if depth == 0:
+                    offsets.append(match.start())
+                    return offsets
+        raise TestDataError(f"'{self.path.name}' is not a JSON array of rows")
+
+
+# Sources by resolved path, so each file is indexed at most once per process
+_sources: Dict[Path, TestDataSource] = {}
+
+
+def get_test_data_source(file_name: str) -> TestDataSource:
+    """
+    Returns the (memoized) source for a file in the test data directory.
+
+    :param file_name: Name of the file in the test_data directory.
+    :return: The test data source.
+    :raises FileNotFoundError: If the file does not exist.
+    """
+    path = (TEST_DATA_DIR / file_name).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"File '{file_name}' not found in '{TEST_DATA_DIR}'.")
+    if path not in _sources:
+        _sources[path] = TestDataSource(path)
+    return _sources[path]
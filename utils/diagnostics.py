@@ -0,0 +1,236 @@
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from .browser_logs import BrowserLogs
+from .command_metrics import OUTSIDE_PAGE_OBJECTS, current_page_method
+from .log_manager import current_test_id
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Kinds of diagnostics entries; each kind gets an equal share of a test's buffer
+ENTRY_KINDS = ("command", "console", "network")
+
+# Network events kept in the buffer, and the fields kept from each
+NETWORK_EVENT_FIELDS: Dict[str, Sequence[str]] = {
+    "Network.requestWillBeSent": ("requestId", "request.method", "request.url", "type"),
+    "Network.responseReceived": (
+        "requestId",
+        "response.url",
+        "response.status",
+        "response.mimeType",
+    ),
+    "Network.loadingFinished": ("requestId", "encodedDataLength"),
+    "Network.loadingFailed": ("requestId", "errorText", "blockedReason"),
+}
+
+# Longest command parameter value kept in a command entry, in characters
+MAX_PARAM_LENGTH = 200
+
+
+class RingBuffer:
+    """
+    Keeps the most recent entries that fit into a fixed number of bytes. Entries are
+    stored JSON-serialized, so the cap is exact and dumping costs no serialization.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        :param max_bytes: Maximum total size of the stored entries.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.dropped = 0
+        self._entries: Deque[str] = deque()
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Adds an entry, evicting the oldest entries to stay within the cap. An entry
+        larger than the whole buffer is dropped.
+
+        :param entry: A JSON-serializable entry.
+        """
+        line = json.dumps(entry, default=str)
+        if len(line) > self.max_bytes:
+            self.dropped += 1
+            return
+        self._entries.append(line)
+        self.size += len(line)
+        while self.size > self.max_bytes:
+            self.size -= len(self._entries.popleft())
+            self.dropped += 1
+
+    def lines(self) -> List[str]:
+        """
+        Returns the stored entries, oldest first.
+
+        :return: The JSON-serialized entries.
+        """
+        return list(self._entries)
+
+
+def _pick(params: Dict[str, Any], path: str) -> Any:
+    """
+    Looks up a dotted path (e.g. "response.status") in an event's parameters.
+
+    :param params: The event parameters.
+    :param path: The dotted path.
+    :return: The value, or None if the path does not exist.
+    """
+    value: Any = params
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def network_entry(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Condenses a DevTools network event to the fields useful for diagnosing a failure.
+
+    :param event: The event, as read from the performance log.
+    :return: The condensed entry, or None for events that are not kept.
+    """
+    fields = NETWORK_EVENT_FIELDS.get(event.get("method", ""))
+    if fields is None:
+        return None
+    params = event.get("params", {})
+    entry = {"time": event.get("timestamp"), "event": event["method"]}
+    for path in fields:
+        value = _pick(params, path)
+        if value is not None:
+            entry[path.split(".")[-1]] = value
+    return entry
+
+
+class DiagnosticsRecorder:
+    """
+    Captures each test's recent WebDriver commands, browser console messages and
+    network events in bounded in-memory ring buffers. Buffers of passing tests are
+    discarded; those of failed and xfailed tests are written gzip-compressed as JSON
+    lines, so the happy path pays only for appending to memory.
+
+    Commands are recorded as they are sent. Console messages and network events are
+    read from the browser's logs (Chrome only) when the test ends.
+    """
+
+    def __init__(self, output_dir: Path, link_base: Path, max_bytes: int):
+        """
+        :param output_dir: Directory diagnostics files are written to.
+        :param link_base: Directory the returned links are relative to (the report's).
+        :param max_bytes: Memory cap of each test's buffers, split between the kinds.
+        """
+        self.output_dir = output_dir
+        self.link_base = link_base
+        self.max_bytes = max_bytes
+        self._buffers: Dict[str, Dict[str, RingBuffer]] = {}
+        self._lock = threading.Lock()
+
+    def _buffer(self, test_id: str, kind: str) -> RingBuffer:
+        """
+        Returns a test's buffer for one kind of entry, creating it on first use.
+
+        :param test_id: Node ID of the test.
+        :param kind: One of ENTRY_KINDS.
+        :return: The ring buffer.
+        """
+        buffers = self._buffers.setdefault(test_id, {})
+        if kind not in buffers:
+            buffers[kind] = RingBuffer(self.max_bytes // len(ENTRY_KINDS))
+        return buffers[kind]
+
+    def record_command(
+        self, command: str, params: Optional[Dict[str, Any]], duration: float
+    ) -> None:
+        """
+        Records a WebDriver command of the running test. Long parameter values, such
+        as scripts and screenshots, are truncated. Commands outside a test are ignored.
+
+        :param command: The WebDriver command name.
+        :param params: The command's parameters.
+        :param duration: The command's round-trip time in seconds.
+        """
+        test_id = current_test_id.get()
+        if not test_id:
+            return
+        entry = {
+            "time": round(time.time() * 1000),
+            "command": command,
+            "page_method": current_page_method.get() or OUTSIDE_PAGE_OBJECTS,
+            "duration_ms": round(duration * 1000, 1),
+            "params": {
+                key: value
+                if isinstance(value, (int, float, bool)) or value is None
+                else str(value)[:MAX_PARAM_LENGTH]
+                for key, value in (params or {}).items()
+                if key != "sessionId"
+            },
+        }
+        with self._lock:
+            self._buffer(test_id, "command").append(entry)
+
+    def record_browser_logs(self, test_id: str, logs: BrowserLogs) -> None:
+        """
+        Records console messages and network events drained from the browser.
+
+        :param test_id: Node ID of the test the entries belong to.
+        :param logs: The drained browser logs.
+        """
+        with self._lock:
+            for message in logs.console:
+                self._buffer(test_id, "console").append(
+                    {
+                        "time": message.get("timestamp"),
+                        "level": message.get("level"),
+                        "message": message.get("message"),
+                    }
+                )
+            for event in logs.network:
+                entry = network_entry(event)
+                if entry:
+                    self._buffer(test_id, "network").append(entry)
+
+    def discard(self, test_id: str) -> None:
+        """
+        Frees a test's buffers without writing them.
+
+        :param test_id: Node ID of the test.
+        """
+        with self._lock:
+            self._buffers.pop(test_id, None)
+
+    def dump(self, test_id: str) -> Optional[str]:
+        """
+        Writes a test's buffers as gzip-compressed JSON lines, each tagged with its
+        kind and sorted by time, and frees them.
+
+        :param test_id: Node ID of the test.
+        :return: Link to the file relative to the report directory, or None if
+                 nothing was recorded.
+        """
+        with self._lock:
+            buffers = self._buffers.pop(test_id, {})
+        lines = [
+            f'{{"kind": "{kind}", {line[1:]}'
+            for kind, buffer in buffers.items()
+            for line in buffer.lines()
+        ]
+        if not lines:
+            return None
+        lines.sort(key=lambda line: json.loads(line).get("time") or 0)
+        dropped = {kind: buffer.dropped for kind, buffer in buffers.items()}
+        header = json.dumps({"kind": "header", "test": test_id, "dropped": dropped})
+        path = self.output_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', test_id)}.jsonl.gz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write("\n".join([header, *lines]) + "\n")
+        logger.info("Wrote diagnostics of %s to %s", test_id, path)
+        return Path(os.path.relpath(path, self.link_base)).as_posix()
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, cast
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+from webdriver_manager.firefox import GeckoDriverManager
+
+from .config import DRIVER_CACHE_DIR
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Environment variable through which a resolved driver path is handed to worker processes
+DRIVER_PATH_ENV = "TEST_DRIVER_PATH"
+
+# Environment variable that forbids any network access during driver resolution
+DRIVER_CACHE_OFFLINE_ENV = "DRIVER_CACHE_OFFLINE"
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+# Per browser: name used for OS version detection and the driver download function
+BROWSER_DRIVERS: Dict[str, Dict[str, Any]] = {
+    "chrome": {
+        "browser_type": ChromeType.GOOGLE,
+        "install": lambda: ChromeDriverManager().install(),
+    },
+    "firefox": {
+        "browser_type": "firefox",
+        "install": lambda: GeckoDriverManager().install(),
+    },
+}
+
+
+class DriverCacheError(Exception):
+    """
+    Raised when a driver binary cannot be resolved from the cache.
+    """
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Computes the SHA-256 checksum of a file.
+
+    :param path: The file to hash.
+    :return: The hex digest.
+    """
+    digest = hashlib.sha256()
+    with path.open(mode="rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DriverBinaryCache:
+    """
+    Local, checksum-verified cache of WebDriver binaries keyed by browser and browser
+    major version.
+
+    Entries live in ``<cache_dir>/<browser>/<major version>/`` together with a
+    manifest recording the binary's SHA-256. A verified hit needs no network access,
+    so a populated cache works on air-gapped machines. On a miss the binary is
+    downloaded once through webdriver_manager, unless the cache is in offline mode.
+    """
+
+    def __init__(self, cache_dir: Path = DRIVER_CACHE_DIR, offline: bool = False):
+        """
+        Initializes the cache.
+
+        :param cache_dir: Root directory of the cache.
+        :param offline: If True, a cache miss raises instead of downloading.
+        """
+        self.cache_dir = cache_dir
+        self.offline = offline or os.getenv(DRIVER_CACHE_OFFLINE_ENV) == "1"
+
+    @staticmethod
+    def detect_browser_version(browser_name: str) -> Optional[str]:
+        """
+        Detects the installed browser version without network access.
+
+        :param browser_name: Name of the browser ("chrome" or "firefox").
+        :return: The full version string, or None if the browser could not be found.
+        """
+        browser_type: str = BROWSER_DRIVERS[browser_name]["browser_type"]
+        # webdriver-manager ships without annotations
+        os_manager = OperationSystemManager()  # type: ignore[no-untyped-call]
+        version = os_manager.get_browser_version_from_os(browser_type)  # type: ignore[no-untyped-call]
+        return cast(Optional[str], version)
+
+    def entry_dir(self, browser_name: str, browser_version: Optional[str]) -> Path:
+        """
+        Returns the cache directory for a browser version. Drivers are compatible
+        across a browser's major version, so only the major version is used as key.
+
+        :param browser_name: Name of the browser.
+        :param browser_version: The detected browser version, or None if unknown.
+        :return: Path of the cache entry directory.
+        """
+        key = browser_version.split(".")[0] if browser_version else "unknown"
+        return self.cache_dir / browser_name / key
+
+    def lookup(
+        self, browser_name: str, browser_version: Optional[str]
+    ) -> Optional[Path]:
+        """
+        Returns the cached driver if it exists and its checksum matches the manifest.
+        A corrupt or tampered entry is removed.
+
+        :param browser_name: Name of the browser.
+        :param browser_version: The detected browser version, or None if unknown.
+        :return: Path of the verified driver binary, or None on a miss.
+        """
+        entry = self.entry_dir(browser_name, browser_version)
+        manifest_path = entry / MANIFEST_FILE_NAME
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest: Dict[str, Any] = json.loads(manifest_path.read_text())
+            driver_path = entry / cast(str, manifest["file_name"])
+            if driver_path.exists() and file_sha256(driver_path) == manifest["sha256"]:
+                return driver_path
+        except (OSError, KeyError, json.JSONDecodeError):
+            pass
+        logger.warning("Checksum mismatch in driver cache entry %s; discarding", entry)
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+
+    def store(
+        self, browser_name: str, browser_version: Optional[str], source: Path
+    ) -> Path:
+        """
+        Copies a driver binary into the cache and records its checksum.
+
+        :param browser_name: Name of the browser.
+        :param browser_version: The detected browser version, or None if unknown.
+        :param source: Path of the downloaded driver binary.
+        :return: Path of the cached copy.
+        """
+        entry = self.entry_dir(browser_name, browser_version)
+        entry.mkdir(parents=True, exist_ok=True)
+        driver_path = entry / source.name
+        shutil.copy2(source, driver_path)
+        driver_path.chmod(driver_path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP)
+        manifest = {
+            "browser": browser_name,
+            "browser_version": browser_version,
+            "file_name": source.name,
+            "sha256": file_sha256(driver_path),
+            "source": str(source),
+            "cached_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        # Write the manifest last, so an interrupted store is never seen as a hit
+        (entry / MANIFEST_FILE_NAME).write_text(json.dumps(manifest, indent=2))
+        return driver_path
+
+    def resolve(self, browser_name: str) -> Path:
+        """
+        Returns a verified driver binary for the installed browser, downloading and
+        caching it on a miss.
+
+        :param browser_name: Name of the browser ("chrome" or "firefox").
+        :return: Path of the driver binary.
+        :raises ValueError: If the browser is not supported.
+        :raises DriverCacheError: On a miss while offline.
+        """
+        if browser_name not in BROWSER_DRIVERS:
+            raise ValueError(f"Unsupported browser: {browser_name}")
+        browser_version = self.detect_browser_version(browser_name)
+        cached = self.lookup(browser_name, browser_version)
+        if cached:
+            logger.info("Using cached %s driver %s", browser_name, cached)
+            return cached
+        if self.offline:
+            raise DriverCacheError(
+                f"No cached {browser_name} driver for browser version "
+                f"{browser_version or 'unknown'} in '{self.cache_dir}' and the cache "
+                "is offline. Populate the cache on a connected machine first."
+            )
+        install: Callable[[], str] = BROWSER_DRIVERS[browser_name]["install"]
+        cached = self.store(browser_name, browser_version, Path(install()))
+        logger.info("Cached %s driver at %s", browser_name, cached)
+        return cached
+
+
+def resolve_driver_path(browser_name: str, offline: bool = False) -> str:
+    """
+    Resolves the driver binary once per session. The first call resolves through the
+    cache and publishes the path in ``TEST_DRIVER_PATH``; later calls, including
+    those from worker processes that inherit the environment, reuse it.
+
+    :param browser_name: Name of the browser ("chrome" or "firefox").
+    :param offline: If True, never download a driver.
+    :return: Path of the driver binary.
+    """
+    env_key = f"{DRIVER_PATH_ENV}_{browser_name.upper()}"
+    published = os.getenv(env_key)
+    if published and Path(published).exists():
+        return published
+    driver_path = str(DriverBinaryCache(offline=offline).resolve(browser_name))
+    os.environ[env_key] = driver_path
+    return driver_path
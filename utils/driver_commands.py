@@ -0,0 +1,17 @@
+from typing import Any
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def execute_script(driver: WebDriver, script: str, *args: Any) -> Any:
+    """
+    Runs JavaScript in the current page. Selenium leaves
+    ``WebDriver.execute_script`` unannotated; this wrapper gives the pool and the page
+    objects a typed call.
+
+    :param driver: The WebDriver.
+    :param script: The script; its ``arguments`` are ``args``.
+    :param args: Arguments passed to the script (elements, numbers, strings, lists).
+    :return: The script's return value, converted by WebDriver.
+    """
+    return driver.execute_script(script, *args)  # type: ignore[no-untyped-call]
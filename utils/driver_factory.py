@@ -0,0 +1,136 @@
+from typing import Optional, Sequence, Union
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .browser_logs import enable_chrome_logs
+from .driver_cache import resolve_driver_path
+from .network_filter import NetworkFilter
+from .profile_template import ProfileTemplate
+from .remote_connection import RemoteChromeDriver, RemoteConnectionPool
+
+SUPPORTED_BROWSERS = ("chrome", "firefox")
+
+# When navigation returns: after every subresource loaded ("normal"), once the DOM
+# is parsed ("eager") or at once ("none"). Page objects wait for their own readiness.
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+def create_driver(
+    browser_name: str,
+    headless: bool = False,
+    driver_path: Optional[str] = None,
+    network_filter: Optional[NetworkFilter] = None,
+    enable_bidi: bool = False,
+    browser_logs: Sequence[str] = (),
+    page_load_strategy: str = "normal",
+    remote_pool: Optional[RemoteConnectionPool] = None,
+    profile_template: Optional[ProfileTemplate] = None,
+) -> WebDriver:
+    """
+    Launches a new browser session for the requested browser, locally or, given a
+    remote connection pool, on a Selenium Grid or standalone server.
+
+    :param browser_name: Name of the browser to launch ("chrome" or "firefox").
+    :param headless: Whether the browser should run without a visible window.
+    :param driver_path: Path of the local driver binary. Resolved through the
+                        driver cache when omitted; unused for remote sessions.
+    :param network_filter: Optional filter keeping the browser from loading
+                           resources the tests don't need.
+    :param enable_bidi: Whether to open a WebDriver BiDi connection to Firefox,
+                        needed for browser contexts (Chrome uses CDP instead).
+    :param browser_logs: Chrome logs to enable ("performance", "browser"); Firefox
+                         does not expose logs through WebDriver.
+    :param page_load_strategy: One of PAGE_LOAD_STRATEGIES.
+    :param remote_pool: Connection pool of the server to start the session on; the
+                        session's commands are sent over its shared connections.
+    :param profile_template: Optional template the browser's profile is cloned from,
+                             with startup-reducing options and a fixed window size.
+                             Remote sessions get the options only, as their
+                             profiles live on the server.
+    :return: A freshly started WebDriver instance with a maximized window, or the
+             template's window size.
+    :raises ValueError: If the browser or page-load strategy is not supported.
+    """
+    driver: WebDriver
+    if browser_name not in SUPPORTED_BROWSERS:
+        raise ValueError(f"Unsupported browser: {browser_name}")
+    if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f"Unsupported page-load strategy: {page_load_strategy}")
+    if not remote_pool:
+        driver_path = driver_path or resolve_driver_path(browser_name)
+    if browser_name == "chrome":
+        chrome_options: ChromeOptions = ChromeOptions()
+        chrome_options.page_load_strategy = page_load_strategy
+        if headless:
+            chrome_options.add_argument("--headless")
+        enable_chrome_logs(chrome_options, browser_logs)
+        if network_filter:
+            network_filter.configure_chrome_options(chrome_options)
+        if profile_template:
+            _apply_profile_template(
+                profile_template, chrome_options, driver_path, headless, remote_pool
+            )
+        if remote_pool:
+            driver = RemoteChromeDriver(
+                command_executor=remote_pool.connection(browser_name),
+                options=chrome_options,
+            )
+        else:
+            driver = webdriver.Chrome(
+                service=ChromeService(driver_path), options=chrome_options
+            )
+    else:
+        firefox_options: FirefoxOptions = FirefoxOptions()
+        firefox_options.page_load_strategy = page_load_strategy
+        if headless:
+            firefox_options.add_argument("--headless")
+        if enable_bidi:
+            firefox_options.web_socket_url = True
+        if network_filter:
+            network_filter.configure_firefox_options(firefox_options)
+        if profile_template:
+            _apply_profile_template(
+                profile_template, firefox_options, driver_path, headless, remote_pool
+            )
+        if remote_pool:
+            driver = webdriver.Remote(
+                command_executor=remote_pool.connection(browser_name),
+                options=firefox_options,
+            )
+        else:
+            assert driver_path is not None  # resolved above for local sessions
+            driver = webdriver.Firefox(
+                service=FirefoxService(driver_path), options=firefox_options
+            )
+    if network_filter:
+        network_filter.attach(driver, browser_name)
+    if not profile_template:
+        driver.maximize_window()
+    return driver
+
+
+def _apply_profile_template(
+    profile_template: ProfileTemplate,
+    options: Union[ChromeOptions, FirefoxOptions],
+    driver_path: Optional[str],
+    headless: bool,
+    remote_pool: Optional[RemoteConnectionPool],
+) -> None:
+    """
+    Applies a profile template to the options of a browser about to be launched.
+
+    :param profile_template: The profile template.
+    :param options: The browser options.
+    :param driver_path: Path of the local driver binary.
+    :param headless: Whether the browser runs headless.
+    :param remote_pool: Connection pool of the remote server, if the session is remote.
+    """
+    if remote_pool:
+        profile_template.tune(options, headless)
+    else:
+        profile_template.apply(options, str(driver_path), headless)
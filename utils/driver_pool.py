@@ -0,0 +1,159 @@
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .driver_commands import execute_script
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Clears client-side storage for the current origin. Wrapped in try/catch because
+# pages such as about:blank or data: URLs throw on storage access.
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class DriverPool:
+    """
+    A session-level pool of warm WebDriver instances.
+
+    Drivers are launched lazily up to ``size`` and leased to test classes. When a lease
+    ends the driver is reset (cookies, localStorage and sessionStorage cleared, start
+    page reloaded) and returned to the pool, so the next class starts from a clean
+    state without paying for a new browser launch.
+    """
+
+    def __init__(
+        self,
+        driver_factory: Callable[[], WebDriver],
+        start_url: str,
+        size: int = 1,
+        acquire_timeout: float = 300.0,
+    ):
+        """
+        Initializes the pool. No browser is launched until the first lease.
+
+        :param driver_factory: Callable that launches and returns a new WebDriver.
+        :param start_url: URL every driver is navigated to when created or reset.
+        :param size: Maximum number of drivers kept alive by the pool.
+        :param acquire_timeout: Seconds to wait for a free driver when the pool is exhausted.
+        :raises ValueError: If the pool size is smaller than 1.
+        """
+        if size < 1:
+            raise ValueError(f"Driver pool size must be at least 1, got {size}")
+        self.driver_factory = driver_factory
+        self.start_url = start_url
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self._idle: List[WebDriver] = []
+        self._leased: List[WebDriver] = []
+        self._launching = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def acquire(self) -> WebDriver:
+        """
+        Leases a driver from the pool, launching a new one if the pool is not full yet.
+
+        :return: A WebDriver positioned on the start URL with clean client-side state.
+        :raises RuntimeError: If the pool is closed or no driver frees up in time.
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Cannot acquire a driver from a closed pool")
+                if self._idle:
+                    driver = self._idle.pop()
+                    self._leased.append(driver)
+                    return driver
+                if len(self._leased) + self._launching < self.size:
+                    # Reserve the slot before launching so concurrent callers
+                    # respect the pool size.
+                    self._launching += 1
+                    break
+                if not self._condition.wait(timeout=self.acquire_timeout):
+                    raise RuntimeError(
+                        f"No driver became available within {self.acquire_timeout}s "
+                        f"(pool size {self.size})"
+                    )
+
+        launched: Optional[WebDriver] = None
+        try:
+            launched = self.driver_factory()
+            launched.get(self.start_url)
+        except BaseException:
+            if launched is not None:
+                self._quit(launched)
+            launched = None
+            raise
+        finally:
+            with self._condition:
+                self._launching -= 1
+                if launched is not None:
+                    self._leased.append(launched)
+                self._condition.notify()
+        assert launched is not None
+        logger.info("Launched pooled driver (pool size %d)", self.size)
+        return launched
+
+    def release(self, driver: WebDriver) -> None:
+        """
+        Ends a lease. The driver is reset and made available to the next caller, or
+        quit and discarded if the reset fails (e.g. the browser crashed).
+
+        :param driver: The driver previously returned by :meth:`acquire`.
+        """
+        healthy = not self._closed and self.reset_driver(driver)
+        with self._condition:
+            if driver in self._leased:
+                self._leased.remove(driver)
+            if healthy:
+                self._idle.append(driver)
+            self._condition.notify()
+        if not healthy:
+            self._quit(driver)
+
+    def reset_driver(self, driver: WebDriver) -> bool:
+        """
+        Clears cookies, localStorage and sessionStorage and navigates back to the start URL.
+
+        :param driver: The driver to reset.
+        :return: True if the driver was reset successfully, False otherwise.
+        """
+        try:
+            execute_script(driver, CLEAR_STORAGE_SCRIPT)
+            driver.delete_all_cookies()
+            driver.get(self.start_url)
+            return True
+        except WebDriverException as error:
+            logger.warning("Discarding pooled driver after failed reset: %s", error)
+            return False
+
+    def close(self) -> None:
+        """
+        Quits every driver owned by the pool. Further leases are rejected.
+        """
+        with self._condition:
+            self._closed = True
+            drivers = self._idle + self._leased
+            self._idle.clear()
+            self._leased.clear()
+            self._condition.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver: WebDriver) -> None:
+        """
+        Quits a driver, ignoring errors from sessions that are already gone.
+
+        :param driver: The driver to quit.
+        """
+        try:
+            driver.quit()
+        except WebDriverException as error:
+            logger.warning("Error while quitting pooled driver: %s", error)
@@ -0,0 +1,244 @@
+import logging
+import sqlite3
+import statistics
+import time
+from collections import Counter
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pytest
+
+from .config import DURATION_HISTORY_RUNS
+from .reruns import RERUN_OUTCOME
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Runs after which the history of a test that stopped running is dropped, as a
+# multiple of the window size
+EXPIRY_FACTOR = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run INTEGER PRIMARY KEY AUTOINCREMENT,
+    finished REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS durations (
+    nodeid TEXT NOT NULL,
+    run INTEGER NOT NULL REFERENCES runs(run),
+    setup REAL NOT NULL,
+    call REAL NOT NULL,
+    teardown REAL NOT NULL,
+    PRIMARY KEY (nodeid, run)
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    nodeid TEXT NOT NULL,
+    run INTEGER NOT NULL REFERENCES runs(run),
+    outcome TEXT NOT NULL,
+    reruns INTEGER NOT NULL,
+    PRIMARY KEY (nodeid, run)
+);
+"""
+
+
+class DurationStore:
+    """
+    SQLite store of per-test phase durations and outcomes from previous runs. Each
+    test keeps only its most recent ``window`` runs, and tests that have not run for
+    a while are forgotten, so estimates follow the suite as it changes.
+    """
+
+    def __init__(self, path: Path, window: int = DURATION_HISTORY_RUNS):
+        """
+        :param path: The SQLite database file; created on first use.
+        :param window: Number of recent runs kept per test.
+        """
+        self.path = path
+        self.window = window
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens the database, creating the schema if needed.
+
+        :return: The connection.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record_run(
+        self,
+        durations: Dict[str, Dict[str, float]],
+        outcomes: Optional[Dict[str, Tuple[str, int]]] = None,
+    ) -> None:
+        """
+        Stores the durations and outcomes of a finished run and trims the history
+        to the window.
+
+        :param durations: Phase durations in seconds ("setup", "call", "teardown")
+                          per test node ID.
+        :param outcomes: Final outcome and number of reruns per test node ID.
+        """
+        if not durations and not outcomes:
+            return
+        with closing(self._connect()) as connection, connection:
+            run = connection.execute(
+                "INSERT INTO runs (finished) VALUES (?)", (time.time(),)
+            ).lastrowid
+            assert run is not None  # set by every successful INSERT
+            connection.executemany(
+                "INSERT INTO durations (nodeid, run, setup, call, teardown) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        nodeid,
+                        run,
+                        phases.get("setup", 0.0),
+                        phases.get("call", 0.0),
+                        phases.get("teardown", 0.0),
+                    )
+                    for nodeid, phases in durations.items()
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO outcomes (nodeid, run, outcome, reruns) VALUES (?, ?, ?, ?)",
+                (
+                    (nodeid, run, outcome, reruns)
+                    for nodeid, (outcome, reruns) in (outcomes or {}).items()
+                ),
+            )
+            for table in ("durations", "outcomes"):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE run <= (SELECT run FROM {table} AS t "
+                    f"WHERE t.nodeid = {table}.nodeid ORDER BY run DESC "
+                    "LIMIT 1 OFFSET ?)",
+                    (self.window,),
+                )
+                connection.execute(
+                    f"DELETE FROM {table} WHERE run <= ?",
+                    (run - self.window * EXPIRY_FACTOR,),
+                )
+            connection.execute(
+                "DELETE FROM runs WHERE run NOT IN (SELECT run FROM durations "
+                "UNION SELECT run FROM outcomes)"
+            )
+
+    def flakiness(self, nodeids: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+        """
+        Counts, within the window, how often tests passed only after a rerun.
+
+        :param nodeids: The tests to look up.
+        :return: (flaky runs, recorded runs) per node ID with history.
+        """
+        nodeids = list(nodeids)
+        if not nodeids or not self.path.exists():
+            return {}
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT nodeid, SUM(outcome = 'passed' AND reruns > 0), COUNT(*) "
+                f"FROM outcomes WHERE nodeid IN ({', '.join('?' * len(nodeids))}) "
+                "GROUP BY nodeid",
+                nodeids,
+            ).fetchall()
+        return {nodeid: (flaky, runs) for nodeid, flaky, runs in rows}
+
+    def estimates(self) -> Dict[str, float]:
+        """
+        Estimates each known test's duration as the median total of its recent runs.
+
+        :return: Estimated seconds per test node ID; tests without history are absent.
+        """
+        if not self.path.exists():
+            return {}
+        samples: Dict[str, List[float]] = {}
+        try:
+            with closing(self._connect()) as connection:
+                for nodeid, total in connection.execute(
+                    "SELECT nodeid, setup + call + teardown FROM durations"
+                ):
+                    samples.setdefault(nodeid, []).append(total)
+        except sqlite3.DatabaseError as error:
+            logger.warning(
+                "Ignoring unreadable duration store %s: %s", self.path, error
+            )
+            return {}
+        return {nodeid: statistics.median(totals) for nodeid, totals in samples.items()}
+
+
+class DurationRecorder:
+    """
+    Plugin registered in the process that reports results (the controller of a
+    parallel run, which replays its workers' reports). Collects the phase durations,
+    outcomes and reruns of every test that ran, stores them when the session ends
+    and lists the tests that passed only after a rerun.
+    """
+
+    def __init__(self, store: DurationStore):
+        """
+        :param store: Store the session's durations are written to.
+        """
+        self.store = store
+        self.durations: Dict[str, Dict[str, float]] = {}
+        self.outcomes: Dict[str, str] = {}
+        self.reruns: Counter[str] = Counter()
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """
+        Records the duration of a setup, call or teardown phase, and the test's
+        reruns and final outcome.
+        """
+        if report.when is None:
+            return
+        self.durations.setdefault(report.nodeid, {})[report.when] = report.duration
+        if report.outcome == RERUN_OUTCOME:
+            self.reruns[report.nodeid] += 1
+        elif report.when == "call":
+            self.outcomes[report.nodeid] = report.outcome
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """
+        Stores the durations of the tests whose call phase ran; tests skipped or
+        failed in setup would understate their duration.
+        """
+        if session.config.option.collectonly:
+            return
+        ran = {
+            nodeid: phases
+            for nodeid, phases in self.durations.items()
+            if "call" in phases
+        }
+        outcomes = {
+            nodeid: (outcome, self.reruns[nodeid])
+            for nodeid, outcome in self.outcomes.items()
+        }
+        try:
+            self.store.record_run(ran, outcomes)
+        except sqlite3.DatabaseError as error:
+            logger.warning(
+                "Could not record durations in %s: %s", self.store.path, error
+            )
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        """
+        Lists the tests that passed only after a rerun, with how often that
+        happened in the recorded runs.
+        """
+        flaky = sorted(
+            nodeid
+            for nodeid, outcome in self.outcomes.items()
+            if outcome == "passed" and self.reruns[nodeid]
+        )
+        if not flaky:
+            return
+        try:
+            history = self.store.flakiness(flaky)
+        except sqlite3.DatabaseError:
+            history = {}
+        terminalreporter.write_sep("-", "flaky tests (passed on rerun)")
+        for nodeid in flaky:
+            flaky_runs, runs = history.get(nodeid, (1, 1))
+            terminalreporter.write_line(
+                f"{nodeid}: {self.reruns[nodeid]} rerun(s); "
+                f"flaky in {flaky_runs} of the last {runs} run(s)"
+            )
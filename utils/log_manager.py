@@ -0,0 +1,205 @@
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import WORKER_ID
+
+# Logger the tests write to, and framework loggers routed through the same handler
+TEST_LOGGER_NAME = "tests"
+FRAMEWORK_LOGGER_NAMES = (TEST_LOGGER_NAME, "page_objects", "utils")
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(worker_id)s - %(test_id)s - %(message)s"
+
+# Node ID of the test currently running, set by the pytest hooks in conftest.py
+current_test_id: ContextVar[str] = ContextVar("current_test_id", default="")
+
+
+class TestContextFilter(logging.Filter):
+    """
+    Tags every record with the running test's node ID and the worker ID.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Adds ``test_id`` and ``worker_id`` attributes to the record.
+
+        :param record: The log record.
+        :return: Always True; no record is dropped.
+        """
+        record.test_id = current_test_id.get() or "-"
+        record.worker_id = WORKER_ID or "main"
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Serializes the record with its timestamp, worker ID and test ID.
+
+        :param record: The log record.
+        :return: The record as a JSON line.
+        """
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker_id": getattr(record, "worker_id", None),
+            "test_id": getattr(record, "test_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class PerTestLogHandler(logging.Handler):
+    """
+    Keeps each test's formatted log lines in memory until they are collected for
+    the report.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lines: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Stores the formatted record under the test it was logged from.
+
+        :param record: The log record.
+        """
+        test_id: Optional[str] = getattr(record, "test_id", None)
+        if not test_id or test_id == "-":
+            return
+        line = self.format(record)
+        with self._lock:
+            self._lines.setdefault(test_id, []).append(line)
+
+    def pop(self, test_id: str) -> List[str]:
+        """
+        Returns and forgets the lines logged by a test.
+
+        :param test_id: The test's node ID.
+        :return: The formatted log lines, oldest first.
+        """
+        with self._lock:
+            return self._lines.pop(test_id, [])
+
+
+class TestLogManager:
+    """
+    Session-wide logging subsystem.
+
+    All framework loggers share one non-blocking QueueHandler; a single listener
+    thread writes the records to ``test_execution.log`` (and, optionally, to
+    ``test_execution.jsonl``), so logging never waits on disk I/O and no file handle
+    is opened per test. Records are tagged with the pytest node ID of the running
+    test. The handlers are added alongside propagation, so pytest's log capture
+    (``caplog``, ``--log-cli-level`` and the "Captured log" report sections) still
+    sees the framework's records. When that capture is off, each test's lines can
+    be kept in memory for the report instead.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        json_lines: bool = False,
+        level: int = logging.INFO,
+        per_test_logs: bool = True,
+    ):
+        """
+        Initializes the manager. Call start() to attach the handlers.
+
+        :param log_dir: Directory the log files are written to.
+        :param json_lines: If True, also write JSON-lines output.
+        :param level: Level of the test and framework loggers.
+        :param per_test_logs: If True, keep each test's lines for pop_test_log().
+        """
+        self.log_dir = log_dir
+        self.json_lines = json_lines
+        self.level = level
+        self.per_test = PerTestLogHandler() if per_test_logs else None
+        self._queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._queue_handler = logging.handlers.QueueHandler(self._queue)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        """
+        Opens the log files, starts the listener thread and routes the framework
+        loggers to the shared queue.
+        """
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(
+            self.log_dir / "test_execution.log", mode="a", encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers: List[logging.Handler] = [file_handler]
+        if self.json_lines:
+            json_handler = logging.FileHandler(
+                self.log_dir / "test_execution.jsonl", mode="a", encoding="utf-8"
+            )
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+        self._listener = logging.handlers.QueueListener(
+            self._queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+
+        context_filter = TestContextFilter()
+        self._queue_handler.addFilter(context_filter)
+        if self.per_test:
+            self.per_test.addFilter(context_filter)
+            self.per_test.setFormatter(logging.Formatter(LOG_FORMAT))
+        for name in FRAMEWORK_LOGGER_NAMES:
+            logger = logging.getLogger(name)
+            logger.setLevel(self.level)
+            logger.addHandler(self._queue_handler)
+            if self.per_test:
+                logger.addHandler(self.per_test)
+
+    def stop(self) -> None:
+        """
+        Detaches the handlers, writes the queued records and closes the log files.
+        """
+        for name in FRAMEWORK_LOGGER_NAMES:
+            logger = logging.getLogger(name)
+            logger.removeHandler(self._queue_handler)
+            if self.per_test:
+                logger.removeHandler(self.per_test)
+        if self._listener:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+    def pop_test_log(self, test_id: str) -> str:
+        """
+        Returns and forgets the log of a test, for attaching to its report.
+
+        :param test_id: The test's node ID.
+        :return: The test's log lines joined by newlines ("" if nothing was logged
+                 or per-test logs are not kept).
+        """
+        return "\n".join(self.per_test.pop(test_id)) if self.per_test else ""
+
+
+def get_test_logger() -> logging.Logger:
+    """
+    Returns the shared logger for test code.
+
+    :return: The test logger.
+    """
+    return logging.getLogger(TEST_LOGGER_NAME)
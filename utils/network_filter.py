@@ -0,0 +1,464 @@
+import base64
+import json
+import logging
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .browser_logs import PERFORMANCE_LOG, enable_chrome_logs, read_performance_events
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# URL patterns standing in for each resource type, since Network.setBlockedURLs only
+# matches URLs. Each extension is matched with and without a query string.
+RESOURCE_TYPE_EXTENSIONS: Dict[str, Tuple[str, ...]] = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav"),
+    "stylesheet": ("css",),
+    "script": ("js",),
+}
+RESOURCE_TYPES = tuple(RESOURCE_TYPE_EXTENSIONS)
+
+# Resource types the app under test cannot run without; they are only blocked on
+# the allowed hosts other than the app's, never on every host
+THIRD_PARTY_ONLY_TYPES = ("stylesheet", "script")
+
+# Firefox preferences that disable loading a resource type altogether
+FIREFOX_TYPE_PREFERENCES: Dict[str, Dict[str, Any]] = {
+    "image": {"permissions.default.image": 2},
+    "font": {"browser.display.use_document_fonts": 0},
+}
+
+# Proxy that refuses every connection; blocked hosts are routed to it by the PAC script
+BLACKHOLE_PROXY = "PROXY 127.0.0.1:9"
+
+# How requests blocked by the filter show up in Chrome's network events
+CHROME_BLOCKED_REASON = "inspector"
+CHROME_BLACKHOLE_ERROR = "net::ERR_PROXY_CONNECTION_FAILED"
+
+# Timeout and concurrency of the HEAD requests that estimate the size of blocked
+# resources (--probe-blocked-sizes)
+CONTENT_LENGTH_TIMEOUT: float = 2.0
+CONTENT_LENGTH_WORKERS = 4
+
+# Attribute of a teardown report carrying the test's blocked-request counts
+STATS_REPORT_ATTRIBUTE = "network_filter_stats"
+
+
+@dataclass(frozen=True)
+class NetworkFilterRules:
+    """
+    Which requests the browser should not make.
+
+    Host rules are glob patterns matched against the request's host and enforced
+    through a PAC script in both browsers; allowed hosts take precedence over blocked
+    ones, and when any host is allowed every other host is blocked. URL rules are
+    glob patterns matched against the full URL. Resource types are "image", "font",
+    "media", "stylesheet" and "script". Images, fonts and media are blocked on every
+    host; stylesheets and scripts only on the allowed third-party hosts, i.e. the
+    allowed hosts other than the app's (``app_hosts``), as blocking them on the app's
+    host breaks the app.
+    """
+
+    block_types: Tuple[str, ...] = ()
+    block_urls: Tuple[str, ...] = ()
+    block_hosts: Tuple[str, ...] = ()
+    allow_hosts: Tuple[str, ...] = ()
+    app_hosts: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        unknown = set(self.block_types) - set(RESOURCE_TYPES)
+        if unknown:
+            raise ValueError(
+                f"Unknown resource type(s) {', '.join(sorted(unknown))}; "
+                f"expected any of {', '.join(RESOURCE_TYPES)}"
+            )
+        third_party_only = [
+            resource_type
+            for resource_type in self.block_types
+            if resource_type in THIRD_PARTY_ONLY_TYPES
+        ]
+        if third_party_only and not self.third_party_hosts:
+            raise ValueError(
+                f"Blocking {', '.join(third_party_only)} resources needs the "
+                "third-party hosts to block them on; allow them with --allow-host"
+            )
+
+    @property
+    def third_party_hosts(self) -> Tuple[str, ...]:
+        """
+        The allowed hosts other than the app's: patterns matching an app host are
+        left out.
+
+        :return: Host glob patterns.
+        """
+        return tuple(
+            pattern
+            for pattern in self.allow_hosts
+            if not any(fnmatch(host, pattern) for host in self.app_hosts)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether any rule is configured.
+
+        :return: True if the filter blocks anything.
+        """
+        return bool(
+            self.block_types or self.block_urls or self.block_hosts or self.allow_hosts
+        )
+
+    def blocked_url_patterns(self) -> List[str]:
+        """
+        Patterns for Chrome's Network.setBlockedURLs: the URL rules plus the
+        extension patterns of the blocked resource types, limited to the third-party
+        hosts for stylesheets and scripts.
+
+        :return: The URL patterns.
+        """
+        patterns = list(self.block_urls)
+        for resource_type in self.block_types:
+            prefixes = (
+                [f"*://{host}/*" for host in self.third_party_hosts]
+                if resource_type in THIRD_PARTY_ONLY_TYPES
+                else ["*"]
+            )
+            for prefix in prefixes:
+                for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+                    patterns += [f"{prefix}.{extension}", f"{prefix}.{extension}?*"]
+        return patterns
+
+    def pac_script(self) -> Optional[str]:
+        """
+        Builds a proxy auto-config script routing blocked hosts to a refusing proxy.
+
+        :return: The PAC script, or None if there are no host rules.
+        """
+        if not (self.block_hosts or self.allow_hosts):
+            return None
+        allowed = json.dumps(list(self.allow_hosts))
+        blocked = json.dumps(list(self.block_hosts))
+        default = f'"{BLACKHOLE_PROXY}"' if self.allow_hosts else '"DIRECT"'
+        return (
+            "function FindProxyForURL(url, host) {\n"
+            f"    var allowed = {allowed}, blocked = {blocked};\n"
+            '    if (isPlainHostName(host) || host === "127.0.0.1") { return "DIRECT"; }\n'
+            "    for (var i = 0; i < allowed.length; i++) {\n"
+            '        if (shExpMatch(host, allowed[i])) { return "DIRECT"; }\n'
+            "    }\n"
+            "    for (var j = 0; j < blocked.length; j++) {\n"
+            f'        if (shExpMatch(host, blocked[j])) {{ return "{BLACKHOLE_PROXY}"; }}\n'
+            "    }\n"
+            f"    return {default};\n"
+            "}\n"
+        )
+
+    def pac_url(self) -> Optional[str]:
+        """
+        Returns the PAC script as a data URL browsers can load without a server.
+
+        :return: The data URL, or None if there are no host rules.
+        """
+        script = self.pac_script()
+        if script is None:
+            return None
+        encoded = base64.b64encode(script.encode()).decode()
+        return f"data:application/x-ns-proxy-autoconfig;base64,{encoded}"
+
+
+@dataclass
+class NetworkFilterStats:
+    """
+    Requests blocked by the filter while a test ran. ``bytes_saved`` is estimated
+    from the blocked resources' Content-Length at the test's teardown, and only when
+    size probing is enabled; it is ``None`` otherwise. A ``None`` request count
+    means the browser cannot report blocked requests.
+    """
+
+    blocked_requests: Optional[int] = 0
+    bytes_saved: Optional[int] = 0
+    blocked_urls: List[str] = field(default_factory=list)
+
+    def add(self, other: "NetworkFilterStats") -> None:
+        """
+        Adds another test's stats to these totals, without keeping its URLs.
+
+        :param other: The stats to add.
+        """
+        if self.blocked_requests is None or other.blocked_requests is None:
+            self.blocked_requests = self.bytes_saved = None
+            return
+        self.blocked_requests += other.blocked_requests
+        if self.bytes_saved is None or other.bytes_saved is None:
+            self.bytes_saved = None
+        else:
+            self.bytes_saved += other.bytes_saved
+
+    def counts(self) -> Dict[str, Optional[int]]:
+        """
+        Returns the counts without the URLs, for sending along with a test report.
+
+        :return: ``blocked_requests`` and ``bytes_saved``.
+        """
+        return {
+            "blocked_requests": self.blocked_requests,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def describe(self) -> str:
+        """
+        Summarizes the stats in one line.
+
+        :return: The summary.
+        """
+        if self.blocked_requests is None:
+            return "Network filter active; blocked request counts are unavailable"
+        summary = f"Network filter blocked {self.blocked_requests} request(s)"
+        if self.bytes_saved is None:
+            return summary
+        return f"{summary}, ~{self.bytes_saved / 1024:.0f} KB saved"
+
+
+class NetworkFilterTotals:
+    """
+    Plugin adding up the blocked-request counts sent with the tests' teardown
+    reports. Reports replayed from parallel workers carry them as well, so the
+    controller's totals cover the whole run.
+    """
+
+    def __init__(self, totals: NetworkFilterStats):
+        """
+        :param totals: The session totals to add to.
+        """
+        self.totals = totals
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """
+        Adds the counts of a test's teardown report to the totals.
+        """
+        counts: Optional[Dict[str, Optional[int]]] = getattr(
+            report, STATS_REPORT_ATTRIBUTE, None
+        )
+        if counts is not None:
+            self.totals.add(
+                NetworkFilterStats(
+                    blocked_requests=counts["blocked_requests"],
+                    bytes_saved=counts["bytes_saved"],
+                )
+            )
+
+
+class ContentLengthCache:
+    """
+    Session-wide cache of resource sizes, looked up with HEAD requests on background
+    threads, so probing never holds up a test. Each URL is requested once.
+    """
+
+    def __init__(
+        self,
+        timeout: float = CONTENT_LENGTH_TIMEOUT,
+        workers: int = CONTENT_LENGTH_WORKERS,
+    ):
+        """
+        :param timeout: Timeout of each HEAD request in seconds.
+        :param workers: Number of HEAD requests in flight at once.
+        """
+        self.timeout = timeout
+        self._sizes: Dict[str, Future[Optional[int]]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="content-length"
+        )
+        self._lock = threading.Lock()
+
+    def prefetch(self, url: str) -> None:
+        """
+        Starts looking up the size of a resource unless it was requested before.
+
+        :param url: URL of the resource.
+        """
+        with self._lock:
+            if url not in self._sizes:
+                self._sizes[url] = self._executor.submit(self._probe, url)
+
+    def get(self, url: str) -> Optional[int]:
+        """
+        Returns the size of a resource, waiting for its lookup to finish.
+
+        :param url: URL of the resource.
+        :return: The Content-Length in bytes, or None if unknown.
+        """
+        self.prefetch(url)
+        with self._lock:
+            future = self._sizes[url]
+        return future.result()
+
+    def close(self) -> None:
+        """
+        Cancels the lookups that have not started.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _probe(self, url: str) -> Optional[int]:
+        """
+        Requests the headers of a resource.
+
+        :param url: URL of the resource.
+        :return: The Content-Length in bytes, or None if unknown.
+        """
+        try:
+            request = urllib.request.Request(url, method="HEAD")
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                length = response.headers.get("Content-Length")
+                return int(length) if length and length.isdigit() else None
+        except (urllib.error.URLError, OSError, ValueError) as error:
+            logger.debug("Could not determine size of %s: %s", url, error)
+            return None
+
+
+class NetworkFilter:
+    """
+    Keeps browsers from loading resources no assertion depends on (images, web
+    fonts, third-party scripts), so page loads finish sooner.
+
+    Chrome blocks URL and resource-type rules through CDP (Network.setBlockedURLs)
+    and reports each blocked request in its performance log, from which the filter
+    counts blocked requests per test. Firefox applies resource-type rules through
+    preferences (images and fonts only; URL rules are not supported) and cannot
+    report blocked requests. Both browsers enforce host rules with a PAC script.
+
+    Estimating the bytes saved takes a HEAD request to every blocked URL, i.e. to
+    the hosts the rules keep the browser from, so it is opt-in (``probe_sizes``).
+    The requests are sent in the background once a test's call ends, and the test's
+    estimate is computed at its teardown.
+    """
+
+    def __init__(self, rules: NetworkFilterRules, probe_sizes: bool = False):
+        """
+        :param rules: The filter rules.
+        :param probe_sizes: Whether to estimate the bytes saved with HEAD requests
+                            to the blocked URLs.
+        """
+        self.rules = rules
+        self.sizes = ContentLengthCache() if probe_sizes else None
+
+    def configure_chrome_options(self, options: ChromeOptions) -> None:
+        """
+        Enables network events in Chrome's performance log and installs the PAC
+        script. Must be called before the browser is launched.
+
+        :param options: The Chrome options of the browser to launch.
+        """
+        enable_chrome_logs(options, [PERFORMANCE_LOG])
+        pac_url = self.rules.pac_url()
+        if pac_url:
+            options.add_argument(f"--proxy-pac-url={pac_url}")
+
+    def configure_firefox_options(self, options: FirefoxOptions) -> None:
+        """
+        Sets the preferences implementing the rules in Firefox. Must be called
+        before the browser is launched.
+
+        :param options: The Firefox options of the browser to launch.
+        """
+        for resource_type in self.rules.block_types:
+            preferences = FIREFOX_TYPE_PREFERENCES.get(resource_type)
+            if preferences is None:
+                logger.warning("Firefox cannot block '%s' resources", resource_type)
+                continue
+            for name, value in preferences.items():
+                options.set_preference(name, value)
+        if self.rules.block_urls:
+            logger.warning("URL block rules are not supported in Firefox; ignoring")
+        pac_url = self.rules.pac_url()
+        if pac_url:
+            options.set_preference("network.proxy.type", 2)
+            options.set_preference("network.proxy.autoconfig_url", pac_url)
+
+    def attach(self, driver: WebDriver, browser_name: str) -> None:
+        """
+        Activates the URL and resource-type rules in a launched Chrome browser.
+
+        :param driver: The launched WebDriver.
+        :param browser_name: Name of the browser ("chrome" or "firefox").
+        """
+        patterns = self.rules.blocked_url_patterns()
+        if browser_name != "chrome" or not patterns:
+            return
+        driver.execute_cdp_cmd("Network.enable", {})  # type: ignore[attr-defined]
+        driver.execute_cdp_cmd(  # type: ignore[attr-defined]
+            "Network.setBlockedURLs", {"urls": patterns}
+        )
+
+    def collect(
+        self, driver: WebDriver, events: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> NetworkFilterStats:
+        """
+        Counts the requests the filter blocked since the last call, and starts
+        looking up their sizes if size probing is enabled.
+
+        :param driver: The WebDriver.
+        :param events: Network events already read from the performance log; read
+                       from the driver when omitted.
+        :return: The blocked requests; ``bytes_saved`` is left to
+                 :meth:`estimate_bytes_saved`.
+        """
+        if driver.capabilities.get("browserName") != "chrome":
+            return NetworkFilterStats(blocked_requests=None, bytes_saved=None)
+        if events is None:
+            events = read_performance_events(driver)
+        urls: Dict[str, str] = {}
+        blocked: List[str] = []
+        for event in events:
+            params = event.get("params", {})
+            if event.get("method") == "Network.requestWillBeSent":
+                urls[params.get("requestId", "")] = params.get("request", {}).get(
+                    "url", ""
+                )
+            elif event.get("method") == "Network.loadingFailed" and (
+                params.get("blockedReason") == CHROME_BLOCKED_REASON
+                or params.get("errorText") == CHROME_BLACKHOLE_ERROR
+            ):
+                url = urls.get(params.get("requestId", ""))
+                if url:
+                    blocked.append(url)
+        if self.sizes:
+            for url in blocked:
+                if urlsplit(url).scheme in ("http", "https"):
+                    self.sizes.prefetch(url)
+        return NetworkFilterStats(
+            blocked_requests=len(blocked), bytes_saved=None, blocked_urls=blocked
+        )
+
+    def estimate_bytes_saved(self, stats: NetworkFilterStats) -> None:
+        """
+        Sets the bytes a test's blocked requests would have cost, waiting for the
+        size lookups still running. Left as None if size probing is disabled.
+
+        :param stats: The test's stats, as returned by :meth:`collect`.
+        """
+        if self.sizes is None or stats.blocked_requests is None:
+            return
+        stats.bytes_saved = sum(
+            self.sizes.get(url) or 0
+            for url in stats.blocked_urls
+            if urlsplit(url).scheme in ("http", "https")
+        )
+
+    def close(self) -> None:
+        """
+        Stops the size lookups still queued.
+        """
+        if self.sizes:
+            self.sizes.close()
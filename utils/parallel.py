@@ -0,0 +1,381 @@
+import heapq
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+from .config import BASE_LOG_DIR, BASE_REPORT_DIR, WORKER_ID, WORKER_ID_ENV
+
+# Interval at which the controller polls worker result streams
+POLL_INTERVAL: float = 0.2
+
+# Name of the per-worker file the worker streams its serialized reports into
+RESULTS_FILE_NAME = "results.jsonl"
+
+# Environment variable telling workers where the merged HTML report is written
+MAIN_REPORT_DIR_ENV = "TEST_MAIN_REPORT_DIR"
+
+
+def main_report_dir(config: pytest.Config) -> Path:
+    """
+    Returns the directory of the HTML report the run's results end up in. For a
+    parallel worker this is the controller's merged report, not the worker's own.
+
+    :param config: The pytest config.
+    :return: The report directory, used as base for relative links in the report.
+    """
+    if WORKER_ID and os.getenv(MAIN_REPORT_DIR_ENV):
+        return Path(os.environ[MAIN_REPORT_DIR_ENV])
+    # The streaming report takes over the HTML report's path (see report_index_path)
+    html_path: Optional[str] = config.getoption("htmlpath", None) or getattr(
+        config.option, "report_index_path", None
+    )
+    if not html_path:
+        return BASE_REPORT_DIR
+    report_path = Path(os.path.expandvars(html_path)).expanduser()
+    return (config.invocation_params.dir / report_path).parent
+
+
+def strip_option(args: Sequence[str], option: str) -> List[str]:
+    """
+    Removes an option and its value from a command-line argument list.
+
+    :param args: The original argument list.
+    :param option: The option to remove (e.g., "--workers").
+    :return: A new argument list without the option.
+    """
+    stripped: List[str] = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+        elif arg == option:
+            skip_next = True
+        elif not arg.startswith(f"{option}="):
+            stripped.append(arg)
+    return stripped
+
+
+def class_scope(nodeid: str) -> str:
+    """
+    Returns the test class a node ID belongs to, whose tests share a pooled browser
+    lease, or the node ID itself for a test outside a class.
+
+    :param nodeid: The test's node ID, e.g. "tests/test_x.py::TestX::test_y[1]".
+    :return: The class's node ID, e.g. "tests/test_x.py::TestX".
+    """
+    parts = nodeid.split("[", 1)[0].split("::")
+    return "::".join(parts[:-1]) if len(parts) > 2 else nodeid
+
+
+def partition_nodeids(
+    nodeids: Sequence[str],
+    workers: int,
+    durations: Optional[Dict[str, float]] = None,
+) -> List[List[str]]:
+    """
+    Distributes test node IDs across workers, one test class at a time, so a class's
+    tests run back to back on one browser lease. Classes are scheduled
+    longest-processing-time first: the longest remaining class goes to the worker
+    with the least estimated work, and each worker runs its classes longest first, so
+    no slow class is left to start at the tail of the run. A class's estimate is the
+    sum of its tests' durations; tests without history are estimated at the median of
+    the known durations. Without durations, every test counts the same. Tests keep
+    their collection order within a class.
+
+    :param nodeids: Node IDs of the collected tests, in collection order.
+    :param workers: Number of worker processes.
+    :param durations: Optional estimated seconds per node ID from previous runs.
+    :return: One list of node IDs per worker. Lists may be empty.
+    """
+    buckets: List[List[str]] = [[] for _ in range(workers)]
+    classes: Dict[str, List[str]] = {}
+    for nodeid in nodeids:
+        classes.setdefault(class_scope(nodeid), []).append(nodeid)
+    default = statistics.median(durations.values()) if durations else 1.0
+    estimates = {
+        scope: sum((durations or {}).get(nodeid, default) for nodeid in members)
+        for scope, members in classes.items()
+    }
+    # sorted() is stable, so classes with equal estimates keep their collection order
+    ordered = sorted(classes, key=lambda scope: -estimates[scope])
+    loads = [(0.0, index) for index in range(workers)]
+    for scope in ordered:
+        load, index = heapq.heappop(loads)
+        buckets[index].extend(classes[scope])
+        heapq.heappush(loads, (load + estimates[scope], index))
+    return buckets
+
+
+def select_assigned_items(
+    config: pytest.Config, items: List[pytest.Item], nodeids_path: Path
+) -> None:
+    """
+    Narrows the collected items of a worker to the node IDs assigned by the
+    controller, in the order they were assigned.
+
+    :param config: The worker's pytest config.
+    :param items: The collected items, modified in place.
+    :param nodeids_path: File listing the assigned node IDs, one per line.
+    """
+    order = {
+        nodeid: index
+        for index, nodeid in enumerate(
+            nodeids_path.read_text(encoding="utf-8").splitlines()
+        )
+    }
+    selected = sorted(
+        (item for item in items if item.nodeid in order),
+        key=lambda item: order[item.nodeid],
+    )
+    deselected = [item for item in items if item.nodeid not in order]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+class WorkerResultWriter:
+    """
+    Plugin registered inside a worker process. Streams every test event, with its
+    serialized report, to the worker's results file for the controller to replay.
+    """
+
+    def __init__(self, config: pytest.Config, results_path: Path):
+        """
+        Opens the results stream for writing.
+
+        :param config: The worker's pytest config.
+        :param results_path: File the serialized events are appended to.
+        """
+        self.config = config
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream: IO[str] = results_path.open(mode="w", encoding="utf-8")
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        """
+        Writes one event as a JSON line and flushes it so the controller sees it at once.
+
+        :param event: The event payload.
+        """
+        self._stream.write(json.dumps(event, default=str) + "\n")
+        self._stream.flush()
+
+    def pytest_runtest_logstart(
+        self, nodeid: str, location: Tuple[str, Optional[int], str]
+    ) -> None:
+        """
+        Forwards the start of a test to the controller.
+        """
+        self._write({"event": "logstart", "nodeid": nodeid, "location": location})
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """
+        Forwards a setup, call or teardown report to the controller.
+        """
+        data = self.config.hook.pytest_report_to_serializable(
+            config=self.config, report=report
+        )
+        self._write({"event": "logreport", "report": data})
+
+    def pytest_runtest_logfinish(
+        self, nodeid: str, location: Tuple[str, Optional[int], str]
+    ) -> None:
+        """
+        Forwards the end of a test to the controller.
+        """
+        self._write({"event": "logfinish", "nodeid": nodeid, "location": location})
+
+    def pytest_unconfigure(self) -> None:
+        """
+        Closes the results stream when the worker session ends.
+        """
+        self._stream.close()
+
+
+class _Worker:
+    """
+    Book-keeping for one spawned worker process.
+    """
+
+    def __init__(
+        self, worker_id: str, process: subprocess.Popen[bytes], results_path: Path
+    ):
+        """
+        :param worker_id: Identifier of the worker (e.g., "gw0").
+        :param process: The running worker process.
+        :param results_path: File the worker streams its events into.
+        """
+        self.worker_id = worker_id
+        self.process = process
+        self.results_path = results_path
+        self.offset = 0
+        self.buffer = ""
+        self.pending: List[Dict[str, Any]] = []
+
+
+class ParallelRunner:
+    """
+    Runs the collected tests in worker processes and replays their results into the
+    controlling session, so terminal output and the HTML report are merged into one.
+
+    Each worker is a regular pytest process started with the controller's own command
+    line. It receives a disjoint slice of the collected node IDs and gets its own
+    ``TEST_WORKER_ID``, which gives it a private driver pool and private log,
+    screenshot and report directories.
+    """
+
+    def __init__(
+        self,
+        session: pytest.Session,
+        workers: int,
+        durations: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initializes the runner.
+
+        :param session: The controller's pytest session, with items already collected.
+        :param workers: Number of worker processes to spawn.
+        :param durations: Optional estimated seconds per node ID, used to schedule
+                          the longest tests first.
+        """
+        self.session = session
+        self.config = session.config
+        self.workers = workers
+        self.durations = durations
+        self.worker_ids: List[str] = []
+
+    def build_worker_args(self, worker_id: str, nodeids_path: Path) -> List[str]:
+        """
+        Builds the pytest command line for a worker.
+
+        :param worker_id: Identifier of the worker (e.g., "gw0").
+        :param nodeids_path: File listing the node IDs assigned to the worker.
+        :return: The full command line.
+        """
+        args = strip_option(self.config.invocation_params.args, "--workers")
+        args += ["--worker-nodeids", str(nodeids_path)]
+        if self.config.pluginmanager.hasplugin("html"):
+            args.append(f"--html={BASE_REPORT_DIR / worker_id / 'report.html'}")
+        return [sys.executable, "-m", "pytest", *args]
+
+    def spawn(self, worker_id: str, nodeids: List[str]) -> _Worker:
+        """
+        Starts a worker process for the given node IDs.
+
+        :param worker_id: Identifier of the worker (e.g., "gw0").
+        :param nodeids: Node IDs the worker should run, in order.
+        :return: The worker's book-keeping object.
+        """
+        report_dir = BASE_REPORT_DIR / worker_id
+        log_dir = BASE_LOG_DIR / worker_id
+        report_dir.mkdir(parents=True, exist_ok=True)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        nodeids_path = report_dir / "nodeids.txt"
+        nodeids_path.write_text("\n".join(nodeids), encoding="utf-8")
+        results_path = report_dir / RESULTS_FILE_NAME
+        results_path.write_text("", encoding="utf-8")
+
+        env = dict(
+            os.environ,
+            **{
+                WORKER_ID_ENV: worker_id,
+                MAIN_REPORT_DIR_ENV: str(main_report_dir(self.config)),
+            },
+        )
+        with (log_dir / "pytest_output.log").open(mode="wb") as output:
+            process = subprocess.Popen(
+                self.build_worker_args(worker_id, nodeids_path),
+                cwd=self.config.invocation_params.dir,
+                env=env,
+                stdout=output,
+                stderr=subprocess.STDOUT,
+            )
+        return _Worker(worker_id, process, results_path)
+
+    def run(self) -> None:
+        """
+        Spawns the workers, replays their results as they arrive and waits for all of
+        them to finish.
+
+        :raises pytest.Session.Failed: If a worker exits abnormally.
+        """
+        nodeids = [item.nodeid for item in self.session.items]
+        buckets = partition_nodeids(nodeids, self.workers, self.durations)
+        workers = [
+            self.spawn(f"gw{index}", bucket)
+            for index, bucket in enumerate(buckets)
+            if bucket
+        ]
+        self.worker_ids = [worker.worker_id for worker in workers]
+
+        running = list(workers)
+        while running:
+            time.sleep(POLL_INTERVAL)
+            for worker in list(running):
+                finished = worker.process.poll() is not None
+                self._replay(worker)
+                if finished:
+                    running.remove(worker)
+
+        crashed = [
+            f"{worker.worker_id} (exit code {worker.process.returncode})"
+            for worker in workers
+            if worker.process.returncode
+            not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED)
+        ]
+        if crashed:
+            raise self.session.Failed(
+                f"Worker process failed: {', '.join(crashed)}. "
+                f"See {BASE_LOG_DIR}/<worker>/pytest_output.log"
+            )
+
+    def _replay(self, worker: _Worker) -> None:
+        """
+        Reads newly written events from a worker and re-emits them as hooks of the
+        controlling session. Events are held back until the test's logfinish arrives,
+        so the output of concurrently running tests is never interleaved.
+
+        :param worker: The worker to read from.
+        """
+        with worker.results_path.open(mode="r", encoding="utf-8") as stream:
+            stream.seek(worker.offset)
+            worker.buffer += stream.read()
+            worker.offset = stream.tell()
+
+        *lines, worker.buffer = worker.buffer.split("\n")
+        for line in lines:
+            event: Dict[str, Any] = json.loads(line)
+            worker.pending.append(event)
+            if event["event"] == "logfinish":
+                for pending_event in worker.pending:
+                    self._emit(worker, pending_event)
+                worker.pending.clear()
+
+    def _emit(self, worker: _Worker, event: Dict[str, Any]) -> None:
+        """
+        Re-emits a single worker event as the matching hook of the controlling session.
+
+        :param worker: The worker the event came from.
+        :param event: The decoded event.
+        """
+        hook = self.config.hook
+        if event["event"] == "logstart":
+            hook.pytest_runtest_logstart(
+                nodeid=event["nodeid"], location=tuple(event["location"])
+            )
+        elif event["event"] == "logreport":
+            report = hook.pytest_report_from_serializable(
+                config=self.config, data=event["report"]
+            )
+            report.worker_id = worker.worker_id
+            hook.pytest_runtest_logreport(report=report)
+        elif event["event"] == "logfinish":
+            hook.pytest_runtest_logfinish(
+                nodeid=event["nodeid"], location=tuple(event["location"])
+            )
@@ -0,0 +1,281 @@
+import errno
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; clones are plain copies there
+    fcntl = None  # type: ignore[assignment]
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Linux ioctl that makes a file share the blocks of another until either is written
+# (copy-on-write clone, supported by Btrfs and XFS)
+FICLONE = 0x40049409
+
+# Chrome flags that skip first-run tasks, background networking and components the
+# tests never use
+CHROME_STARTUP_ARGUMENTS: Tuple[str, ...] = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--metrics-recording-only",
+    "--password-store=basic",
+    "--use-mock-keychain",
+)
+
+# Firefox preferences with the same purpose
+FIREFOX_STARTUP_PREFERENCES: Dict[str, Union[bool, int, str]] = {
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.aboutwelcome.enabled": False,
+    "browser.newtabpage.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "app.update.auto": False,
+    "extensions.update.enabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.reportingpolicy.firstRun": False,
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+}
+
+# Files a browser leaves in its profile while running; never cloned
+PROFILE_LOCK_FILES = (
+    "SingletonLock",
+    "SingletonCookie",
+    "SingletonSocket",
+    "lock",
+    ".parentlock",
+    "MarionetteActivePort",
+)
+
+
+class ProfileTemplate:
+    """
+    A browser profile prepared once and cloned for every browser launch, so new
+    browsers skip first-run work: creating the profile, first-run and
+    default-browser checks, component and extension updates, background networking
+    and GPU probing in headless mode. The browser also opens at a fixed window size,
+    so no resize follows the launch.
+
+    The template is built by launching the browser once with the tuned options on an
+    empty profile directory. It is kept in ``template_root`` under a key of the
+    browser and options, so later runs reuse it until the options change. Each
+    launch gets its own clone in ``clone_root``: a copy-on-write clone where the file
+    system supports it, a copy otherwise. Hard links are not used, because browsers
+    update their profile databases in place and linked clones would share the writes.
+    """
+
+    # Whether the file system accepted copy-on-write clones so far
+    reflinks: bool = True
+
+    def __init__(
+        self,
+        browser_name: str,
+        template_root: Path,
+        clone_root: Path,
+        window_size: Tuple[int, int],
+    ):
+        """
+        :param browser_name: Name of the browser ("chrome" or "firefox").
+        :param template_root: Directory the templates are kept in across runs.
+        :param clone_root: Directory the per-launch clones are created in.
+        :param window_size: Width and height the browser window opens with.
+        """
+        self.browser_name = browser_name
+        self.template_root = template_root
+        self.clone_root = clone_root
+        self.window_size = window_size
+        self._clones: List[Path] = []
+
+    @property
+    def path(self) -> Path:
+        """
+        The template directory, named after a hash of the browser and its options.
+        """
+        settings = json.dumps(
+            [self.browser_name, CHROME_STARTUP_ARGUMENTS, FIREFOX_STARTUP_PREFERENCES],
+            sort_keys=True,
+        )
+        key = hashlib.sha256(settings.encode()).hexdigest()[:12]
+        return self.template_root / f"{self.browser_name}-{key}"
+
+    def tune(
+        self, options: Union[ChromeOptions, FirefoxOptions], headless: bool
+    ) -> None:
+        """
+        Adds the startup-reducing flags or preferences and the fixed window size.
+
+        :param options: The browser options.
+        :param headless: Whether the browser runs headless (Chrome then skips GPU
+                         probing).
+        """
+        width, height = self.window_size
+        if isinstance(options, ChromeOptions):
+            for argument in CHROME_STARTUP_ARGUMENTS:
+                options.add_argument(argument)
+            if headless:
+                options.add_argument("--disable-gpu")
+            options.add_argument(f"--window-size={width},{height}")
+        else:
+            for name, value in FIREFOX_STARTUP_PREFERENCES.items():
+                options.set_preference(name, value)
+            options.add_argument(f"--width={width}")
+            options.add_argument(f"--height={height}")
+
+    def apply(
+        self,
+        options: Union[ChromeOptions, FirefoxOptions],
+        driver_path: str,
+        headless: bool,
+    ) -> Path:
+        """
+        Tunes the options and points them at a fresh clone of the template, building
+        the template first if needed.
+
+        :param options: The options of the browser about to be launched.
+        :param driver_path: Path of the driver binary, to build the template.
+        :param headless: Whether the browser runs headless.
+        :return: The clone the browser will use.
+        """
+        self.tune(options, headless)
+        profile = self.clone(driver_path, headless)
+        self._use_profile(options, profile)
+        return profile
+
+    def build(self, driver_path: str, headless: bool) -> Path:
+        """
+        Builds the template unless it exists. Concurrent builders (parallel workers)
+        each build their own copy and the first to finish wins.
+
+        :param driver_path: Path of the driver binary.
+        :param headless: Whether to launch the browser headless.
+        :return: The template directory.
+        """
+        if self.path.exists():
+            return self.path
+        self.template_root.mkdir(parents=True, exist_ok=True)
+        staging = Path(
+            tempfile.mkdtemp(prefix=f"{self.path.name}.", dir=self.template_root)
+        )
+        options: Any = (
+            ChromeOptions() if self.browser_name == "chrome" else FirefoxOptions()
+        )
+        if headless:
+            options.add_argument("--headless")
+        self.tune(options, headless)
+        self._use_profile(options, staging)
+        driver = (
+            webdriver.Chrome(service=ChromeService(driver_path), options=options)
+            if self.browser_name == "chrome"
+            else webdriver.Firefox(service=FirefoxService(driver_path), options=options)
+        )
+        try:
+            driver.get("about:blank")
+        finally:
+            driver.quit()
+        for name in PROFILE_LOCK_FILES:
+            (staging / name).unlink(missing_ok=True)
+        try:
+            staging.rename(self.path)
+            logger.info("Built %s profile template %s", self.browser_name, self.path)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)  # another process won the race
+        return self.path
+
+    def clone(self, driver_path: str, headless: bool) -> Path:
+        """
+        Creates a private copy of the template for one browser launch.
+
+        :param driver_path: Path of the driver binary, to build the template.
+        :param headless: Whether the browser runs headless.
+        :return: The clone directory.
+        """
+        template = self.build(driver_path, headless)
+        self.clone_root.mkdir(parents=True, exist_ok=True)
+        profile = Path(
+            tempfile.mkdtemp(prefix=f"{self.browser_name}-", dir=self.clone_root)
+        )
+        shutil.copytree(
+            template,
+            profile,
+            symlinks=True,
+            ignore=shutil.ignore_patterns(*PROFILE_LOCK_FILES),
+            copy_function=self.clone_file,
+            dirs_exist_ok=True,
+        )
+        self._clones.append(profile)
+        return profile
+
+    @classmethod
+    def clone_file(cls, source: str, destination: str) -> None:
+        """
+        Copies a file as a copy-on-write clone where the file system supports it, so
+        the copy costs no data I/O, and as a regular copy otherwise.
+
+        :param source: The file to copy.
+        :param destination: The path of the copy.
+        """
+        if fcntl is not None and cls.reflinks:
+            try:
+                with open(source, "rb") as src, open(destination, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, destination)
+                return
+            except OSError as error:
+                if error.errno not in (
+                    errno.EOPNOTSUPP,
+                    errno.EXDEV,
+                    errno.EINVAL,
+                    errno.ENOTTY,
+                ):
+                    raise
+                cls.reflinks = False
+                logger.debug("Copy-on-write clones unsupported; copying profiles")
+        shutil.copy2(source, destination)
+
+    def cleanup(self) -> None:
+        """
+        Deletes the clones created by this template; the template itself is kept.
+        """
+        for profile in self._clones:
+            shutil.rmtree(profile, ignore_errors=True)
+        self._clones.clear()
+
+    @staticmethod
+    def _use_profile(
+        options: Union[ChromeOptions, FirefoxOptions], profile: Path
+    ) -> None:
+        """
+        Points the browser options at a profile directory. Firefox gets it as a
+        command-line argument, which GeckoDriver uses in place, instead of a
+        FirefoxProfile, which it would zip and unpack again.
+
+        :param options: The browser options.
+        :param profile: The profile directory.
+        """
+        if isinstance(options, ChromeOptions):
+            options.add_argument(f"--user-data-dir={profile}")
+        else:
+            options.add_argument("-profile")
+            options.add_argument(str(profile))
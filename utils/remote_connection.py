@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import urllib3
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.service import Service
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# --remote-url value that starts the local driver binary as a standalone WebDriver
+# server, so the remote mode can be exercised without a Grid
+STAND_IN_REMOTE = "stand-in"
+
+# ChromeDriver's vendor endpoint for DevTools commands, which the generic remote
+# connection does not know
+CDP_COMMAND = "executeCdpCommand"
+CDP_ENDPOINT = ("POST", "/session/$sessionId/goog/cdp/execute")
+
+
+class RemoteConnectionPool:
+    """
+    Keep-alive HTTP connections to a Selenium Grid or standalone server, shared by
+    the command channels of every remote session in the process. Selenium gives
+    each driver its own connection pool by default, so ten sessions hold up to ten
+    idle pools; here all sessions draw from one pool of at most ``max_connections``
+    connections. When all of them are busy, commands wait for a free connection
+    instead of opening more.
+
+    Requests that fail to connect, or whose connection is reset, are retried.
+    Commands that change browser state (POST) are only retried when the request
+    never reached the server, so a click is never sent twice; urllib3 checks that a
+    kept-alive connection is still open before reusing it. Connections go to the
+    server directly, without HTTP proxies.
+
+    Every command's HTTP request is timed; the pool keeps the count and total time
+    of the requests of all sessions.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int,
+        connect_timeout: float,
+        read_timeout: float,
+        retries: int,
+    ):
+        """
+        :param url: URL of the Grid or server, e.g. "http://grid:4444".
+        :param max_connections: Maximum number of open connections.
+        :param connect_timeout: Seconds to wait for a connection to be established.
+        :param read_timeout: Seconds to wait for a command's response.
+        :param retries: Retries of a request after a connection error or reset.
+        """
+        self.url = url.rstrip("/")
+        self.requests = 0
+        self.request_time = 0.0
+        self._lock = threading.Lock()
+        self.manager = urllib3.PoolManager(
+            maxsize=max_connections,
+            block=True,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+            retries=urllib3.Retry(
+                total=retries,
+                connect=retries,
+                read=retries,
+                status=0,
+                redirect=False,
+                backoff_factor=0.1,
+                raise_on_status=False,
+            ),
+        )
+
+    def connection(self, browser_name: str) -> "PooledRemoteConnection":
+        """
+        Creates the command channel of a new session, drawing on the shared pool.
+
+        :param browser_name: Name of the session's browser.
+        :return: The remote connection.
+        """
+        return PooledRemoteConnection(self, browser_name)
+
+    def add_request(self, duration: float) -> None:
+        """
+        Counts a timed request of one of the sessions.
+
+        :param duration: The request's duration in seconds.
+        """
+        with self._lock:
+            self.requests += 1
+            self.request_time += duration
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+        self.manager.clear()
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """
+    The command channel of one remote session, sending its commands over the shared
+    connections of a :class:`RemoteConnectionPool`.
+    """
+
+    def __init__(self, pool: RemoteConnectionPool, browser_name: str):
+        """
+        :param pool: The shared connection pool.
+        :param browser_name: Name of the session's browser; Chrome sessions also
+                             accept DevTools commands.
+        """
+        super().__init__(pool.url, keep_alive=False, ignore_proxy=True)
+        self.pool = pool
+        self.keep_alive = True
+        self._conn = pool.manager
+        self._timing = threading.local()
+        if browser_name == "chrome":
+            self._commands = {**self._commands, CDP_COMMAND: CDP_ENDPOINT}
+
+    def _request(
+        self, method: str, url: str, body: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Sends a command's HTTP request and times it, connection waits and retries
+        included.
+
+        :param method: The HTTP method.
+        :param url: The command's URL.
+        :param body: The JSON-encoded parameters.
+        :return: The server's parsed response.
+        """
+        start = time.perf_counter()
+        try:
+            response: Dict[str, Any] = super()._request(  # type: ignore[no-untyped-call]
+                method, url, body
+            )
+            return response
+        finally:
+            duration = time.perf_counter() - start
+            self._timing.duration = duration
+            self.pool.add_request(duration)
+
+    def take_request_time(self) -> float:
+        """
+        Returns the duration of the calling thread's last request and forgets it, so
+        a command that failed before sending one is not charged for it.
+
+        :return: The request's duration in seconds, or 0.0 if none was sent.
+        """
+        duration: float = getattr(self._timing, "duration", 0.0)
+        self._timing.duration = 0.0
+        return duration
+
+    def close(self) -> None:
+        """
+        Leaves the shared connections open for the other sessions; the pool's owner
+        closes them.
+        """
+
+
+class RemoteChromeDriver(webdriver.Remote):
+    """
+    A remote Chrome session that, like the local Chrome driver, can send DevTools
+    commands (used by the network filter and browser contexts).
+    """
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Dict[str, Any]) -> Any:
+        """
+        Executes a Chrome DevTools Protocol command in the remote browser.
+
+        :param cmd: The DevTools command, e.g. "Network.enable".
+        :param cmd_args: The command's parameters.
+        :return: The command's result.
+        """
+        return self.execute(CDP_COMMAND, {"cmd": cmd, "params": cmd_args})["value"]
+
+
+def start_local_server(browser_name: str, driver_path: str) -> Service:
+    """
+    Starts the local driver binary (ChromeDriver or GeckoDriver) as a standalone
+    WebDriver server that remote sessions can connect to, in place of a Grid.
+    GeckoDriver serves one session at a time.
+
+    :param browser_name: Name of the browser ("chrome" or "firefox").
+    :param driver_path: Path of the driver binary.
+    :return: The running server; its URL is ``service_url``.
+    """
+    service: Service = (
+        ChromeService(driver_path)
+        if browser_name == "chrome"
+        else FirefoxService(driver_path)
+    )
+    service.start()
+    logger.info("Started local WebDriver server at %s", service.service_url)
+    return service
@@ -0,0 +1,391 @@
+import hashlib
+import html
+import json
+import logging
+import os
+import shutil
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+import pytest
+
+from .reruns import RERUN_OUTCOME
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Report backends: pytest-html's single file, or the streaming store with a paged index
+REPORT_BACKENDS = ("html", "stream")
+
+# Directory next to the index holding the result streams, detail pages and index pages
+REPORT_DATA_DIR_NAME = "report_data"
+
+# Results per page of the index
+PAGE_SIZE = 500
+
+# Filters of the index, each paged separately: every result, or one outcome
+OUTCOME_FILTERS = (
+    "all",
+    "failed",
+    "error",
+    "rerun",
+    "xpassed",
+    "xfailed",
+    "skipped",
+    "passed",
+)
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 16px; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ border: 1px solid #ddd; padding: 4px 8px; text-align: left; }}
+.filters button, .pager button {{ margin: 0 4px 8px 0; }}
+.filters button.active {{ font-weight: bold; }}
+.failed, .error {{ color: #c00; }} .passed {{ color: #080; }}
+.rerun, .xfailed, .xpassed, .skipped {{ color: #a60; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>{summary}</p>
+<div class="filters" id="filters"></div>
+<div class="pager">
+<button id="previous">&lt;</button><span id="position"></span><button id="next">&gt;</button>
+<input id="search" placeholder="Filter this page by test ID">
+</div>
+<table>
+<thead><tr><th>Result</th><th>Test</th><th>Duration (s)</th><th>Worker</th></tr></thead>
+<tbody id="results"></tbody>
+</table>
+<script>
+const PAGES = {pages};
+const DATA_DIR = "{data_dir}";
+let filter = "all", page = 0, rows = [];
+function escapeHtml(text) {{
+  const element = document.createElement("span");
+  element.textContent = text;
+  return element.innerHTML;
+}}
+function render() {{
+  const search = document.getElementById("search").value.toLowerCase();
+  document.getElementById("results").innerHTML = rows
+    .filter(row => row.nodeid.toLowerCase().includes(search))
+    .map(row => `<tr><td class="${{row.outcome}}">${{row.outcome}}</td>` +
+      `<td><a href="${{row.detail}}" target="_blank">${{escapeHtml(row.nodeid)}}</a></td>` +
+      `<td>${{row.duration.toFixed(2)}}</td><td>${{escapeHtml(row.worker || "")}}</td></tr>`)
+    .join("");
+  const pages = PAGES[filter].pages;
+  document.getElementById("position").textContent =
+    pages ? ` page ${{page + 1}} of ${{pages}} ` : " no results ";
+}}
+// Pages are scripts rather than JSON, so they also load when opened from disk
+window.reportPage = function (pageRows) {{ rows = pageRows; render(); }};
+function load(newFilter, newPage) {{
+  filter = newFilter;
+  page = Math.max(0, Math.min(newPage, PAGES[filter].pages - 1));
+  rows = [];
+  render();
+  document.querySelectorAll("#filters button").forEach(
+    button => button.classList.toggle("active", button.dataset.filter === filter));
+  if (!PAGES[filter].pages) return;
+  const script = document.createElement("script");
+  script.src = `${{DATA_DIR}}/pages/${{filter}}-${{page}}.js`;
+  script.onload = () => script.remove();
+  document.body.appendChild(script);
+}}
+for (const [name, info] of Object.entries(PAGES)) {{
+  const button = document.createElement("button");
+  button.dataset.filter = name;
+  button.textContent = `${{name}} (${{info.count}})`;
+  button.onclick = () => load(name, 0);
+  document.getElementById("filters").appendChild(button);
+}}
+document.getElementById("previous").onclick = () => load(filter, page - 1);
+document.getElementById("next").onclick = () => load(filter, page + 1);
+document.getElementById("search").oninput = render;
+load(["failed", "error"].find(name => PAGES[name].count) || "all", 0);
+</script>
+</body>
+</html>
+"""
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<base href="../../">
+<title>{nodeid}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 16px; }}
+pre {{ background: #f5f5f5; padding: 8px; overflow-x: auto; white-space: pre-wrap; }}
+</style>
+</head>
+<body>
+<h1>{nodeid}</h1>
+<p>{outcome} in {duration:.2f}s{worker}</p>
+{body}
+</body>
+</html>
+"""
+
+
+def result_outcome(report: pytest.TestReport) -> Optional[str]:
+    """
+    Classifies a setup, call or teardown report the way the HTML report does.
+
+    :param report: The report.
+    :return: The test's outcome as far as this phase tells, or None for a passed
+             setup or teardown.
+    """
+    if report.outcome == RERUN_OUTCOME:
+        return RERUN_OUTCOME
+    xfail = hasattr(report, "wasxfail")
+    if report.when == "call":
+        if xfail:
+            return "xpassed" if report.passed else "xfailed"
+        return report.outcome
+    if report.failed:
+        return "error"
+    if report.skipped:
+        return "xfailed" if xfail else "skipped"
+    return None
+
+
+def render_extra(extra: Dict[str, Any]) -> str:
+    """
+    Renders a pytest-html extra (screenshot, URL, HTML, text or JSON) for a detail page.
+
+    :param extra: The extra, as created by pytest_html.extras.
+    :return: The HTML.
+    """
+    format_type = extra.get("format_type")
+    content = str(extra.get("content", ""))
+    name = html.escape(str(extra.get("name") or content))
+    if format_type == "html":
+        return content
+    if format_type == "url":
+        return f'<p><a href="{html.escape(content)}" target="_blank">{name}</a></p>'
+    if format_type == "image":
+        source = (
+            content
+            if "/" in content or "." in content[-5:]
+            else f"data:{extra.get('mime_type', 'image/png')};base64,{content}"
+        )
+        return f'<p><img src="{html.escape(source)}" alt="{name}" loading="lazy"></p>'
+    return f"<pre>{html.escape(content)}</pre>"
+
+
+class StreamingReport:
+    """
+    Plugin that writes the run's results as they finish instead of keeping them all
+    in memory for one report file at the end of the session, for runs with tens of
+    thousands of data-driven tests.
+
+    Each finished test appends one small JSON line to this process's result stream,
+    and its traceback, captured logs and extras go to a detail page of their own.
+    When the session ends, every stream in the report's data directory is read
+    line by line and the index is rendered: a page that loads fixed-size pages of
+    results per outcome and links each result to its detail page, so neither the
+    renderer nor the browser ever holds the whole run. Streams are named after the
+    host and process that wrote them, so the data directories of several shards can
+    be copied into one and rendered together with
+    ``python -m utils.report_store <index>``.
+
+    Registered in the process that reports results; in a parallel run that is the
+    controller, which replays its workers' reports.
+    """
+
+    def __init__(self, index_path: Path, title: str):
+        """
+        Starts a new stream, discarding the results of a previous run.
+
+        :param index_path: The index page; its data directory is created beside it.
+        :param title: Title of the index page.
+        """
+        self.index_path = index_path
+        self.title = title
+        self.data_dir = index_path.parent / REPORT_DATA_DIR_NAME
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        (self.data_dir / "streams").mkdir(parents=True)
+        (self.data_dir / "details").mkdir()
+        self.stream_name = f"{socket.gethostname()}-{os.getpid()}"
+        self._stream: IO[str] = (
+            self.data_dir / "streams" / f"{self.stream_name}.jsonl"
+        ).open(mode="w", encoding="utf-8")
+        self._pending: Dict[str, List[pytest.TestReport]] = {}
+        self._attempts: Dict[str, int] = {}
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """
+        Collects a test's reports and writes its result once the test finished: after
+        teardown, or after a failed attempt that will be rerun.
+        """
+        reports = self._pending.setdefault(report.nodeid, [])
+        reports.append(report)
+        if report.when == "teardown" or report.outcome == RERUN_OUTCOME:
+            self.write_result(self._pending.pop(report.nodeid))
+
+    def write_result(self, reports: List[pytest.TestReport]) -> None:
+        """
+        Writes a test's detail page and appends its result to the stream.
+
+        :param reports: The reports of one attempt of the test, in phase order.
+        """
+        nodeid = reports[0].nodeid
+        outcomes = [result_outcome(report) for report in reports]
+        outcome = next((outcome for outcome in outcomes if outcome), "passed")
+        if outcome == "passed" and "error" in outcomes:
+            outcome = "error"  # passed, but failed in teardown
+        attempt = self._attempts.get(nodeid, 0)
+        self._attempts[nodeid] = attempt + 1
+        key = hashlib.sha1(
+            f"{self.stream_name}\0{nodeid}\0{attempt}".encode()
+        ).hexdigest()[:16]
+        worker = getattr(reports[0], "worker_id", "")
+        duration = sum(report.duration for report in reports)
+        detail_path = self.data_dir / "details" / f"{key}.html"
+        detail_path.write_text(
+            DETAIL_TEMPLATE.format(
+                nodeid=html.escape(nodeid),
+                outcome=outcome,
+                duration=duration,
+                worker=f" on {html.escape(worker)}" if worker else "",
+                body=self._detail_body(reports),
+            ),
+            encoding="utf-8",
+        )
+        result = {
+            "nodeid": nodeid,
+            "outcome": outcome,
+            "duration": round(duration, 3),
+            "worker": worker,
+            "detail": f"{REPORT_DATA_DIR_NAME}/details/{key}.html",
+        }
+        self._stream.write(json.dumps(result) + "\n")
+        self._stream.flush()
+
+    @staticmethod
+    def _detail_body(reports: List[pytest.TestReport]) -> str:
+        """
+        Renders the tracebacks, captured output and extras of a test's reports.
+
+        :param reports: The reports of one attempt of the test.
+        :return: The HTML.
+        """
+        parts: List[str] = []
+        for report in reports:
+            extras = getattr(report, "extras", [])
+            parts.extend(render_extra(extra) for extra in extras)
+            if report.longrepr and not report.passed:
+                parts.append(f"<h2>{report.when}</h2>")
+                parts.append(f"<pre>{html.escape(report.longreprtext)}</pre>")
+        # Later phases repeat the captured output of earlier ones
+        sections = dict(section for report in reports for section in report.sections)
+        for title, content in sections.items():
+            parts.append(f"<h2>{html.escape(title)}</h2>")
+            parts.append(f"<pre>{html.escape(content)}</pre>")
+        return "\n".join(parts)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """
+        Closes the stream and renders the index from every stream in the data directory.
+        """
+        self._stream.close()
+        render_index(self.index_path, self.title)
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        """
+        Prints where the report was written.
+        """
+        terminalreporter.write_sep(
+            "-", f"Generated report index: {self.index_path.resolve().as_uri()}"
+        )
+
+
+def read_results(data_dir: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Reads the results of every stream in a report data directory, one at a time.
+    A truncated last line, left by a process that was killed, is skipped.
+
+    :param data_dir: The report data directory.
+    :return: The results, stream by stream in the order they were written.
+    """
+    for stream_path in sorted((data_dir / "streams").glob("*.jsonl")):
+        with stream_path.open(encoding="utf-8") as stream:
+            for line in stream:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping truncated result in %s", stream_path)
+
+
+def render_index(index_path: Path, title: str) -> None:
+    """
+    Renders the index of the results in the data directory beside it. Results are
+    streamed into page files of PAGE_SIZE results per filter, so at most one page
+    per filter is held in memory.
+
+    :param index_path: The index page to write.
+    :param title: Title of the index page.
+    """
+    data_dir = index_path.parent / REPORT_DATA_DIR_NAME
+    pages_dir = data_dir / "pages"
+    shutil.rmtree(pages_dir, ignore_errors=True)
+    pages_dir.mkdir(parents=True)
+    buffers: Dict[str, List[Dict[str, Any]]] = {name: [] for name in OUTCOME_FILTERS}
+    counts = {name: 0 for name in OUTCOME_FILTERS}
+    written = {name: 0 for name in OUTCOME_FILTERS}
+
+    def flush(name: str) -> None:
+        page_path = pages_dir / f"{name}-{written[name]}.js"
+        page_path.write_text(
+            f"window.reportPage({json.dumps(buffers[name])});\n", encoding="utf-8"
+        )
+        written[name] += 1
+        buffers[name] = []
+
+    for result in read_results(data_dir):
+        for name in ("all", result["outcome"]):
+            if name not in buffers:
+                continue
+            buffers[name].append(result)
+            counts[name] += 1
+            if len(buffers[name]) == PAGE_SIZE:
+                flush(name)
+    for name in OUTCOME_FILTERS:
+        if buffers[name]:
+            flush(name)
+
+    summary = ", ".join(
+        f"{counts[name]} {name}" for name in OUTCOME_FILTERS[1:] if counts[name]
+    )
+    pages = {
+        name: {"count": counts[name], "pages": written[name]}
+        for name in OUTCOME_FILTERS
+    }
+    index_path.write_text(
+        INDEX_TEMPLATE.format(
+            title=html.escape(title),
+            summary=html.escape(
+                f"{counts['all']} results ({summary or 'none'}), "
+                f"rendered {time.strftime('%Y-%m-%d %H:%M:%S')}"
+            ),
+            pages=json.dumps(pages),
+            data_dir=REPORT_DATA_DIR_NAME,
+        ),
+        encoding="utf-8",
+    )
+    logger.info("Rendered report index %s from %d results", index_path, counts["all"])
+
+
+if __name__ == "__main__":
+    # Re-render an index, e.g. after copying the data directories of shards into one
+    render_index(Path(sys.argv[1]), sys.argv[2] if len(sys.argv) > 2 else "Test Report")
@@ -0,0 +1,165 @@
+import logging
+from typing import Dict, Generator, List, Optional, Tuple
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Outcome of a failed attempt that is retried; reported apart from first results
+RERUN_OUTCOME = "rerun"
+
+# Major pytest versions whose private runner API (runtestprotocol, the report
+# sections and fixture request of an item) the plugin is known to work with; 8 is
+# pinned in requirements.txt
+SUPPORTED_PYTEST_MAJOR_VERSIONS = (8, 9)
+
+
+def pytest_internals_supported() -> bool:
+    """
+    Tells whether the running pytest is a version whose private runner API the
+    plugin relies on.
+
+    :return: True if reruns can run in this pytest.
+    """
+    return pytest.version_tuple[0] in SUPPORTED_PYTEST_MAJOR_VERSIONS
+
+
+def _run_protocol(
+    item: pytest.Item, nextitem: Optional[pytest.Item]
+) -> List[pytest.TestReport]:
+    """
+    Runs setup, call and teardown of a test without logging the reports, through
+    pytest's private runner.
+
+    :param item: The test.
+    :param nextitem: The test that runs next, for fixture teardown.
+    :return: The reports of the phases that ran.
+    """
+    return runtestprotocol(item, nextitem=nextitem, log=False)
+
+
+def _reset_item(item: pytest.Item) -> None:
+    """
+    Clears the state a previous attempt left on a test item: its captured report
+    sections and, for test functions, its fixture request.
+
+    :param item: The test.
+    """
+    item._report_sections = []
+    if isinstance(item, pytest.Function):
+        item._initrequest()
+
+
+class RerunScheduler:
+    """
+    Plugin that retries failed tests at the end of the session instead of failing
+    them at once. Reruns happen in the same session, on the browsers the pool already
+    launched, so a network blip against the site costs one more attempt of the test
+    rather than a new pytest invocation with collection and browser launches.
+
+    A failed setup or call of a test with reruns left is reported with the outcome
+    "rerun" (shown as R in the terminal and as a rerun in the HTML report) and
+    queued. Once every test had its first attempt, the queued tests run again, each
+    with its fixtures set up from scratch, so the class's browser lease is returned
+    to the pool, reset and acquired again. A test's last attempt is reported as
+    usual and decides its result.
+    """
+
+    def __init__(self, default_reruns: int):
+        """
+        :param default_reruns: Reruns of tests without a reruns marker.
+        """
+        self.default_reruns = default_reruns
+        self.supported = pytest_internals_supported()
+        if default_reruns > 0 and not self.supported:
+            logger.warning(
+                "Reruns are disabled: pytest %s is not a supported version (%s)",
+                pytest.__version__,
+                ", ".join(f"{major}.x" for major in SUPPORTED_PYTEST_MAJOR_VERSIONS),
+            )
+        self.attempts: Dict[str, int] = {}
+        self._queue: List[pytest.Item] = []
+
+    def max_reruns(self, item: pytest.Item) -> int:
+        """
+        Returns how often a test may be rerun: the closest reruns marker (test,
+        class or module) if present, otherwise the --reruns option.
+
+        :param item: The test.
+        :return: The maximum number of reruns.
+        """
+        marker = item.get_closest_marker("reruns")
+        if marker is None:
+            return self.default_reruns
+        return int(marker.args[0] if marker.args else marker.kwargs.get("n", 0))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(
+        self, item: pytest.Item, nextitem: Optional[pytest.Item]
+    ) -> Optional[bool]:
+        """
+        Runs a test that may be rerun, holding back the reports of a failed attempt
+        after the failure. Tests without reruns, and every test on an unsupported
+        pytest version, use pytest's own protocol.
+        """
+        if not self.supported or self.max_reruns(item) <= 0:
+            return None
+        self._run_attempt(item, nextitem)
+        return True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtestloop(
+        self, session: pytest.Session
+    ) -> Generator[None, None, None]:
+        """
+        Reruns the queued tests after the regular run loop, until they pass or run
+        out of reruns.
+        """
+        yield
+        while self._queue and not (session.shouldfail or session.shouldstop):
+            queue, self._queue = self._queue, []
+            logger.info("Rerunning %d failed test(s)", len(queue))
+            for item in queue:
+                _reset_item(item)
+                # No next item: tear every fixture down so the next attempt starts
+                # from a released, reset and re-acquired browser
+                item.ihook.pytest_runtest_protocol(item=item, nextitem=None)
+
+    def pytest_report_teststatus(
+        self, report: pytest.TestReport
+    ) -> Optional[Tuple[str, str, Tuple[str, Dict[str, bool]]]]:
+        """
+        Reports failed attempts that will be retried as reruns, not failures.
+        """
+        if report.outcome == RERUN_OUTCOME:
+            return RERUN_OUTCOME, "R", ("RERUN", {"yellow": True})
+        return None
+
+    def _run_attempt(self, item: pytest.Item, nextitem: Optional[pytest.Item]) -> None:
+        """
+        Runs one attempt of a test and logs its reports. If the setup or call fails
+        and reruns are left, the failure is logged as a rerun, the remaining reports
+        of the attempt are dropped and the test is queued.
+
+        :param item: The test.
+        :param nextitem: The test that runs next, for fixture teardown.
+        """
+        attempt = self.attempts.get(item.nodeid, 0)
+        self.attempts[item.nodeid] = attempt + 1
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        reports = _run_protocol(item, nextitem)
+        for report in reports:
+            report.rerun = attempt  # type: ignore[attr-defined]
+            failed = report.failed and not hasattr(report, "wasxfail")
+            if (
+                failed
+                and report.when in ("setup", "call")
+                and attempt < self.max_reruns(item)
+            ):
+                report.outcome = RERUN_OUTCOME  # type: ignore[assignment]
+                item.ihook.pytest_runtest_logreport(report=report)
+                self._queue.append(item)
+                break
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
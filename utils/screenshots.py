@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it captures are stored as-is
+    Image = None  # type: ignore[assignment]
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ScreenshotLinks:
+    """
+    Relative links (from the HTML report's directory) to a stored screenshot.
+    """
+
+    full: str
+    thumbnail: str
+
+
+class ScreenshotWriter:
+    """
+    Writes failure screenshots on a background thread so the reporting hook never
+    waits for image encoding or disk I/O.
+
+    Screenshots are submitted as in-memory PNG bytes. Each capture is named after its
+    content hash, so identical captures (e.g. the same error page for every test
+    during an outage) are stored once. With Pillow installed the writer stores a
+    compressed JPEG of the full image plus a small thumbnail; without it the PNG is
+    stored as captured and doubles as its own thumbnail. The queue is bounded:
+    when it is full, new captures are dropped instead of stalling the tests.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        link_base: Path,
+        max_queue_size: int = 32,
+        thumbnail_size: Tuple[int, int] = (304, 228),
+        jpeg_quality: int = 80,
+    ):
+        """
+        Initializes the writer. Call start() before submitting screenshots.
+
+        :param output_dir: Directory screenshots are written to.
+        :param link_base: Directory the returned links are relative to (the report's).
+        :param max_queue_size: Maximum number of captures waiting to be written.
+        :param thumbnail_size: Bounding box of the thumbnail in pixels.
+        :param jpeg_quality: JPEG quality of the compressed images (1-95).
+        """
+        self.output_dir = output_dir
+        self.link_base = link_base
+        self.thumbnail_size = thumbnail_size
+        self.jpeg_quality = jpeg_quality
+        self.dropped = 0
+        self._queue: queue.Queue[Optional[Tuple[bytes, Path, Path]]] = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._seen: Set[str] = set()
+        self._thread = threading.Thread(
+            target=self._run, name="screenshot-writer", daemon=True
+        )
+
+    def start(self) -> None:
+        """
+        Starts the background writer thread.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Writes the remaining queued screenshots and stops the writer thread.
+
+        :param timeout: Maximum time to wait for the queue to drain.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+
+    def submit(self, png: bytes) -> Optional[ScreenshotLinks]:
+        """
+        Queues a screenshot for writing and returns its links immediately.
+
+        :param png: The screenshot as PNG bytes.
+        :return: Links to the full image and thumbnail, or None if the queue was full.
+        """
+        digest = hashlib.sha256(png).hexdigest()[:16]
+        suffix = ".jpg" if Image is not None else ".png"
+        full_path = self.output_dir / f"{digest}{suffix}"
+        thumbnail_path = (
+            self.output_dir / f"{digest}_thumb{suffix}"
+            if Image is not None
+            else full_path
+        )
+        if digest not in self._seen:
+            try:
+                self._queue.put_nowait((png, full_path, thumbnail_path))
+            except queue.Full:
+                self.dropped += 1
+                logger.warning("Screenshot queue full; dropping capture %s", digest)
+                return None
+            self._seen.add(digest)
+        return ScreenshotLinks(
+            full=self._link(full_path), thumbnail=self._link(thumbnail_path)
+        )
+
+    def _link(self, path: Path) -> str:
+        """
+        Builds a link to a screenshot relative to the report directory.
+
+        :param path: Path of the screenshot file.
+        :return: The relative link, with forward slashes.
+        """
+        return Path(os.path.relpath(path, self.link_base)).as_posix()
+
+    def _run(self) -> None:
+        """
+        Writer thread loop: encodes and writes queued captures until stopped.
+        """
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._write(*job)
+            except Exception as error:  # a broken capture must not kill the writer
+                logger.warning("Failed to write screenshot %s: %s", job[1], error)
+
+    def _write(self, png: bytes, full_path: Path, thumbnail_path: Path) -> None:
+        """
+        Writes the full image and the thumbnail of one capture.
+
+        :param png: The screenshot as PNG bytes.
+        :param full_path: Destination of the full image.
+        :param thumbnail_path: Destination of the thumbnail.
+        """
+        if Image is None:
+            full_path.write_bytes(png)
+            return
+        with Image.open(BytesIO(png)) as image:
+            rgb = image.convert("RGB")
+            rgb.save(full_path, "JPEG", quality=self.jpeg_quality, optimize=True)
+            rgb.thumbnail(self.thumbnail_size)
+            rgb.save(thumbnail_path, "JPEG", quality=self.jpeg_quality, optimize=True)
@@ -0,0 +1,302 @@
+// Stand-in for the ProtoCommerce practice app. Reproduces the markup the page objects
+// locate (home form, shop cards, checkout table, purchase form) as a single-page app.
+// State lives in sessionStorage, so it survives reloads and is cleared with storage.
+//
+// Query parameters (read on any route, then kept for the session):
+//   catalog=N        add N generated products ("Product 1" ... "Product N")
+//   cart=N           replace the cart with the first N catalog products
+//   suggestDelay=MS  delay of the country suggestions on the purchase page
+(() => {
+    const BASE = document.querySelector('base').getAttribute('href');
+    const STORAGE_KEY = 'standIn';
+    const BASE_PRODUCTS = [
+        {name: 'iphone X', price: 100000},
+        {name: 'Samsung Note 8', price: 85000},
+        {name: 'Nokia Edge', price: 65000},
+        {name: 'Blackberry', price: 50000},
+    ];
+    const COUNTRIES = [
+        'Australia', 'Brazil', 'British Indian Ocean Territory', 'Canada', 'France',
+        'Germany', 'India', 'Indonesia', 'Japan', 'United Kingdom',
+        'United States of America',
+    ];
+    const app = document.getElementById('app');
+
+    const escapeHtml = text => String(text).replace(/[&<>"']/g, char => (
+        {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[char]));
+    const formatPrice = amount => `₹. ${amount}`;
+
+    const loadState = () => {
+        try {
+            const stored = JSON.parse(sessionStorage.getItem(STORAGE_KEY));
+            if (stored && stored.config && Array.isArray(stored.cart)) { return stored; }
+        } catch (error) { /* fall through to the initial state */ }
+        return {config: {catalog: 0, suggestDelay: 0}, cart: []};
+    };
+    const state = loadState();
+    const saveState = () => sessionStorage.setItem(STORAGE_KEY, JSON.stringify(state));
+
+    const products = () => {
+        const generated = Array.from({length: state.config.catalog}, (_, index) => (
+            {name: `Product ${index + 1}`, price: 1000 + index + 1}));
+        return BASE_PRODUCTS.concat(generated);
+    };
+    const productByName = name => products().find(product => product.name === name);
+
+    const applyQueryParameters = () => {
+        const params = new URLSearchParams(location.search);
+        if (params.has('catalog')) {
+            state.config.catalog = Math.max(parseInt(params.get('catalog'), 10) || 0, 0);
+        }
+        if (params.has('suggestDelay')) {
+            state.config.suggestDelay = Math.max(
+                parseInt(params.get('suggestDelay'), 10) || 0, 0);
+        }
+        if (params.has('cart')) {
+            const size = Math.max(parseInt(params.get('cart'), 10) || 0, 0);
+            state.cart = products().slice(0, size).map(
+                product => ({name: product.name, quantity: 1}));
+        }
+        saveState();
+    };
+
+    const successAlert = message => (
+        '<div class="alert alert-success alert-dismissible">'
+        + `<a class="close">×</a><strong>Success!</strong> ${message}</div>`);
+
+    const renderHome = () => {
+        app.innerHTML = `
+<h4>Angular Form</h4>
+<form id="home-form">
+    <div class="form-group">
+        <label>Name</label>
+        <input class="form-control" name="name" minlength="2" required type="text">
+    </div>
+    <div class="form-group">
+        <label for="exampleInputEmail1">Email</label>
+        <input class="form-control" name="email" required type="text">
+    </div>
+    <div class="form-group">
+        <label for="exampleInputPassword1">Password</label>
+        <input class="form-control" id="exampleInputPassword1" type="password">
+    </div>
+    <div class="form-check">
+        <input class="form-check-input" id="exampleCheck1" type="checkbox">
+        <label class="form-check-label" for="exampleCheck1">Check me out if you Love IceCreams!</label>
+    </div>
+    <div class="form-group">
+        <label for="exampleFormControlSelect1">Gender</label>
+        <select class="form-control" id="exampleFormControlSelect1">
+            <option>Male</option>
+            <option>Female</option>
+        </select>
+    </div>
+    <div class="form-check form-check-inline">
+        <input class="form-check-input" id="inlineRadio1" name="inlineRadioOptions" type="radio" value="option1">
+        <label class="form-check-label" for="inlineRadio1">Student</label>
+    </div>
+    <div class="form-check form-check-inline">
+        <input class="form-check-input" id="inlineRadio2" name="inlineRadioOptions" type="radio" value="option2">
+        <label class="form-check-label" for="inlineRadio2">Employed</label>
+    </div>
+    <div class="form-check form-check-inline">
+        <input class="form-check-input" disabled id="inlineRadio3" name="inlineRadioOptions" type="radio" value="option3">
+        <label class="form-check-label" for="inlineRadio3">Entrepreneur (disabled)</label>
+    </div>
+    <div class="form-group">
+        <label for="dateofBirth">Date of Birth</label>
+        <input class="form-control" id="dateofBirth" name="bday" type="date">
+    </div>
+    <input class="btn btn-success" type="submit" value="Submit">
+</form>
+<div id="home-result"></div>`;
+        document.getElementById('home-form').addEventListener('submit', event => {
+            event.preventDefault();
+            document.getElementById('home-result').innerHTML = successAlert(
+                'The Form has been submitted successfully!.');
+        });
+    };
+
+    const cartCount = () => state.cart.length;
+
+    const renderShop = () => {
+        const cards = products().map((product, index) => `
+    <app-card class="col-lg-3 col-md-6 mb-3">
+        <div class="card h-100">
+            <a><img alt="${escapeHtml(product.name)}" class="card-img-top" src="assets/product.svg"></a>
+            <div class="card-body">
+                <h4 class="card-title"><a>${escapeHtml(product.name)}</a></h4>
+                <h5>${formatPrice(product.price)}</h5>
+                <p class="card-text">Stand-in product ${index + 1}.</p>
+            </div>
+            <div class="card-footer">
+                <button class="btn btn-info" data-product="${escapeHtml(product.name)}">Add</button>
+            </div>
+        </div>
+    </app-card>`).join('');
+        app.innerHTML = `
+<nav class="navbar navbar-expand-lg navbar-dark bg-dark">
+    <ul class="navbar-nav">
+        <li class="nav-item active">
+            <a class="nav-link btn btn-primary" href="shop/checkout" data-route="shop/checkout">Checkout ( <span id="cart-count">${cartCount()}</span> )</a>
+        </li>
+    </ul>
+</nav>
+<h1 class="my-4">Shop Name</h1>
+<app-card-list class="row">${cards}
+</app-card-list>`;
+        app.querySelector('app-card-list').addEventListener('click', event => {
+            const button = event.target.closest('button[data-product]');
+            if (!button) { return; }
+            state.cart.push({name: button.dataset.product, quantity: 1});
+            saveState();
+            document.getElementById('cart-count').textContent = cartCount();
+        });
+    };
+
+    const lineTotal = item => (productByName(item.name) || {price: 0}).price * item.quantity;
+    const cartTotal = () => state.cart.reduce((sum, item) => sum + lineTotal(item), 0);
+
+    const renderCheckout = () => {
+        const rows = state.cart.map((item, index) => {
+            const price = (productByName(item.name) || {price: 0}).price;
+            return `
+        <tr data-index="${index}">
+            <td class="col-sm-8 col-md-6">
+                <div class="media">
+                    <a class="thumbnail pull-left"><img class="media-object" src="assets/product.svg" style="width: 72px; height: 72px;"></a>
+                    <div class="media-body">
+                        <h4 class="media-heading"><a>${escapeHtml(item.name)}</a></h4>
+                        <h5 class="media-heading"> by <a>Brand name</a></h5>
+                        <span>Status: </span><span class="text-success"><strong>In Stock</strong></span>
+                    </div>
+                </div>
+            </td>
+            <td class="col-sm-1 col-md-1" style="text-align: center">
+                <input class="form-control" id="exampleInputEmail1" type="number" value="${item.quantity}">
+            </td>
+            <td class="col-sm-1 col-md-1 text-center"><strong>${formatPrice(price)}</strong></td>
+            <td class="col-sm-1 col-md-1 text-center"><strong class="line-total">${formatPrice(lineTotal(item))}</strong></td>
+            <td class="col-sm-1 col-md-1">
+                <button class="btn btn-danger" type="button"><span class="glyphicon glyphicon-remove"></span> Remove </button>
+            </td>
+        </tr>`;
+        }).join('');
+        app.innerHTML = `
+<table class="table table-hover">
+    <thead>
+        <tr><th>Product</th><th>Quantity</th><th class="text-center">Price</th><th class="text-center">Total</th><th> </th></tr>
+    </thead>
+    <tbody id="cart-rows">${rows}
+    </tbody>
+    <tfoot>
+        <tr>
+            <td> </td><td> </td><td> </td>
+            <td><h3>Total</h3></td>
+            <td class="text-right"><h3><strong id="cart-total">${formatPrice(cartTotal())}</strong></h3></td>
+        </tr>
+        <tr>
+            <td> </td><td> </td><td> </td>
+            <td><a class="btn btn-default" href="shop" data-route="shop">Continue Shopping</a></td>
+            <td><button class="btn btn-success" type="button" id="proceed-to-purchase"> Checkout </button></td>
+        </tr>
+    </tfoot>
+</table>`;
+        const body = document.getElementById('cart-rows');
+        const rowIndex = element => Array.from(body.children).indexOf(element.closest('tr'));
+        const updateTotal = () => {
+            document.getElementById('cart-total').textContent = formatPrice(cartTotal());
+        };
+        body.addEventListener('input', event => {
+            const index = rowIndex(event.target);
+            state.cart[index].quantity = Math.max(parseInt(event.target.value, 10) || 0, 0);
+            saveState();
+            body.children[index].querySelector('.line-total').textContent = formatPrice(
+                lineTotal(state.cart[index]));
+            updateTotal();
+        });
+        body.addEventListener('click', event => {
+            const button = event.target.closest('button.btn-danger');
+            if (!button) { return; }
+            const index = rowIndex(button);
+            state.cart.splice(index, 1);
+            saveState();
+            body.children[index].remove();
+            updateTotal();
+        });
+        document.getElementById('proceed-to-purchase').addEventListener(
+            'click', () => navigate('shop/purchase'));
+    };
+
+    const renderPurchase = () => {
+        app.innerHTML = `
+<form id="purchase-form">
+    <div class="form-group">
+        <label>Please choose your delivery location. Then click on purchase button</label>
+        <input autocomplete="off" class="validate filter-input form-control" id="country" type="text">
+        <div class="suggestions"></div>
+    </div>
+    <div class="checkbox checkbox-primary">
+        <input class="checkbox checkbox-primary" id="checkbox2" type="checkbox">
+        <label for="checkbox2">I agree with the <a>term &amp; Conditions</a></label>
+    </div>
+    <input class="btn btn-success btn-lg" type="submit" value="Purchase">
+</form>
+<div id="purchase-result"></div>`;
+        const input = document.getElementById('country');
+        const suggestions = app.querySelector('.suggestions');
+        let pending = null;
+        input.addEventListener('input', () => {
+            clearTimeout(pending);
+            pending = setTimeout(() => {
+                const query = input.value.trim().toLowerCase();
+                const matches = query.length < 2 ? [] : COUNTRIES.filter(
+                    country => country.toLowerCase().includes(query));
+                suggestions.innerHTML = matches.length ? '<ul>' + matches.map(
+                    country => `<li><a>${escapeHtml(country)}</a></li>`).join('') + '</ul>' : '';
+            }, state.config.suggestDelay);
+        });
+        suggestions.addEventListener('click', event => {
+            const link = event.target.closest('a');
+            if (!link) { return; }
+            input.value = link.textContent;
+            suggestions.innerHTML = '';
+        });
+        document.getElementById('purchase-form').addEventListener('submit', event => {
+            event.preventDefault();
+            state.cart = [];
+            saveState();
+            document.getElementById('purchase-result').innerHTML = successAlert(
+                'Thank you! Your order will be delivered in next few weeks :-).');
+        });
+    };
+
+    const ROUTES = {
+        '': renderHome,
+        'shop': renderShop,
+        'shop/checkout': renderCheckout,
+        'shop/purchase': renderPurchase,
+    };
+
+    const route = () => {
+        const path = location.pathname.startsWith(BASE)
+            ? location.pathname.slice(BASE.length).replace(/\/+$/, '') : '';
+        (ROUTES[path] || renderHome)();
+    };
+
+    const navigate = path => {
+        history.pushState({}, '', BASE + path);
+        route();
+    };
+
+    document.addEventListener('click', event => {
+        const link = event.target.closest('a[data-route]');
+        if (!link) { return; }
+        event.preventDefault();
+        navigate(link.dataset.route);
+    });
+    window.addEventListener('popstate', route);
+
+    applyQueryParameters();
+    route();
+})();
@@ -0,0 +1,156 @@
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .config import STAND_IN_APP_DIR, STAND_IN_BASE_PATH
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Files served under <base path>assets/, with their content types
+ASSETS: Dict[str, str] = {
+    "app.js": "text/javascript; charset=utf-8",
+    "app.css": "text/css; charset=utf-8",
+    "product.svg": "image/svg+xml",
+}
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the stand-in single-page app: static assets under ``assets/`` and the app
+    shell for every other path below the base path, so deep links resolve in the app.
+    """
+
+    server_version = "StandIn/1.0"
+
+    def do_GET(self) -> None:
+        """
+        Handles a GET request.
+        """
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        """
+        Handles a HEAD request like GET, without sending the body.
+        """
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        """
+        Sends the redirect, asset, app shell or error for the requested path.
+
+        :param send_body: Whether to send the response body (False for HEAD).
+        """
+        path = urlsplit(self.path).path
+        if path == "/":
+            self.send_response(HTTPStatus.FOUND)
+            self.send_header("Location", STAND_IN_BASE_PATH)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        asset_prefix = f"{STAND_IN_BASE_PATH}assets/"
+        if path.startswith(asset_prefix):
+            name = path[len(asset_prefix) :]
+            if name not in ASSETS:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            self._send_file(
+                STAND_IN_APP_DIR / name, ASSETS[name], "max-age=3600", send_body
+            )
+        elif path.startswith(STAND_IN_BASE_PATH) or path == STAND_IN_BASE_PATH[:-1]:
+            self._send_file(
+                STAND_IN_APP_DIR / "index.html",
+                "text/html; charset=utf-8",
+                "no-cache",
+                send_body,
+            )
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def _send_file(
+        self, path: Path, content_type: str, cache_control: str, send_body: bool
+    ) -> None:
+        """
+        Sends a file as the response.
+
+        :param path: The file to send.
+        :param content_type: Value of the Content-Type header.
+        :param cache_control: Value of the Cache-Control header.
+        :param send_body: Whether to send the file's contents.
+        """
+        body = path.read_bytes()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """
+        Routes the access log to the module logger instead of stderr.
+        """
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class StandInServer:
+    """
+    Local HTTP server hosting a stand-in for the practice app under test. It
+    reproduces the markup the page objects locate, so the tests and benchmarks run
+    offline against a fast, deterministic site. Catalog and cart size are set
+    through query parameters (see ``stand_in/app.js``).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initializes the server. Call start() to begin serving.
+
+        :param host: Interface to listen on.
+        :param port: Port to listen on; 0 picks a free port.
+        """
+        self.address: Tuple[str, int] = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the stand-in app, the counterpart of ``config.URL``.
+
+        :return: The URL, ending with a slash.
+        :raises RuntimeError: If the server is not running.
+        """
+        if self._server is None:
+            raise RuntimeError("The stand-in server is not running")
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):  # only for AF_UNIX servers, typed alike
+            host = host.decode()
+        return f"http://{host}:{port}{STAND_IN_BASE_PATH}"
+
+    def start(self) -> str:
+        """
+        Starts serving on a background thread.
+
+        :return: Base URL of the stand-in app.
+        """
+        self._server = ThreadingHTTPServer(self.address, StandInRequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stand-in-server", daemon=True
+        )
+        self._thread.start()
+        logger.info("Stand-in app serving at %s", self.url)
+        return self.url
+
+    def stop(self) -> None:
+        """
+        Stops the server and releases its port.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
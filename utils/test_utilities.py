@@ -1,4 +1,3 @@
-import inspect
 import json
 import logging
 from pathlib import Path
@@ -6,10 +5,11 @@ from typing import Any, Dict, List
 
 import pytest
 
-from .config import LOG_DIR, TEST_DATA_DIR
+from .config import TEST_DATA_DIR
+from .log_manager import get_test_logger
 
 
-@pytest.mark.usefixtures("setup")
+@pytest.mark.usefixtures("setup", "isolation")
 class TestUtilities:
     """
     A utility class for common test functionalities such as Webdriver & logging setup, test data management.
@@ -18,24 +18,12 @@ class TestUtilities:
     @staticmethod
     def create_logger() -> logging.Logger:
         """
-        Sets up and returns a logger instance for the current test.
+        Returns the shared test logger. Records are tagged with the running test's
+        node ID by the logging subsystem, so no per-test logger or handler is created.
 
-        :return: Configured logger object.
+        :return: The test logger.
         """
-        test_name: str = inspect.stack()[1][3]
-        logger: logging.Logger = logging.getLogger(test_name)
-        file_path: Path = LOG_DIR / "test_execution.log"
-
-        if not logger.handlers:
-            file_handler: logging.FileHandler = logging.FileHandler(file_path, mode="a")
-            formatter: logging.Formatter = logging.Formatter(
-                "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-            )
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-
-        logger.setLevel(logging.INFO)
-        return logger
+        return get_test_logger()
 
     @staticmethod
     def get_test_data_file_path(file_name: str) -> Path: